@@ -0,0 +1,27 @@
+from django.conf import settings
+
+"""
+This module tells apart the caches shared by the processes of a server from
+the ones each process keeps for itself.
+
+State that every worker must see, like invalidations, can only be kept in a
+shared cache.
+"""
+
+PROCESS_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def is_shared_cache(alias: str) -> bool:
+    """
+    This function tells whether a cache is shared by the processes.
+
+    Args:
+        alias: The alias of the cache in `settings.CACHES`.
+
+    Returns:
+        False for the per-process backends, like the default LocMemCache.
+    """
+    return settings.CACHES[alias]["BACKEND"] not in PROCESS_CACHE_BACKENDS
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import metrics
+
+"""
+This command empties `METRICS["MULTIPROCESS_DIRECTORY"]`, to run before the
+server starts its worker processes. Otherwise the counters of the previous
+runs are added to the new ones.
+"""
+
+
+class Command(BaseCommand):
+    help = "Delete the metrics of the previous runs of the server"
+
+    def handle(self, *args, **options):
+        directory = settings.METRICS["MULTIPROCESS_DIRECTORY"]
+
+        if not directory:
+            raise CommandError("METRICS_MULTIPROCESS_DIRECTORY isn't set")
+
+        metrics.clear_multiprocess_directory()
+        self.stdout.write(f"Cleared the metrics in {directory}")
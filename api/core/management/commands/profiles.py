@@ -0,0 +1,119 @@
+import os
+
+import rest_framework
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from core import profiling
+
+"""
+This command lists and summarizes the request profiles kept on disk.
+
+`profiles list` lists them, `profiles summary` adds them up and shows the
+functions of the `user` and `status` apps and of DRF taking the most time,
+and `profiles token` makes a value of the `X-Profile` header.
+"""
+
+
+def _get_roots() -> tuple[str, ...]:
+    return tuple(
+        os.path.join(path, "")
+        for path in (
+            apps.get_app_config("user").path,
+            apps.get_app_config("status").path,
+            os.path.dirname(rest_framework.__file__),
+        )
+    )
+
+
+class Command(BaseCommand):
+    help = "List and summarize the request profiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action", choices=["list", "summary", "token"], nargs="?"
+        )
+        parser.add_argument(
+            "dumps",
+            nargs="*",
+            help="Names of the profiles to summarize, by default all of them",
+        )
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument(
+            "--all-frames",
+            action="store_true",
+            help="Summarize every function, not only the ones of the apps "
+            "and DRF",
+        )
+
+    def handle(self, *args, action, dumps, limit, all_frames, **options):
+        if action == "token":
+            self.stdout.write(
+                f"{profiling.PROFILE_HEADER}: {profiling.make_profile_token()}"
+            )
+            return
+
+        kept = profiling.list_dumps()
+
+        if action == "summary":
+            self._summary(kept, dumps, limit, all_frames)
+        else:
+            self._list(kept)
+
+    def _list(self, dumps):
+        if not dumps:
+            self.stdout.write(
+                f"No profiles in {profiling.get_dump_directory()}"
+            )
+            return
+
+        for dump in dumps:
+            self.stdout.write(
+                f"{dump.name}  {dump.created:%Y-%m-%d %H:%M:%S}  "
+                f"{dump.method} /{dump.request_path}  {dump.profiler}"
+            )
+
+    def _summary(self, kept, names, limit, all_frames):
+        dumps = kept
+
+        if names:
+            by_name = {dump.name: dump for dump in kept}
+            missing = [name for name in names if name not in by_name]
+
+            if missing:
+                raise CommandError(f"Unknown profiles: {', '.join(missing)}")
+
+            dumps = [by_name[name] for name in names]
+
+        if not dumps:
+            raise CommandError("No profiles to summarize")
+
+        if profiling.pyinstrument is None and any(
+            dump.profiler == "pyinstrument" for dump in dumps
+        ):
+            raise CommandError("Reading these profiles requires pyinstrument")
+
+        roots = None if all_frames else _get_roots()
+        functions = profiling.summarize_dumps(dumps, roots=roots)
+
+        self.stdout.write(
+            f"{len(dumps)} profiles, by cumulative time\n"
+            f"{'cumulative ms':>14}  {'calls':>8}  function"
+        )
+
+        for function in functions[:limit]:
+            filename = function.filename
+
+            if roots is not None:
+                root = next(
+                    root for root in roots if filename.startswith(root)
+                )
+                filename = os.path.relpath(
+                    filename, os.path.dirname(root[:-1])
+                )
+
+            calls = "-" if function.calls is None else function.calls
+            self.stdout.write(
+                f"{function.cumulative * 1000:>14.2f}  {calls:>8}  "
+                f"{filename}:{function.line}({function.function})"
+            )
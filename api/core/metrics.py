@@ -0,0 +1,604 @@
+import atexit
+import bisect
+import contextlib
+import contextvars
+import fcntl
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from core.queries import add_query_observer
+
+"""
+This module contains the metrics of the API and renders them in the
+Prometheus text format for `/metrics`.
+
+The metrics are counters and histograms kept in memory by each process.
+With several worker processes, `METRICS["MULTIPROCESS_DIRECTORY"]` is a
+directory shared by the processes: each one writes its metrics there every
+`METRICS["FLUSH_INTERVAL"]` seconds and when it exits, and `/metrics` adds
+up the files of all the processes.
+
+The files of the processes that died are merged into one file of the dead
+processes, so a new process reusing a PID doesn't overwrite their totals.
+The directory is emptied by `clear_multiprocess_directory` when the server
+starts, see `manage.py clear_metrics`.
+"""
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+
+class Counter:
+    """
+    This class counts events, by the values of its labels.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[label]) for label in self.labels)
+
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> list:
+        with self._lock:
+            return [[list(key), value] for key, value in self.values.items()]
+
+    def clear(self):
+        with self._lock:
+            self.values.clear()
+
+    @staticmethod
+    def merge(value, other):
+        return value + other
+
+
+class Histogram(Counter):
+    """
+    This class counts observed values in buckets, by the values of its
+    labels.
+
+    A sample is the count of each bucket, the last one being `+Inf`, the
+    sum of the values and their count.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[label]) for label in self.labels)
+        # The first bucket whose upper bound is at least the value
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            sample = self.values.get(key)
+
+            if sample is None:
+                sample = self.values[key] = {
+                    "buckets": [0] * (len(self.buckets) + 1),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+
+            sample["buckets"][index] += 1
+            sample["sum"] += value
+            sample["count"] += 1
+
+    def samples(self) -> list:
+        with self._lock:
+            return [
+                [list(key), {**sample, "buckets": list(sample["buckets"])}]
+                for key, sample in self.values.items()
+            ]
+
+    @staticmethod
+    def merge(value, other):
+        return {
+            "buckets": [
+                a + b for a, b in zip(value["buckets"], other["buckets"])
+            ],
+            "sum": value["sum"] + other["sum"],
+            "count": value["count"] + other["count"],
+        }
+
+
+class MetricsRegistry:
+    """
+    This class holds the metrics of the process and renders them.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+
+        return metric
+
+    def snapshot(self) -> dict:
+        """
+        This method copies the samples of every metric.
+
+        Returns:
+            A dict of the samples by metric name, which can be stored as
+            JSON and merged with the snapshots of other processes.
+        """
+        return {
+            name: metric.samples() for name, metric in self.metrics.items()
+        }
+
+    def merge(self, snapshots: list[dict]) -> dict:
+        """
+        This method adds up snapshots, of several processes.
+
+        Args:
+            snapshots: The snapshots to add up.
+
+        Returns:
+            The samples of every metric by the values of their labels.
+        """
+        merged = {name: {} for name in self.metrics}
+
+        for snapshot in snapshots:
+            for name, samples in snapshot.items():
+                metric = self.metrics.get(name)
+
+                # The metrics of an older release
+                if metric is None:
+                    continue
+
+                for labels, value in samples:
+                    key = tuple(labels)
+                    current = merged[name].get(key)
+                    merged[name][key] = (
+                        value
+                        if current is None
+                        else metric.merge(current, value)
+                    )
+
+        return merged
+
+    def render(self, snapshots: list[dict]) -> str:
+        """
+        This method renders snapshots in the Prometheus text format.
+
+        The hit ratio of each cache is computed from the added up
+        `cache_requests_total`.
+
+        Args:
+            snapshots: The snapshots to add up.
+
+        Returns:
+            The text of `/metrics`.
+        """
+        merged = self.merge(snapshots)
+        lines = []
+
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+
+            for key, value in sorted(merged[name].items()):
+                labels = list(zip(metric.labels, key))
+
+                if metric.type == "counter":
+                    lines.append(_sample(name, labels, value))
+                    continue
+
+                cumulative = 0
+
+                for bound, count in zip(
+                    (*metric.buckets, "+Inf"), value["buckets"]
+                ):
+                    cumulative += count
+                    lines.append(
+                        _sample(
+                            f"{name}_bucket",
+                            labels + [("le", _format(bound))],
+                            cumulative,
+                        )
+                    )
+
+                lines.append(_sample(f"{name}_sum", labels, value["sum"]))
+                lines.append(_sample(f"{name}_count", labels, value["count"]))
+
+        lines += _render_cache_hit_ratios(merged[CACHE_REQUESTS.name])
+
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        for metric in self.metrics.values():
+            metric.clear()
+
+
+def _format(value) -> str:
+    if isinstance(value, str):
+        return value
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _sample(name: str, labels: list, value) -> str:
+    if not labels:
+        return f"{name} {_format(value)}"
+
+    labels = ",".join(f'{label}="{_escape(v)}"' for label, v in labels)
+
+    return f"{name}{{{labels}}} {_format(value)}"
+
+
+def _render_cache_hit_ratios(cache_requests: dict) -> list[str]:
+    totals = {}
+
+    for (cache, result), count in cache_requests.items():
+        totals.setdefault(cache, {"hit": 0, "miss": 0})[result] += count
+
+    lines = [
+        "# HELP cache_hit_ratio Share of the cache lookups that were hits.",
+        "# TYPE cache_hit_ratio gauge",
+    ]
+
+    for cache, counts in sorted(totals.items()):
+        lookups = counts["hit"] + counts["miss"]
+        lines.append(
+            _sample(
+                "cache_hit_ratio",
+                [("cache", cache)],
+                counts["hit"] / lookups if lookups else 0.0,
+            )
+        )
+
+    return lines
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Duration of the requests, by URL name.",
+        ("view", "method", "status"),
+    )
+)
+REQUEST_QUERIES = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "SQL queries made by a request, by URL name.",
+        ("view",),
+        buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+    )
+)
+DB_QUERY_DURATION = registry.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "Duration of the SQL queries, by database.",
+        ("database",),
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+    )
+)
+AUTH_ATTEMPTS = registry.register(
+    Counter(
+        "auth_attempts_total",
+        "Authentications by JWT cookie and logins, by result.",
+        ("method", "result"),
+    )
+)
+CACHE_REQUESTS = registry.register(
+    Counter(
+        "cache_requests_total",
+        "Lookups of the user and status list caches, by result.",
+        ("cache", "result"),
+    )
+)
+
+
+def count_auth(method: str, success: bool):
+    """
+    This function counts an authentication attempt.
+
+    Args:
+        method: "jwt" for the cookie of a request, "login" for a login.
+        success: Whether the user was authenticated.
+    """
+    AUTH_ATTEMPTS.inc(
+        method=method, result="success" if success else "failure"
+    )
+
+
+_request_queries = contextvars.ContextVar("request_queries", default=None)
+
+
+class _QueryCount:
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+
+def _observe_query(alias: str, duration: float):
+    DB_QUERY_DURATION.observe(duration, database=alias)
+    query_count = _request_queries.get()
+
+    if query_count is not None:
+        query_count.count += 1
+
+
+DEAD_SNAPSHOT_NAME = "dead.json"
+LOCK_NAME = "metrics.lock"
+
+
+def _get_snapshot_path(directory: str, pid: int) -> Path:
+    return Path(directory) / f"metrics-{pid}.json"
+
+
+def _write_snapshot(path: Path, snapshot: dict):
+    temporary_path = path.with_suffix(".tmp")
+    temporary_path.write_text(json.dumps(snapshot))
+    # The other processes never read a partly written file
+    os.replace(temporary_path, path)
+
+
+@contextlib.contextmanager
+def _lock_directory(directory: str, exclusive: bool):
+    # Renders share the lock, merging the file of a dead process takes it
+    # alone so a render never counts it twice or misses it
+    with open(Path(directory) / LOCK_NAME, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The PID is used by a process of another user
+        return True
+
+    return True
+
+
+def _merge_dead_snapshot(directory: str, path: Path):
+    # Called with the exclusive lock
+    try:
+        snapshot = json.loads(path.read_text())
+    except FileNotFoundError:
+        # Merged by another process
+        return
+
+    dead_path = Path(directory) / DEAD_SNAPSHOT_NAME
+
+    if dead_path.exists():
+        merged = registry.merge([json.loads(dead_path.read_text()), snapshot])
+        snapshot = {
+            name: [[list(key), value] for key, value in samples.items()]
+            for name, samples in merged.items()
+        }
+
+    _write_snapshot(dead_path, snapshot)
+    path.unlink()
+
+
+def _merge_dead_processes(directory: str):
+    def is_dead(path):
+        return not _is_alive(int(path.stem.split("-")[1]))
+
+    if not any(map(is_dead, Path(directory).glob("metrics-*.json"))):
+        return
+
+    with _lock_directory(directory, exclusive=True):
+        # Checked again, a new process may have taken one of the PIDs
+        for path in Path(directory).glob("metrics-*.json"):
+            if is_dead(path):
+                _merge_dead_snapshot(directory, path)
+
+
+_flushed_pid = None
+
+
+def flush():
+    """
+    This function writes the metrics of the process to the shared
+    directory, if there is one.
+
+    The first flush of a process merges the file left under its PID by a
+    dead process into the file of the dead processes.
+    """
+    global _flushed_pid
+
+    directory = settings.METRICS["MULTIPROCESS_DIRECTORY"]
+
+    if not directory:
+        return
+
+    path = _get_snapshot_path(directory, os.getpid())
+
+    if _flushed_pid != os.getpid():
+        with _lock_directory(directory, exclusive=True):
+            if path.exists():
+                _merge_dead_snapshot(directory, path)
+
+            _write_snapshot(path, registry.snapshot())
+
+        _flushed_pid = os.getpid()
+        return
+
+    _write_snapshot(path, registry.snapshot())
+
+
+def clear_multiprocess_directory():
+    """
+    This function deletes the metrics of the previous runs of the server,
+    it's called before the server starts its processes.
+    """
+    directory = settings.METRICS["MULTIPROCESS_DIRECTORY"]
+
+    if not directory:
+        return
+
+    for path in Path(directory).glob("*.json"):
+        path.unlink(missing_ok=True)
+
+
+_last_flush = time.monotonic()
+_flush_lock = threading.Lock()
+
+
+def _flush_if_due():
+    global _last_flush
+
+    if time.monotonic() - _last_flush < settings.METRICS["FLUSH_INTERVAL"]:
+        return
+
+    if not _flush_lock.acquire(blocking=False):
+        return
+
+    try:
+        _last_flush = time.monotonic()
+        flush()
+    finally:
+        _flush_lock.release()
+
+
+def render_metrics() -> str:
+    """
+    This function renders the metrics of every process of the server.
+
+    Returns:
+        The text of `/metrics`.
+    """
+    snapshots = [registry.snapshot()]
+    directory = settings.METRICS["MULTIPROCESS_DIRECTORY"]
+
+    if directory:
+        own_path = _get_snapshot_path(directory, os.getpid())
+        _merge_dead_processes(directory)
+
+        with _lock_directory(directory, exclusive=False):
+            paths = [
+                Path(directory) / DEAD_SNAPSHOT_NAME,
+                *sorted(Path(directory).glob("metrics-*.json")),
+            ]
+
+            for path in paths:
+                if path != own_path and path.exists():
+                    snapshots.append(json.loads(path.read_text()))
+
+    return registry.render(snapshots)
+
+
+class MetricsMiddleware:
+    """
+    This middleware measures the duration and the SQL queries of every
+    request, by the name of its URL.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS["ENABLED"]:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+        add_query_observer(_observe_query)
+
+        if settings.METRICS["MULTIPROCESS_DIRECTORY"]:
+            # Registering it again would write the file once more at exit
+            atexit.unregister(flush)
+            atexit.register(flush)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        query_count = _QueryCount()
+        token = _request_queries.set(query_count)
+        started = time.perf_counter()
+
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_queries.reset(token)
+
+        self._observe(request, response, started, query_count)
+
+        return response
+
+    async def __acall__(self, request):
+        query_count = _QueryCount()
+        token = _request_queries.set(query_count)
+        started = time.perf_counter()
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_queries.reset(token)
+
+        self._observe(request, response, started, query_count)
+
+        return response
+
+    def _observe(self, request, response, started, query_count):
+        match = request.resolver_match
+        view = match.url_name if match and match.url_name else "unmatched"
+
+        REQUEST_DURATION.observe(
+            time.perf_counter() - started,
+            view=view,
+            method=request.method,
+            status=response.status_code,
+        )
+        REQUEST_QUERIES.observe(query_count.count, view=view)
+        _flush_if_due()
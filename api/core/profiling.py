@@ -0,0 +1,338 @@
+import cProfile
+import dataclasses
+import datetime
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover
+    pyinstrument = None
+
+"""
+This module profiles single requests and keeps their profiles on disk.
+
+`ProfilingMiddleware` profiles a request that sends a valid `X-Profile`
+header, made by `manage.py profiles token`, or one picked at random with
+`PROFILING["SAMPLE_RATE"]`. The view runs under pyinstrument, a sampling
+profiler, when it is installed and under cProfile otherwise. The last
+`PROFILING["MAX_DUMPS"]` profiles are kept in `PROFILING["DIRECTORY"]`,
+and `manage.py profiles` lists and summarizes them.
+
+The profilers follow the thread handling the request, so a sync view served
+by ASGI, or an async view served by WSGI, only shows as the wait for the
+thread running it. A process profiles one request at a time.
+"""
+
+PROFILE_HEADER = "X-Profile"
+
+_SIGNING_SALT = "core.profiling"
+
+_DUMP_NAME = re.compile(
+    r"^(?P<created>\d{20})-(?P<pid>\d+)-(?P<method>[A-Z]+)-(?P<path>[\w.-]*)"
+    r"(?P<suffix>\.prof|\.pyisession)$"
+)
+
+_profiling = threading.Lock()
+
+
+class _CProfileProfiler:
+    suffix = ".prof"
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def dump(self, path: str):
+        self.profile.dump_stats(path)
+
+
+class _PyinstrumentProfiler:
+    suffix = ".pyisession"
+
+    def __init__(self):
+        self.profiler = pyinstrument.Profiler(interval=0.001)
+
+    def start(self):
+        self.profiler.start()
+
+    def stop(self):
+        self.session = self.profiler.stop()
+
+    def dump(self, path: str):
+        self.session.save(path)
+
+
+def _get_profiler():
+    name = settings.PROFILING["PROFILER"]
+
+    if name == "pyinstrument" or (name == "auto" and pyinstrument):
+        return _PyinstrumentProfiler()
+
+    return _CProfileProfiler()
+
+
+def make_profile_token() -> str:
+    """
+    This function makes a value of the `X-Profile` header.
+
+    Returns:
+        A token signed with the SECRET_KEY, valid for
+        `PROFILING["HEADER_MAX_AGE"]` seconds.
+    """
+    return signing.TimestampSigner(salt=_SIGNING_SALT).sign("profile")
+
+
+def _has_profile_token(request) -> bool:
+    token = request.headers.get(PROFILE_HEADER)
+
+    if not token:
+        return False
+
+    try:
+        signing.TimestampSigner(salt=_SIGNING_SALT).unsign(
+            token, max_age=settings.PROFILING["HEADER_MAX_AGE"]
+        )
+    except signing.BadSignature:
+        return False
+
+    return True
+
+
+@dataclasses.dataclass
+class ProfileDump:
+    path: Path
+    created: datetime.datetime
+    method: str
+    request_path: str
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def profiler(self) -> str:
+        return "cprofile" if self.path.suffix == ".prof" else "pyinstrument"
+
+
+def get_dump_directory() -> Path:
+    return Path(settings.PROFILING["DIRECTORY"])
+
+
+def list_dumps() -> list[ProfileDump]:
+    """
+    This function lists the profiles kept on disk.
+
+    Returns:
+        The ProfileDump of every profile, the oldest first.
+    """
+    directory = get_dump_directory()
+
+    if not directory.is_dir():
+        return []
+
+    dumps = []
+
+    for path in sorted(directory.iterdir()):
+        match = _DUMP_NAME.match(path.name)
+
+        if match is None:
+            continue
+
+        dumps.append(
+            ProfileDump(
+                path=path,
+                created=datetime.datetime.fromtimestamp(
+                    int(match["created"]) / 1e9, tz=datetime.timezone.utc
+                ),
+                method=match["method"],
+                request_path=match["path"],
+            )
+        )
+
+    return dumps
+
+
+@dataclasses.dataclass
+class FunctionTime:
+    filename: str
+    line: int
+    function: str
+    # Seconds spent in the function and the functions it called
+    cumulative: float = 0.0
+    # Unknown from a sampling profiler
+    calls: int = None
+
+
+def _add_pstats(functions, path, roots):
+    for key, row in pstats.Stats(str(path)).stats.items():
+        if roots is not None and not key[0].startswith(roots):
+            continue
+
+        # A row is (primitive calls, calls, own time, cumulative, callers)
+        entry = functions.setdefault(key, FunctionTime(*key))
+        entry.cumulative += row[3]
+        entry.calls = (entry.calls or 0) + row[1]
+
+
+def _add_pyinstrument(functions, path, roots):
+    from pyinstrument.session import Session
+
+    root_frame = Session.load(path).root_frame()
+    # The frames with the frames above them, a recursive function only
+    # counts in its outermost frame
+    stack = [(root_frame, frozenset())] if root_frame else []
+
+    while stack:
+        frame, above = stack.pop()
+        key = (frame.file_path or "", frame.line_no or 0, frame.function)
+
+        if (
+            key not in above
+            and not frame.is_synthetic
+            and (roots is None or key[0].startswith(roots))
+        ):
+            entry = functions.setdefault(key, FunctionTime(*key))
+            entry.cumulative += frame.time
+
+        stack.extend((child, above | {key}) for child in frame.children)
+
+
+def summarize_dumps(
+    dumps: list[ProfileDump], roots: tuple[str, ...] = None
+) -> list[FunctionTime]:
+    """
+    This function adds up the time spent in each function over profiles.
+
+    Args:
+        dumps: The profiles to add up.
+        roots: The directories of the functions to keep, all of them when
+            None.
+
+    Returns:
+        The FunctionTime of every function, the longest first.
+    """
+    functions = {}
+
+    for dump in dumps:
+        if dump.profiler == "cprofile":
+            _add_pstats(functions, dump.path, roots)
+        else:
+            _add_pyinstrument(functions, dump.path, roots)
+
+    return sorted(
+        functions.values(), key=lambda entry: entry.cumulative, reverse=True
+    )
+
+
+def _write_dump(profiler, request):
+    directory = get_dump_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    # The name starts with the time so the names sort from the oldest
+    request_path = re.sub(r"[^\w.-]+", "-", request.path).strip("-")[:80]
+    name = (
+        f"{time.time_ns():020d}-{os.getpid()}-{request.method}-"
+        f"{request_path}{profiler.suffix}"
+    )
+    # Readers never see a partly written dump
+    temporary_path = directory / f".{name}.tmp"
+    profiler.dump(str(temporary_path))
+    os.replace(temporary_path, directory / name)
+
+    for dump in list_dumps()[: -settings.PROFILING["MAX_DUMPS"]]:
+        # Another process may have removed it already
+        dump.path.unlink(missing_ok=True)
+
+    return name
+
+
+class ProfilingMiddleware:
+    """
+    This middleware profiles the requests asking for it and a sample of the
+    others.
+
+    The response of a profiled request has the name of its profile in the
+    `X-Profile-Dump` header.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING["ENABLED"]:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _should_profile(self, request) -> bool:
+        sample_rate = settings.PROFILING["SAMPLE_RATE"]
+
+        return _has_profile_token(request) or (
+            sample_rate > 0 and random.random() < sample_rate
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not self._should_profile(request):
+            return self.get_response(request)
+
+        if not _profiling.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            profiler = _get_profiler()
+            profiler.start()
+
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.stop()
+
+            response["X-Profile-Dump"] = _write_dump(profiler, request)
+        finally:
+            _profiling.release()
+
+        return response
+
+    async def __acall__(self, request):
+        if not self._should_profile(request):
+            return await self.get_response(request)
+
+        if not _profiling.acquire(blocking=False):
+            return await self.get_response(request)
+
+        try:
+            profiler = _get_profiler()
+            profiler.start()
+
+            try:
+                response = await self.get_response(request)
+            finally:
+                profiler.stop()
+
+            response["X-Profile-Dump"] = _write_dump(profiler, request)
+        finally:
+            _profiling.release()
+
+        return response
@@ -0,0 +1,54 @@
+import time
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+"""
+This module times the SQL queries of the database connections for the
+features observing them, like the `Server-Timing` header and the metrics.
+
+Every connection gets a single execute wrapper, whichever features are on.
+The wrapper times a query once and hands its duration to the observers
+added with `add_query_observer`.
+"""
+
+_observers = []
+
+
+def add_query_observer(observer):
+    """
+    This function calls an observer after every SQL query of the process.
+
+    Args:
+        observer: A function called with the alias of the database and the
+            duration of the query in seconds. It's only added once.
+    """
+    if observer not in _observers:
+        _observers.append(observer)
+
+    for connection in connections.all():
+        _wrap_connection(connection)
+
+    connection_created.connect(
+        _wrap_connection, dispatch_uid="core.queries.wrap_connection"
+    )
+
+
+def _observe_query(execute, sql, params, many, context):
+    started = time.perf_counter()
+
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        alias = context["connection"].alias
+
+        for observer in _observers:
+            observer(alias, duration)
+
+
+def _wrap_connection(connection, **kwargs):
+    # The connections of other threads, like the ones of the async ORM, are
+    # wrapped when they connect
+    if _observe_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_observe_query)
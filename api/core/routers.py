@@ -0,0 +1,121 @@
+import contextlib
+import contextvars
+import random
+
+from django.conf import settings
+from django.core.cache import caches
+
+"""
+This module contains the router sending reads to the database replicas.
+
+Only the reads of the read-only selectors go to a replica, they run inside
+`replica_reads`. Every other query, including the reads made by the write
+services before they write, goes to the primary (`default`) database.
+
+Replicas lag behind the primary, so the selectors name the user they read
+for with sticky keys, and the writes pin those keys to the primary for
+`DATABASE_REPLICA_STICKY_SECONDS`, which lets a user read their own writes.
+"""
+
+_read_scope = contextvars.ContextVar("replica_read_scope", default=None)
+
+PIN_KEY_PREFIX = "db:pin:"
+
+
+class PrimaryReplicaRouter:
+    """
+    This class routes the database queries between primary and replicas.
+    """
+
+    def db_for_read(self, model, **hints):
+        sticky_keys = _read_scope.get()
+
+        if sticky_keys is None:
+            return "default"
+
+        return get_read_database(*sticky_keys)
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return True
+
+
+def get_read_database(*sticky_keys: str) -> str:
+    """
+    This function chooses the database of a read-only query.
+
+    Args:
+        sticky_keys: The keys pinned by the writes the query must see.
+
+    Returns:
+        The alias of a replica, or `default` when there is none or one of
+        the keys is pinned to the primary.
+    """
+    replicas = settings.DATABASE_REPLICAS
+
+    if not replicas:
+        return "default"
+
+    if sticky_keys and _pin_cache().get_many(
+        [f"{PIN_KEY_PREFIX}{key}" for key in sticky_keys]
+    ):
+        return "default"
+
+    return random.choice(replicas)
+
+
+@contextlib.contextmanager
+def replica_reads(*sticky_keys: str):
+    """
+    This context manager lets the queries inside it read from a replica.
+
+    Querysets evaluated after the block, like iterators, must be bound to
+    their database inside it with `queryset.using(queryset.db)`.
+
+    Args:
+        sticky_keys: The keys pinned by the writes the queries must see,
+            like `user:<id>`.
+    """
+    token = _read_scope.set(sticky_keys)
+
+    try:
+        yield
+    finally:
+        _read_scope.reset(token)
+
+
+def pin_primary(*sticky_keys: str):
+    """
+    This function sends the reads of some keys to the primary for a while.
+
+    It is called after a write, so that the writer doesn't read a replica
+    which hasn't received it yet.
+
+    Args:
+        sticky_keys: The keys of the write, like `user:<id>`.
+    """
+    if not settings.DATABASE_REPLICAS:
+        return
+
+    _pin_cache().set_many(
+        {f"{PIN_KEY_PREFIX}{key}": True for key in sticky_keys},
+        timeout=settings.DATABASE_REPLICA_STICKY_SECONDS,
+    )
+
+
+def user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def email_key(email: str) -> str:
+    return f"email:{email.lower()}"
+
+
+def _pin_cache():
+    return caches[settings.DATABASE_REPLICA_PIN_CACHE_ALIAS]
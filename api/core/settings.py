@@ -1,3 +1,4 @@
+import json
 import os
 from pathlib import Path
 
@@ -16,6 +17,22 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.getenv("SECRET_KEY")
 JWT_SECRET = os.getenv("JWT_SECRET")
 
+# Keys signing and verifying the JWT by key ID, see `user/signing.py`.
+# JWT_KEYS is a JSON object, by default JWT_SECRET is the only key.
+JWT_KEYS = json.loads(os.getenv("JWT_KEYS") or "null") or {
+    "default": {"ALGORITHM": "HS256", "SECRET": JWT_SECRET},
+}
+JWT_SIGNING_KEY_ID = os.getenv("JWT_SIGNING_KEY_ID") or "default"
+
+# Number of verified tokens whose signature isn't checked again, 0 disables it
+JWT_VERIFIED_TOKEN_CACHE_SIZE = int(
+    os.getenv("JWT_VERIFIED_TOKEN_CACHE_SIZE", 4096)
+)
+
+# Put the user's profile in the JWT so `/api/users/me/` doesn't need the
+# database
+JWT_CLAIMS_TOKENS = os.getenv("JWT_CLAIMS_TOKENS", "False") == "True"
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
@@ -33,11 +50,14 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     # Apps
+    "core",
     "user",
     "status",
 ]
 
 MIDDLEWARE = [
+    "core.metrics.MetricsMiddleware",
+    "core.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -45,8 +65,45 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.profiling.ProfilingMiddleware",
 ]
 
+# Server-Timing header and timing logs of every request, see `core/timing.py`.
+# When disabled the middleware is removed from the chain.
+
+SERVER_TIMING = {
+    "ENABLED": os.getenv("SERVER_TIMING_ENABLED", "0") == "1",
+    "LOG": os.getenv("SERVER_TIMING_LOG", "1") == "1",
+}
+
+# Prometheus metrics of `/metrics`, see `core/metrics.py`. With TOKEN the
+# scraper sends `Authorization: Bearer <TOKEN>`. With several worker
+# processes, MULTIPROCESS_DIRECTORY is a directory shared by the processes
+# of the server, each writes its metrics there every FLUSH_INTERVAL seconds.
+# It's emptied by `manage.py clear_metrics` when the server starts.
+
+METRICS = {
+    "ENABLED": os.getenv("METRICS_ENABLED", "0") == "1",
+    "TOKEN": os.getenv("METRICS_TOKEN") or None,
+    "MULTIPROCESS_DIRECTORY": os.getenv("METRICS_MULTIPROCESS_DIRECTORY"),
+    "FLUSH_INTERVAL": float(os.getenv("METRICS_FLUSH_INTERVAL", 5)),
+}
+
+# Profiles of single requests, see `core/profiling.py`. A request is profiled
+# when it sends the signed header made by `manage.py profiles token`, valid
+# for HEADER_MAX_AGE seconds, or at random with SAMPLE_RATE. The last
+# MAX_DUMPS profiles are kept in DIRECTORY. PROFILER is "cprofile",
+# "pyinstrument" or "auto" (pyinstrument when it is installed).
+
+PROFILING = {
+    "ENABLED": os.getenv("PROFILING_ENABLED", "0") == "1",
+    "SAMPLE_RATE": float(os.getenv("PROFILING_SAMPLE_RATE", 0)),
+    "HEADER_MAX_AGE": int(os.getenv("PROFILING_HEADER_MAX_AGE", 3600)),
+    "DIRECTORY": os.getenv("PROFILING_DIRECTORY", BASE_DIR / "profiles"),
+    "MAX_DUMPS": int(os.getenv("PROFILING_MAX_DUMPS", 100)),
+    "PROFILER": os.getenv("PROFILING_PROFILER", "auto"),
+}
+
 ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
@@ -71,13 +128,74 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# The primary database is configured with the DB_* variables. DB_REPLICAS is
+# a JSON list of the settings that differ on each replica, like
+# [{"HOST": "replica-1"}] or [{"NAME": "replica_1.sqlite3"}] with SQLite.
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "ENGINE": os.getenv("DB_ENGINE") or "django.db.backends.sqlite3",
+        "NAME": os.getenv("DB_NAME") or BASE_DIR / "db.sqlite3",
+        "USER": os.getenv("DB_USER", ""),
+        "PASSWORD": os.getenv("DB_PASSWORD", ""),
+        "HOST": os.getenv("DB_HOST", ""),
+        "PORT": os.getenv("DB_PORT", ""),
+        # Persistent connections, checked before being reused
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+DATABASE_REPLICAS = []
+
+for index, replica in enumerate(
+    json.loads(os.getenv("DB_REPLICAS") or "[]"), start=1
+):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        **replica,
+        # The tests read the replicas through the test primary database
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{index}")
+
+# DB_STATUS_SHARDS is a JSON list like DB_REPLICAS, each entry adds a
+# database the statuses are spread over, besides `default`.
+
+STATUS_SHARDS = ["default"]
+
+for index, shard in enumerate(
+    json.loads(os.getenv("DB_STATUS_SHARDS") or "[]"), start=1
+):
+    DATABASES[f"shard_{index}"] = {**DATABASES["default"], **shard}
+    STATUS_SHARDS.append(f"shard_{index}")
+
+# ID of this process in the status IDs generated when statuses are sharded,
+# unique per process across all the machines (0-1023). It's required when
+# DB_STATUS_SHARDS is set.
+STATUS_ID_WORKER = (
+    int(os.getenv("STATUS_ID_WORKER"))
+    if os.getenv("STATUS_ID_WORKER")
+    else None
+)
+# The shard of each user is read from the `UserShard` table and cached for
+# STATUS_SHARD_CACHE_TIMEOUT seconds. `rebalance_statuses` needs
+# CACHES[STATUS_SHARD_CACHE_ALIAS] to be shared by the processes.
+STATUS_SHARD_CACHE_ALIAS = "default"
+STATUS_SHARD_CACHE_TIMEOUT = int(os.getenv("STATUS_SHARD_CACHE_TIMEOUT", 30))
+
+# Reads of the selectors go to a replica, see `core/routers.py`. For
+# DATABASE_REPLICA_STICKY_SECONDS after a write, the writer reads the primary.
+# Statuses are routed to their shard first, see `status/sharding.py`.
+DATABASE_ROUTERS = [
+    "status.sharding.StatusShardRouter",
+    "core.routers.PrimaryReplicaRouter",
+]
+DATABASE_REPLICA_STICKY_SECONDS = int(
+    os.getenv("DATABASE_REPLICA_STICKY_SECONDS", 5)
+)
+DATABASE_REPLICA_PIN_CACHE_ALIAS = "default"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -121,3 +239,122 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "user.User"
+
+
+# Cache of authenticated users, see `user/cache.py`
+# BACKEND is "local" (per process), "shared" (uses CACHES[CACHE_ALIAS])
+# or "disabled"
+
+USER_CACHE = {
+    "BACKEND": os.getenv("USER_CACHE_BACKEND", "local"),
+    "MAX_SIZE": int(os.getenv("USER_CACHE_MAX_SIZE", 1024)),
+    "TTL": int(os.getenv("USER_CACHE_TTL", 300)),
+    "CACHE_ALIAS": "default",
+}
+
+
+# Pool hashing passwords for the async register and login views,
+# see `user/hashing.py`. EXECUTOR is "thread" or "process".
+
+PASSWORD_HASHING = {
+    "EXECUTOR": os.getenv("PASSWORD_HASHING_EXECUTOR", "thread"),
+    "MAX_WORKERS": int(
+        os.getenv("PASSWORD_HASHING_MAX_WORKERS", os.cpu_count() or 1)
+    ),
+    "MAX_PENDING": int(os.getenv("PASSWORD_HASHING_MAX_PENDING", 16)),
+}
+
+# Seconds sent in `Retry-After` when the pool is saturated
+PASSWORD_HASHING_RETRY_AFTER = 1
+
+
+# Cursor pagination of `/api/status/`
+
+STATUS_PAGE_SIZE = int(os.getenv("STATUS_PAGE_SIZE", 20))
+STATUS_PAGE_MAX_SIZE = int(os.getenv("STATUS_PAGE_MAX_SIZE", 100))
+
+# Number of rows fetched and rendered at a time by `/api/status/?stream=1`
+STATUS_STREAM_CHUNK_SIZE = int(os.getenv("STATUS_STREAM_CHUNK_SIZE", 500))
+
+# Maximum number of statuses accepted by `/api/status/bulk/`
+STATUS_BULK_MAX_SIZE = int(os.getenv("STATUS_BULK_MAX_SIZE", 100))
+
+# Full-text search of `/api/status/?q=`, see `status/search.py`. The backend
+# is chosen by the vendor of the database, FALLBACK_BACKEND scans without an
+# index. Queries are cut to MAX_TERMS words.
+
+STATUS_SEARCH = {
+    "BACKENDS": {
+        "sqlite": "status.search.SQLiteSearchBackend",
+        "postgresql": "status.search.PostgresSearchBackend",
+    },
+    "FALLBACK_BACKEND": "status.search.ContainsSearchBackend",
+    "MAX_TERMS": int(os.getenv("STATUS_SEARCH_MAX_TERMS", 16)),
+}
+
+# Home timeline of `/api/status/timeline/`, see `status/timeline.py`. New
+# statuses are pushed to the timelines of the followers in batches of
+# BATCH_SIZE, unless their author has more than PULL_THRESHOLD followers or
+# the push would write more than MAX_PUSH_ROWS rows in the request.
+# Following an account pushes its last BACKFILL statuses.
+
+TIMELINE = {
+    "PULL_THRESHOLD": int(os.getenv("TIMELINE_PULL_THRESHOLD", 1000)),
+    "MAX_PUSH_ROWS": int(os.getenv("TIMELINE_MAX_PUSH_ROWS", 10000)),
+    "BACKFILL": int(os.getenv("TIMELINE_BACKFILL", 20)),
+    "BATCH_SIZE": 1000,
+}
+
+# Cache of the serialized status lists, see `status/cache.py`. Entries are
+# invalidated by the status services and expire after TIMEOUT seconds. The
+# invalidations must reach every worker, so by default (ENABLED None) the
+# cache is only enabled when CACHES[CACHE_ALIAS] is shared, like Redis.
+
+STATUS_LIST_CACHE = {
+    "ENABLED": (
+        None
+        if os.getenv("STATUS_LIST_CACHE_ENABLED") is None
+        else os.getenv("STATUS_LIST_CACHE_ENABLED") == "1"
+    ),
+    "TIMEOUT": int(os.getenv("STATUS_LIST_CACHE_TIMEOUT", 300)),
+    "CACHE_ALIAS": "default",
+}
+
+# Denylist of the tokens revoked on logout, see `user/revocation.py`. Each
+# process reads the revocations of the others every SYNC_INTERVAL seconds.
+# TOKEN_LIFETIME is the lifetime in seconds of the tokens made by
+# `user.services.create_token`, a new process skips older revocations.
+# A revocation must reach every worker, so by default (ENABLED None) the
+# denylist is only enabled when CACHES[CACHE_ALIAS] is shared, like Redis.
+
+JWT_DENYLIST = {
+    "ENABLED": (
+        None
+        if os.getenv("JWT_DENYLIST_ENABLED") is None
+        else os.getenv("JWT_DENYLIST_ENABLED") == "1"
+    ),
+    "CACHE_ALIAS": "default",
+    "SYNC_INTERVAL": float(os.getenv("JWT_DENYLIST_SYNC_INTERVAL", 5)),
+    "TOKEN_LIFETIME": 24 * 60 * 60,
+}
+
+# Number of proxies in front of the API. The throttles read the client IP
+# from X-Forwarded-For behind them, and from REMOTE_ADDR when it's 0.
+
+REST_FRAMEWORK = {
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
+}
+
+# Throttles of the login and register endpoints, see `user/throttling.py`.
+# BACKEND is "local" (per process) or "cache" (uses CACHES[CACHE_ALIAS]),
+# an empty rate disables a throttle.
+
+AUTH_THROTTLE = {
+    "BACKEND": os.getenv("AUTH_THROTTLE_BACKEND", "local"),
+    "CACHE_ALIAS": "default",
+    "RATES": {
+        "login_ip": os.getenv("AUTH_THROTTLE_LOGIN_IP", "20/min"),
+        "login_email": os.getenv("AUTH_THROTTLE_LOGIN_EMAIL", "5/min"),
+        "register_ip": os.getenv("AUTH_THROTTLE_REGISTER_IP", "20/hour"),
+    },
+}
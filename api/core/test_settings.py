@@ -0,0 +1,11 @@
+from .settings import *  # noqa: F401, F403
+
+# Databases the sharding tests spread statuses over. STATUS_SHARDS stays
+# ["default"], the tests enable the shards with `override_settings`.
+STATUS_ID_WORKER = 0
+
+for index in (1, 2):
+    DATABASES[f"shard_{index}"] = {  # noqa: F405
+        **DATABASES["default"],  # noqa: F405
+        "NAME": BASE_DIR / f"shard_{index}.sqlite3",  # noqa: F405
+    }
@@ -0,0 +1,220 @@
+import contextlib
+import contextvars
+import functools
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from core.queries import add_query_observer
+
+"""
+This module times the parts of a request and reports them in the
+`Server-Timing` header of the response and in the logs.
+
+`ServerTimingMiddleware` starts the timings of a request. The SQL queries
+are timed by the wrapper of `core/queries.py`, and the other parts by
+`timed` blocks and `instrument`ed functions: the authentication, the user
+and status services, the serializers and the renderer. The parts can
+overlap, the `status` services include their `db` queries for example.
+
+Without the middleware, which is removed when `SERVER_TIMING["ENABLED"]` is
+off, a timed block only costs a context variable lookup.
+"""
+
+logger = logging.getLogger(__name__)
+
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+_noop = contextlib.nullcontext()
+
+
+class RequestTimings:
+    """
+    This class accumulates the time spent in each part of a request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self.counts = {}
+
+    def add(self, name: str, duration: float):
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def to_header(self) -> str:
+        """
+        This method formats the timings as a `Server-Timing` header.
+
+        Returns:
+            The metrics in milliseconds, `db` with its number of queries.
+        """
+        metrics = []
+
+        for name, duration in self.durations.items():
+            metric = f"{name};dur={duration * 1000:.2f}"
+
+            if name == "db":
+                metric += f';desc="{self.counts[name]} queries"'
+
+            metrics.append(metric)
+
+        metrics.append(f"total;dur={self.total() * 1000:.2f}")
+
+        return ", ".join(metrics)
+
+    def to_dict(self) -> dict:
+        return {
+            **{
+                f"{name}_ms": round(duration * 1000, 3)
+                for name, duration in self.durations.items()
+            },
+            "db_queries": self.counts.get("db", 0),
+            "total_ms": round(self.total() * 1000, 3),
+        }
+
+
+class _Timed:
+    __slots__ = ("timings", "name", "started")
+
+    def __init__(self, timings: "RequestTimings", name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, time.perf_counter() - self.started)
+
+
+def timed(name: str):
+    """
+    This function times a block of the current request.
+
+    Args:
+        name: The name of the metric the time is added to.
+
+    Returns:
+        A context manager, which does nothing outside a timed request.
+    """
+    timings = _request_timings.get()
+
+    if timings is None:
+        return _noop
+
+    return _Timed(timings, name)
+
+
+def instrument(name: str):
+    """
+    This decorator times every call of a function, sync or async.
+
+    Args:
+        name: The name of the metric the time is added to.
+    """
+
+    def decorate(func):
+        if iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                timings = _request_timings.get()
+
+                if timings is None:
+                    return await func(*args, **kwargs)
+
+                with _Timed(timings, name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _request_timings.get()
+
+            if timings is None:
+                return func(*args, **kwargs)
+
+            with _Timed(timings, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _time_query(alias: str, duration: float):
+    timings = _request_timings.get()
+
+    if timings is not None:
+        timings.add("db", duration)
+
+
+class ServerTimingMiddleware:
+    """
+    This middleware adds the `Server-Timing` header to every response.
+
+    It also logs the timings of every request on the `core.timing` logger,
+    with the metrics in the `server_timing` attribute of the record.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING["ENABLED"]:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+        add_query_observer(_time_query)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = _request_timings.set(RequestTimings())
+
+        try:
+            response = self.get_response(request)
+
+            return self.process_response(request, response)
+        finally:
+            _request_timings.reset(token)
+
+    async def __acall__(self, request):
+        token = _request_timings.set(RequestTimings())
+
+        try:
+            response = await self.get_response(request)
+
+            return self.process_response(request, response)
+        finally:
+            _request_timings.reset(token)
+
+    def process_response(self, request, response):
+        timings = _request_timings.get()
+        response["Server-Timing"] = timings.to_header()
+
+        if settings.SERVER_TIMING["LOG"]:
+            metrics = timings.to_dict()
+            logger.info(
+                "%s %s %s %.1fms",
+                request.method,
+                request.path,
+                response.status_code,
+                metrics["total_ms"],
+                extra={"server_timing": metrics},
+            )
+
+        return response
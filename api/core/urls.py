@@ -1,8 +1,11 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from . import views
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/users/", include("user.urls")),
     path("api/status/", include("status.urls")),
+    path("metrics", views.metrics_view, name="metrics"),
 ]
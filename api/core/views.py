@@ -0,0 +1,30 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from . import metrics
+
+"""
+This function defines the `/metrics` endpoint scraped by Prometheus.
+
+When `METRICS["TOKEN"]` is set, the scraper has to send it in the
+`Authorization: Bearer <token>` header.
+"""
+
+
+def metrics_view(request):
+    if not settings.METRICS["ENABLED"]:
+        raise Http404()
+
+    token = settings.METRICS["TOKEN"]
+
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401)
+
+    return HttpResponse(
+        metrics.render_metrics(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,198 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status as rest_status
+
+from . import serializer as status_serializer
+from . import conditional, services
+from .renderers import FastJSONRenderer, arender_json_array
+from user import authentication
+from user.async_views import AsyncAPIView
+
+
+"""
+This class defines the `/api/status/async/` endpoint.
+
+It is the async version of `StatusCreateListApi`.
+"""
+
+
+class AsyncStatusCreateListApi(AsyncAPIView):
+    authentication_classes = (authentication.AsyncCustomUserAuthentication,)
+    authentication_required = True
+    renderer_class = FastJSONRenderer
+
+    async def post(self, request):
+        """
+        This method handles POST requests to the endpoint.
+
+        It validates the request data and creates a new status.
+        """
+        serializer = status_serializer.StatusSerializer(
+            data=self.get_data(request)
+        )
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        serializer.instance = await services.acreate_status(
+            user=request.user, status_dc=data
+        )
+
+        return self.render(
+            serializer.data, status=rest_status.HTTP_201_CREATED
+        )
+
+    async def get(self, request):
+        """
+        This method handles GET requests to the endpoint.
+
+        It returns the user's statuses, a page of them when `limit` or
+        `cursor` is passed, or streams them when `stream=1` is passed.
+        Conditional requests are answered like `StatusCreateListApi.get`.
+        """
+        stream = request.GET.get("stream") == "1"
+        paged = "limit" in request.GET or "cursor" in request.GET
+        variant = conditional.get_list_variant(request.GET)
+        validator = None
+
+        # A page is validated from its own rows
+        if conditional.is_conditional(request) and not paged:
+            validator = await services.aget_user_status_validator(
+                user=request.user, variant=variant
+            )
+            not_modified = conditional.get_not_modified_response(
+                request, validator
+            )
+
+            if not_modified is not None:
+                return not_modified
+
+        if stream:
+            resp = self._stream(request)
+        elif paged:
+            status_page = await services.aget_user_status_values_page(
+                user=request.user,
+                limit=services.get_status_page_limit(request.GET.get("limit")),
+                cursor=request.GET.get("cursor"),
+            )
+            serializer = status_serializer.StatusReadSerializer(
+                status_page.results, many=True, user=request.user
+            )
+            resp = self.render(
+                {"results": serializer.data, "next": status_page.next}
+            )
+            validator = services.get_status_page_validator(
+                user=request.user, page=status_page, variant=variant
+            )
+            not_modified = conditional.get_not_modified_response(
+                request, validator
+            )
+
+            if not_modified is not None:
+                return not_modified
+        else:
+            status_collection = await services.aget_user_status_values(
+                user=request.user
+            )
+            serializer = status_serializer.StatusReadSerializer(
+                status_collection, many=True, user=request.user
+            )
+            resp = self.render(serializer.data)
+
+            if validator is None:
+                validator = services.get_user_status_rows_validator(
+                    user=request.user, rows=status_collection, variant=variant
+                )
+
+        # Streams only get the validators when they are revalidated
+        if validator is None:
+            return resp
+
+        return conditional.set_validator_headers(resp, validator)
+
+    def _stream(self, request):
+        chunk_size = settings.STATUS_STREAM_CHUNK_SIZE
+        status_collection = services.aiter_user_status_values(
+            user=request.user, chunk_size=chunk_size
+        )
+        serializer = status_serializer.StatusReadSerializer(
+            None, user=request.user
+        )
+
+        async def representations():
+            async for row in status_collection:
+                yield serializer.to_representation(row)
+
+        return StreamingHttpResponse(
+            arender_json_array(representations(), chunk_size=chunk_size),
+            content_type="application/json",
+        )
+
+
+"""
+This class defines the `/api/status/async/<status_id>/` endpoint.
+
+It is the async version of `StatusRetrieveUpdateDelete`.
+"""
+
+
+class AsyncStatusRetrieveUpdateDelete(AsyncAPIView):
+    authentication_classes = (authentication.AsyncCustomUserAuthentication,)
+    authentication_required = True
+    renderer_class = FastJSONRenderer
+
+    async def get(self, request, status_id):
+        """
+        This method handles GET requests to the endpoint.
+
+        It returns the details of a specific status, or 304 when the status
+        hasn't changed since the conditional request's validators.
+        """
+        if conditional.is_conditional(request):
+            validator = await services.aget_user_status_details_validator(
+                status_id=status_id, user=request.user
+            )
+            not_modified = conditional.get_not_modified_response(
+                request, validator
+            )
+
+            if not_modified is not None:
+                return not_modified
+
+        status = await services.aget_user_status_details_values(
+            status_id=status_id, user=request.user
+        )
+        serializer = status_serializer.StatusReadSerializer(status)
+
+        return conditional.set_validator_headers(
+            self.render(serializer.data),
+            services.get_status_details_row_validator(status),
+        )
+
+    async def delete(self, request, status_id):
+        """
+        This method handles DELETE requests to the endpoint.
+
+        It deletes a specific status.
+        """
+        await services.adelete_user_status(
+            user=request.user, status_id=status_id
+        )
+
+        return self.render(None, status=rest_status.HTTP_204_NO_CONTENT)
+
+    async def put(self, request, status_id):
+        """
+        This method handles PUT requests to the endpoint.
+
+        It updates a specific status.
+        """
+        serializer = status_serializer.StatusSerializer(
+            data=self.get_data(request)
+        )
+        serializer.is_valid(raise_exception=True)
+        status = serializer.validated_data
+        serializer.instance = await services.aupdate_user_status(
+            user=request.user, status_id=status_id, status_data=status
+        )
+
+        return self.render(serializer.data)
@@ -0,0 +1,290 @@
+import hashlib
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from core import metrics
+from core.cache import is_shared_cache
+
+if TYPE_CHECKING:
+    from user.models import User
+
+"""
+This module contains the cache of serialized status lists.
+
+Every user has a list version in the cache. The serialized lists and pages
+of a user are stored under keys containing that version, and the status
+services bump it whenever one of the user's statuses is created, edited or
+deleted, so the stale entries are never read again and simply expire.
+"""
+
+
+class SingleFlight:
+    """
+    This class collapses concurrent calls made with the same key.
+
+    The first caller runs the function, the callers arriving while it runs
+    wait for it and get the same result, or the same exception.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func) -> tuple:
+        """
+        This method runs a function unless it is already running for the key.
+
+        Args:
+            key: The key identifying the call.
+            func: The function to run, without arguments.
+
+        Returns:
+            The result of the function and whether it was shared with
+            another caller instead of being run.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+        return call.result, False
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class StatusListCache:
+    """
+    This class caches the serialized status lists of the users.
+
+    It counts hits, misses and the misses that were collapsed into another
+    request's rebuild.
+    """
+
+    version_key_prefix = "status:list_version:"
+    key_prefix = "status:list:"
+
+    def __init__(self, timeout: int, cache_alias: str, enabled: bool = True):
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0
+        self._single_flight = SingleFlight()
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_version(self, user_id: int) -> int:
+        """
+        This method returns the current list version of a user.
+
+        Args:
+            user_id: The ID of the user.
+
+        Returns:
+            The version, initialized when the cache doesn't know it yet.
+        """
+        key = f"{self.version_key_prefix}{user_id}"
+        version = self.cache.get(key)
+
+        if version is None:
+            # Not starting from 1 keeps an evicted version from being reused
+            # while the entries stored under it are still alive
+            self.cache.add(key, time.time_ns(), timeout=None)
+            version = self.cache.get(key)
+
+        return version
+
+    def bump_version(self, user_id: int):
+        """
+        This method invalidates every cached list of a user.
+
+        Args:
+            user_id: The ID of the user whose statuses changed.
+        """
+        if not self.enabled:
+            return
+
+        key = f"{self.version_key_prefix}{user_id}"
+
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.add(key, time.time_ns(), timeout=None)
+
+    async def abump_version(self, user_id: int):
+        """
+        This method invalidates every cached list of a user from async code.
+
+        Args:
+            user_id: The ID of the user whose statuses changed.
+        """
+        if not self.enabled:
+            return
+
+        key = f"{self.version_key_prefix}{user_id}"
+
+        try:
+            await self.cache.aincr(key)
+        except ValueError:
+            await self.cache.aadd(key, time.time_ns(), timeout=None)
+
+    def get_or_build(self, user: "User", variant: str, build):
+        """
+        This method returns a cached list, building it once on a miss.
+
+        Args:
+            user: The user who owns the statuses.
+            variant: What distinguishes the representation, like a page
+                cursor.
+            build: The function building the entry, without arguments.
+
+        Returns:
+            The cached or built entry.
+        """
+        if not self.enabled:
+            return build()
+
+        key = self._key(user, variant)
+        entry = self.cache.get(key)
+
+        if entry is not None:
+            self._count(hits=1)
+            return entry
+
+        def build_and_store():
+            entry = build()
+            self.cache.set(key, entry, timeout=self.timeout)
+            return entry
+
+        entry, shared = self._single_flight.do(key, build_and_store)
+
+        if shared:
+            self._count(hits=1, collapsed=1)
+        else:
+            self._count(misses=1)
+
+        return entry
+
+    def _key(self, user: "User", variant: str) -> str:
+        # The lists embed the author, so an edited user gets new entries too
+        digest = hashlib.sha1(variant.encode()).hexdigest()
+        version = self.get_version(user.id)
+
+        return (
+            f"{self.key_prefix}{user.id}:{version}:"
+            f"{user.profile_version}:{digest}"
+        )
+
+    def _count(self, hits=0, misses=0, collapsed=0):
+        if hits:
+            metrics.CACHE_REQUESTS.inc(hits, cache="status_list", result="hit")
+
+        if misses:
+            metrics.CACHE_REQUESTS.inc(
+                misses, cache="status_list", result="miss"
+            )
+
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.collapsed += collapsed
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.collapsed = 0
+
+    def stats(self) -> dict:
+        """
+        This method returns the hit and miss counters of the cache.
+
+        Requests that waited for another request's rebuild count as hits.
+
+        Returns:
+            A dict with the hits, misses, collapsed misses and hit ratio.
+        """
+        total = self.hits + self.misses
+
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            collapsed=self.collapsed,
+            hit_ratio=self.hits / total if total else 0.0,
+        )
+
+
+_status_list_cache = None
+_status_list_cache_lock = threading.Lock()
+
+
+def get_status_list_cache() -> "StatusListCache":
+    """
+    This function returns the cache configured by `settings.STATUS_LIST_CACHE`.
+
+    Returns:
+        The StatusListCache shared by the whole process.
+    """
+    global _status_list_cache
+
+    if _status_list_cache is None:
+        with _status_list_cache_lock:
+            if _status_list_cache is None:
+                config = settings.STATUS_LIST_CACHE
+                cache_alias = config.get("CACHE_ALIAS", "default")
+                enabled = config.get("ENABLED")
+
+                if enabled is None:
+                    enabled = is_shared_cache(cache_alias)
+
+                _status_list_cache = StatusListCache(
+                    timeout=config.get("TIMEOUT", 300),
+                    cache_alias=cache_alias,
+                    enabled=enabled,
+                )
+
+    return _status_list_cache
+
+
+@receiver(setting_changed)
+def _reset_status_list_cache(setting, **kwargs):
+    global _status_list_cache
+
+    if setting == "STATUS_LIST_CACHE":
+        _status_list_cache = None
@@ -0,0 +1,85 @@
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+"""
+These functions answer conditional requests on the status endpoints.
+
+The views compute the validators of a response with the status services,
+which is cheaper than fetching and serializing the statuses.
+"""
+
+CONDITIONAL_HEADERS = (
+    "HTTP_IF_MATCH",
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_UNMODIFIED_SINCE",
+)
+
+
+def is_conditional(request) -> bool:
+    """
+    This function tells whether the request carries a conditional header.
+    """
+    return any(header in request.META for header in CONDITIONAL_HEADERS)
+
+
+def get_list_variant(query_params) -> str:
+    """
+    This function returns the variant of a status list request.
+
+    A stream has the content, and so the validators, of the full list.
+
+    Args:
+        query_params: The query parameters of the request.
+
+    Returns:
+        The query string without `stream`.
+    """
+    query_params = query_params.copy()
+    query_params.pop("stream", None)
+
+    return query_params.urlencode()
+
+
+def get_not_modified_response(request, validator):
+    """
+    This function evaluates the conditional headers against the validators.
+
+    Args:
+        request: The request carrying the conditional headers.
+        validator: The StatusValidatorDataClass of the representation.
+
+    Returns:
+        A 304 or 412 response, or None if the full response must be sent.
+    """
+    response = get_conditional_response(
+        request,
+        etag=validator.etag,
+        last_modified=_timestamp(validator.last_modified),
+    )
+
+    if response is not None:
+        set_validator_headers(response, validator)
+
+    return response
+
+
+def set_validator_headers(response, validator):
+    """
+    This function sets the `ETag` and `Last-Modified` headers of a response.
+
+    Returns:
+        The response.
+    """
+    response["ETag"] = validator.etag
+
+    if validator.last_modified is not None:
+        response["Last-Modified"] = http_date(
+            _timestamp(validator.last_modified)
+        )
+
+    return response
+
+
+def _timestamp(value):
+    return None if value is None else int(value.timestamp())
@@ -0,0 +1,177 @@
+import datetime
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from status import models as status_models
+from core.cache import is_shared_cache
+from status import sharding
+from status.cache import get_status_list_cache
+
+"""
+This command moves the statuses of a user to another shard.
+
+The statuses are copied in batches while the user keeps writing, then the
+writes are refused for a short while, in which the statuses changed during
+the copy are copied again. The user is then switched to the new shard and
+the old copies are deleted. The lock is renewed after every batch, so it
+lasts as long as the copy.
+
+The lock, the new shard and the status list versions are read by the API
+processes from the cache, so the command refuses to run unless the caches
+are shared by the processes.
+"""
+
+
+class Command(BaseCommand):
+    help = "Move the statuses of a user to another shard"
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_id", type=int)
+        parser.add_argument("shard", help="Alias of the target shard")
+        parser.add_argument(
+            "--from",
+            dest="source",
+            help="Alias of the shard holding the statuses, by default the "
+            "current shard of the user",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--grace",
+            type=float,
+            default=2.0,
+            help="Seconds waited after locking the writes, for the writes "
+            "already running to finish",
+        )
+
+    def handle(
+        self, *args, user_id, shard, source, batch_size, grace, **options
+    ):
+        if not sharding.is_sharded():
+            raise CommandError("Statuses aren't sharded")
+
+        list_cache = get_status_list_cache()
+
+        for alias in (
+            settings.STATUS_SHARD_CACHE_ALIAS,
+            *([list_cache.cache_alias] if list_cache.enabled else []),
+        ):
+            if not is_shared_cache(alias):
+                raise CommandError(
+                    f"CACHES[{alias!r}] isn't shared by the processes of the "
+                    "API, they wouldn't see the move"
+                )
+
+        source = source or sharding.get_user_shard(user_id)
+
+        for alias in (shard, source):
+            if alias not in settings.STATUS_SHARDS:
+                raise CommandError(f"Unknown shard: {alias}")
+
+        if shard == source:
+            raise CommandError(f"The statuses are already on {shard}")
+
+        # Writes stamp `updated_at` with the clock of their server
+        copy_started = timezone.now() - datetime.timedelta(seconds=grace)
+        self.lock_timeout = None
+        copied = self._copy(source, shard, user_id, batch_size, since=None)
+
+        # Released by itself if the command dies, renewed by every batch
+        self.lock_timeout = int(grace) + 60
+        sharding.lock_user_shard(user_id, timeout=self.lock_timeout)
+
+        try:
+            time.sleep(grace)
+            copied += self._copy(
+                source, shard, user_id, batch_size, since=copy_started
+            )
+            self._drop_deleted(source, shard, user_id, batch_size)
+            sharding.set_user_shard(user_id, shard)
+        finally:
+            sharding.unlock_user_shard(user_id)
+
+        status_models.Status.objects.using(source).filter(
+            user_id=user_id
+        ).delete()
+        list_cache.bump_version(user_id)
+
+        self.stdout.write(
+            f"Moved the statuses of user {user_id} from {source} to "
+            f"{shard}, {copied} rows copied"
+        )
+
+    def _copy(self, source, target, user_id, batch_size, since) -> int:
+        statuses = status_models.Status.objects.using(source).filter(
+            user_id=user_id
+        )
+
+        if since is not None:
+            statuses = statuses.filter(updated_at__gte=since)
+
+        copied = 0
+        last_id = 0
+
+        while True:
+            batch = list(
+                statuses.filter(id__gt=last_id).order_by("id")[:batch_size]
+            )
+
+            if not batch:
+                return copied
+
+            dates = [(s.date_published, s.updated_at) for s in batch]
+
+            with transaction.atomic(using=target):
+                target_statuses = status_models.Status.objects.using(target)
+                target_statuses.filter(id__in=[s.id for s in batch]).delete()
+                # `bulk_create` stamps the dates with the current time,
+                # `bulk_update` writes the original ones back
+                target_statuses.bulk_create(batch)
+
+                for status, (date_published, updated_at) in zip(batch, dates):
+                    status.date_published = date_published
+                    status.updated_at = updated_at
+
+                target_statuses.bulk_update(
+                    batch, ["date_published", "updated_at"]
+                )
+
+            copied += len(batch)
+            last_id = batch[-1].id
+            self._renew_lock(user_id)
+
+    def _drop_deleted(self, source, target, user_id, batch_size):
+        # The statuses deleted from the source during the copy, found by
+        # walking the copies in ID order
+        target_statuses = status_models.Status.objects.using(target).filter(
+            user_id=user_id
+        )
+        last_id = 0
+
+        while True:
+            ids = list(
+                target_statuses.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+
+            if not ids:
+                return
+
+            kept = set(
+                status_models.Status.objects.using(source)
+                .filter(user_id=user_id, id__in=ids)
+                .values_list("id", flat=True)
+            )
+            target_statuses.filter(
+                id__in=[id for id in ids if id not in kept]
+            ).delete()
+            last_id = ids[-1]
+            self._renew_lock(user_id)
+
+    def _renew_lock(self, user_id):
+        if self.lock_timeout is not None:
+            sharding.lock_user_shard(user_id, timeout=self.lock_timeout)
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.3 on 2026-10-18 12:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("status", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="status",
+            index=models.Index(
+                fields=["user", "-date_published", "-id"],
+                name="status_user_published_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.3 on 2026-10-18 13:07
+
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    Status = apps.get_model("status", "Status")
+    Status.objects.using(schema_editor.connection.alias).update(
+        updated_at=models.F("date_published")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("status", "0002_status_user_published_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="status",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, verbose_name="Date Updated"
+            ),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="status",
+            index=models.Index(
+                fields=["user", "updated_at"], name="status_user_updated_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.3 on 2026-10-18 13:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user", "0002_user_profile_version"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("status", "0003_status_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserShard",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+                (
+                    "shard",
+                    models.CharField(max_length=100, verbose_name="shard"),
+                ),
+                (
+                    "date_moved",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date Moved"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="status",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="user",
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+# The FTS5 table of `status.search.SQLiteSearchBackend`. It is contentless,
+# the triggers give it the old values it needs to delete a row. SQLite drops
+# the triggers when a migration rebuilds `status_status`, such a migration
+# must create them again.
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE status_search USING fts5("
+    "content, owner, content='', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER status_search_insert AFTER INSERT ON status_status BEGIN "
+    "INSERT INTO status_search(rowid, content, owner) "
+    "VALUES (new.id, new.content, 'u' || new.user_id); END",
+    "CREATE TRIGGER status_search_delete AFTER DELETE ON status_status BEGIN "
+    "INSERT INTO status_search(status_search, rowid, content, owner) "
+    "VALUES ('delete', old.id, old.content, 'u' || old.user_id); END",
+    "CREATE TRIGGER status_search_update "
+    "AFTER UPDATE OF content, user_id ON status_status BEGIN "
+    "INSERT INTO status_search(status_search, rowid, content, owner) "
+    "VALUES ('delete', old.id, old.content, 'u' || old.user_id); "
+    "INSERT INTO status_search(rowid, content, owner) "
+    "VALUES (new.id, new.content, 'u' || new.user_id); END",
+    "INSERT INTO status_search(rowid, content, owner) "
+    "SELECT id, content, 'u' || user_id FROM status_status",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER status_search_insert",
+    "DROP TRIGGER status_search_delete",
+    "DROP TRIGGER status_search_update",
+    "DROP TABLE status_search",
+]
+
+# The index of `status.search.PostgresSearchBackend`, with the same
+# configuration as `status.search.POSTGRES_SEARCH_CONFIG`
+POSTGRES_FORWARD = [
+    "CREATE INDEX status_content_search_idx ON status_status "
+    "USING GIN (to_tsvector('english'::regconfig, content))",
+]
+POSTGRES_BACKWARD = ["DROP INDEX status_content_search_idx"]
+
+
+def _run(statements: dict):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("status", "0004_status_user_shard"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            _run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -3,8 +3,13 @@ from django.conf import settings
 
 
 class Status(models.Model):
+    # Statuses can live on another database than their user, see
+    # `status/sharding.py`, so the foreign key isn't enforced by the database
     user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, verbose_name="user"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        verbose_name="user",
+        db_constraint=False,
     )
 
     content = models.TextField(verbose_name="content")
@@ -12,3 +17,103 @@ class Status(models.Model):
     date_published = models.DateTimeField(
         auto_now_add=True, verbose_name="Date Published"
     )
+
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name="Date Updated"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-date_published", "-id"],
+                name="status_user_published_idx",
+            ),
+            models.Index(
+                fields=["user", "updated_at"],
+                name="status_user_updated_idx",
+            ),
+        ]
+
+
+class UserShard(models.Model):
+    """
+    This model assigns a user's statuses to a shard.
+
+    It lives in the `default` database and overrides the shard computed
+    from the user ID, for the users moved by `rebalance_statuses`.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name="user",
+    )
+
+    shard = models.CharField(max_length=100, verbose_name="shard")
+
+    date_moved = models.DateTimeField(auto_now=True, verbose_name="Date Moved")
+
+
+class TimelineEntry(models.Model):
+    """
+    This model is a status pushed to the home timeline of a follower.
+
+    The statuses can live on other databases than the timelines, see
+    `status/sharding.py`, so the status is kept by ID without a foreign key,
+    with the date it was published to order the timeline.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+        verbose_name="user",
+    )
+
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="author",
+    )
+
+    status_id = models.BigIntegerField(verbose_name="status ID")
+
+    date_published = models.DateTimeField(verbose_name="Date Published")
+
+    class Meta:
+        constraints = [
+            # Also the index finding the entries of a deleted status
+            models.UniqueConstraint(
+                fields=["status_id", "user"], name="timeline_unique_status"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-date_published", "-status_id"],
+                name="timeline_user_published_idx",
+            ),
+        ]
+
+
+class PullModeAuthor(models.Model):
+    """
+    This model marks the authors whose statuses aren't pushed to timelines.
+
+    An author with more than `TIMELINE["PULL_THRESHOLD"]` followers, or
+    whose push would write more than `TIMELINE["MAX_PUSH_ROWS"]` rows, is
+    switched to pull mode, their statuses are read when a timeline is read.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="pull_mode",
+        verbose_name="user",
+    )
+
+    date_switched = models.DateTimeField(
+        auto_now_add=True, verbose_name="Date Switched"
+    )
@@ -0,0 +1,105 @@
+from rest_framework import renderers
+
+from core import timing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+"""
+This class is a JSON renderer that uses orjson when it is installed.
+
+Its output is byte for byte the output of the DRF `JSONRenderer` with the
+default settings, so it can replace it transparently.
+"""
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    @timing.instrument("render")
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        This method renders the data into JSON.
+
+        It falls back to the DRF renderer when orjson is not installed, when
+        indentation is requested or when orjson can't encode the data.
+        """
+        if (
+            orjson is None
+            or data is None
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as the DRF renderer, see `JSONRenderer.render`
+        return ret.replace("\u2028".encode(), b"\\u2028").replace(
+            "\u2029".encode(), b"\\u2029"
+        )
+
+
+def render_json_array(items, chunk_size: int):
+    """
+    This function renders an iterable into a JSON array, piece by piece.
+
+    Only `chunk_size` items are held in memory at a time, so it can be used
+    as the content of a `StreamingHttpResponse`.
+
+    Args:
+        items: The JSON serializable items of the array.
+        chunk_size: The number of items rendered in each piece.
+
+    Yields:
+        The bytes of the JSON array.
+    """
+    renderer = FastJSONRenderer()
+    chunk = []
+    separator = b"["
+
+    for item in items:
+        chunk.append(renderer.render(item))
+
+        if len(chunk) >= chunk_size:
+            yield separator + b",".join(chunk)
+            chunk = []
+            separator = b","
+
+    if chunk:
+        yield separator + b",".join(chunk)
+        separator = b","
+
+    yield b"[]" if separator == b"[" else b"]"
+
+
+async def arender_json_array(items, chunk_size: int):
+    """
+    This function is the async version of `render_json_array`.
+
+    Args:
+        items: An async iterable of the JSON serializable items of the array.
+        chunk_size: The number of items rendered in each piece.
+
+    Yields:
+        The bytes of the JSON array.
+    """
+    renderer = FastJSONRenderer()
+    chunk = []
+    separator = b"["
+
+    async for item in items:
+        chunk.append(renderer.render(item))
+
+        if len(chunk) >= chunk_size:
+            yield separator + b",".join(chunk)
+            chunk = []
+            separator = b","
+
+    if chunk:
+        yield separator + b",".join(chunk)
+        separator = b","
+
+    yield b"[]" if separator == b"[" else b"]"
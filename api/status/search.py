@@ -0,0 +1,182 @@
+import re
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from . import models as status_models
+
+"""
+This module contains the full-text search of statuses.
+
+The search backend is chosen by the vendor of the database holding the
+statuses, from `settings.STATUS_SEARCH["BACKENDS"]`. The SQLite backend
+reads the `status_search` FTS5 table and the Postgres backend a GIN index
+of the content, both created by the `0005_status_search` migration. Other
+databases fall back to a scan of the user's statuses.
+"""
+
+# Text search configuration of the Postgres index, it must stay the one
+# of the `0005_status_search` migration for the index to be used
+POSTGRES_SEARCH_CONFIG = "english"
+
+
+def get_search_terms(query: str) -> list[str]:
+    """
+    This function splits a search query into the words to look for.
+
+    The words are quoted by the backends, so the query syntax of the
+    database can't be injected.
+
+    Args:
+        query: The query typed by the user.
+
+    Returns:
+        The lowercased words of the query, at most `MAX_TERMS` of them.
+    """
+    terms = re.findall(r"\w+", query.lower())
+
+    return list(dict.fromkeys(terms))[: settings.STATUS_SEARCH["MAX_TERMS"]]
+
+
+class StatusSearchBackend:
+    """
+    This class is the interface of the status search backends.
+    """
+
+    def search(
+        self, alias: str, user_id: int, terms: list[str], limit: int, offset
+    ) -> list[int]:
+        """
+        This method finds the statuses of a user containing all the terms.
+
+        Args:
+            alias: The database to search.
+            user_id: The ID of the user who owns the statuses.
+            terms: The words returned by `get_search_terms`.
+            limit: The maximum number of IDs returned.
+            offset: The number of best matches skipped.
+
+        Returns:
+            The IDs of the matching statuses, best match first.
+        """
+        raise NotImplementedError
+
+
+class SQLiteSearchBackend(StatusSearchBackend):
+    """
+    This class searches the `status_search` FTS5 table, ranked by BM25.
+
+    The table indexes the content of the statuses and their owner as a
+    `u<user_id>` token, so the owner is matched by the index as well.
+    """
+
+    def search(self, alias, user_id, terms, limit, offset):
+        phrases = " ".join(f'"{term}"' for term in terms)
+        match = f'owner:"u{user_id}" AND content:({phrases})'
+
+        with connections[alias].cursor() as cursor:
+            # The owner column is weighted 0, only the content ranks
+            cursor.execute(
+                "SELECT rowid FROM status_search WHERE status_search MATCH %s "
+                "ORDER BY bm25(status_search, 1.0, 0.0), rowid DESC "
+                "LIMIT %s OFFSET %s",
+                [match, limit, offset],
+            )
+
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(StatusSearchBackend):
+    """
+    This class searches the `status_content_search_idx` GIN index, ranked
+    by `ts_rank`.
+    """
+
+    def search(self, alias, user_id, terms, limit, offset):
+        # Imported here, it needs a Postgres driver
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVectorField,
+        )
+        from django.db.models import F, Func
+
+        vector = Func(
+            F("content"),
+            template=(
+                f"to_tsvector('{POSTGRES_SEARCH_CONFIG}'::regconfig, "
+                "%(expressions)s)"
+            ),
+            output_field=SearchVectorField(),
+        )
+        query = SearchQuery(
+            " ".join(terms), config=POSTGRES_SEARCH_CONFIG, search_type="plain"
+        )
+
+        return list(
+            status_models.Status.objects.using(alias)
+            .annotate(document=vector, rank=SearchRank(vector, query))
+            .filter(user_id=user_id, document=query)
+            .order_by("-rank", "-id")
+            .values_list("id", flat=True)[offset : offset + limit]
+        )
+
+
+class ContainsSearchBackend(StatusSearchBackend):
+    """
+    This class scans the statuses of a user for the terms, newest first.
+
+    It needs no index and is used for the databases without a full-text
+    backend.
+    """
+
+    def search(self, alias, user_id, terms, limit, offset):
+        user_status = status_models.Status.objects.using(alias).filter(
+            user_id=user_id
+        )
+
+        for term in terms:
+            user_status = user_status.filter(content__icontains=term)
+
+        return list(
+            user_status.order_by("-date_published", "-id").values_list(
+                "id", flat=True
+            )[offset : offset + limit]
+        )
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_search_backend(alias: str) -> "StatusSearchBackend":
+    """
+    This function returns the search backend of a database.
+
+    Args:
+        alias: The database holding the statuses to search.
+
+    Returns:
+        The backend of `STATUS_SEARCH["BACKENDS"]` for the vendor of the
+        database, or the `FALLBACK_BACKEND`.
+    """
+    vendor = connections[alias].vendor
+    backend = _backends.get(vendor)
+
+    if backend is None:
+        with _backends_lock:
+            config = settings.STATUS_SEARCH
+            path = config["BACKENDS"].get(vendor, config["FALLBACK_BACKEND"])
+            backend = _backends.setdefault(vendor, import_string(path)())
+
+    return backend
+
+
+@receiver(setting_changed)
+def _reset_search_backends(setting, **kwargs):
+    if setting == "STATUS_SEARCH":
+        _backends.clear()
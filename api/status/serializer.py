@@ -1,5 +1,9 @@
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
 
+from core import timing
+
 from . import services
 from user import serializer as user_serialzier
 
@@ -14,3 +18,106 @@ class StatusSerializer(serializers.Serializer):
         data = super().to_internal_value(data)
 
         return services.StatusDataClass(**data)
+
+
+class StatusBulkUpdateSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    content = serializers.CharField()
+
+    def to_internal_value(self, data):
+        data = super().to_internal_value(data)
+
+        return services.StatusDataClass(**data)
+
+
+class StatusBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False
+    )
+
+    def validate_ids(self, value):
+        if len(value) > settings.STATUS_BULK_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than "
+                f"{settings.STATUS_BULK_MAX_SIZE} elements."
+            )
+
+        return value
+
+
+class StatusBulkResultSerializer(serializers.Serializer):
+    applied = serializers.ListField(child=serializers.IntegerField())
+    rejected = serializers.ListField(child=serializers.DictField())
+
+
+class StatusReadSerializer:
+    """
+    This class is a read-only serializer for the fast read path of statuses.
+
+    It turns the rows returned by the `*_values` selectors of the status
+    services into the same dicts as `StatusSerializer`, without going through
+    the DRF field machinery for every row.
+    """
+
+    def __init__(self, instance, many=False, user=None):
+        """
+        Args:
+            instance: A row or a list of rows from the status services.
+            many: Whether `instance` is a list of rows.
+            user: The author of all the rows. When omitted, every row must
+                contain the `user__*` columns of `STATUS_DETAILS_VALUES`.
+        """
+        self.instance = instance
+        self.many = many
+        self.user = None if user is None else self.user_to_representation(user)
+        # Looked up once, it is a context local lookup on every call
+        self.timezone = timezone.get_current_timezone()
+
+    @property
+    def data(self):
+        with timing.timed("serialize"):
+            if self.many:
+                return [self.to_representation(row) for row in self.instance]
+
+            return self.to_representation(self.instance)
+
+    def to_representation(self, row: dict) -> dict:
+        user = self.user
+
+        if user is None:
+            user = {
+                "id": row["user__id"],
+                "first_name": row["user__first_name"],
+                "last_name": row["user__last_name"],
+                "email": row["user__email"],
+            }
+
+        return {
+            "id": row["id"],
+            "content": row["content"],
+            "date_published": self.datetime_to_representation(
+                row["date_published"]
+            ),
+            "user": user,
+        }
+
+    @staticmethod
+    def user_to_representation(user) -> dict:
+        return {
+            "id": user.id,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "email": user.email,
+        }
+
+    def datetime_to_representation(self, value) -> str:
+        # Same output as `serializers.DateTimeField` with the ISO 8601 format
+        if value is None:
+            return None
+
+        value = value.astimezone(self.timezone).isoformat()
+
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+
+        return value
@@ -1,18 +1,192 @@
+import base64
+import binascii
 import dataclasses
 import datetime
+import hashlib
 
 from typing import TYPE_CHECKING
 
 from rest_framework import exceptions
-from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.http import Http404
+from django.utils import timezone
 
+from core import routers, timing
 from user import services as user_services
 from . import models as status_models
+from . import search, sharding, timeline
+from .cache import get_status_list_cache
 
 if TYPE_CHECKING:
     from .models import Status
     from user.models import User
 
+# Newest first, the id breaks ties between statuses published at the same time.
+# It matches the `status_user_published_idx` index of the Status model.
+STATUS_ORDERING = ("-date_published", "-id")
+
+
+def _replica_reads(user: "User" = None):
+    # The selectors read a replica unless the user just wrote
+    if user is None:
+        return routers.replica_reads()
+
+    return routers.replica_reads(routers.user_key(user.id))
+
+
+def _statuses_changed(user_id: int):
+    get_status_list_cache().bump_version(user_id)
+    routers.pin_primary(routers.user_key(user_id))
+
+
+async def _astatuses_changed(user_id: int):
+    await get_status_list_cache().abump_version(user_id)
+    routers.pin_primary(routers.user_key(user_id))
+
+
+def _user_statuses(user: "User"):
+    return _author_statuses(user.id)
+
+
+def _author_statuses(user_id: int):
+    # The statuses of a user, on the user's shard
+    return status_models.Status.objects.using(
+        sharding.get_user_shard(user_id)
+    ).filter(user_id=user_id)
+
+
+async def _auser_statuses(user: "User"):
+    return status_models.Status.objects.using(
+        await sharding.aget_user_shard(user.id)
+    ).filter(user_id=user.id)
+
+
+def _with_author(row: dict, author: "User", columns: tuple) -> dict:
+    # Fills the `user__*` columns, shards can't join the user table
+    for column in columns:
+        if column.startswith("user__"):
+            row[column] = getattr(author, column[len("user__") :])
+
+    return row
+
+
+def _get_status_row(status_id: int, columns: tuple, user: "User" = None):
+    # A status of any user, searched on the reader's shard first
+    if not sharding.is_sharded():
+        with _replica_reads(user):
+            return (
+                status_models.Status.objects.filter(pk=status_id)
+                .values(*columns)
+                .first()
+            )
+
+    status_columns = [c for c in columns if not c.startswith("user__")]
+    shard = None if user is None else sharding.get_user_shard(user.id)
+
+    for alias in sharding.get_search_shards(shard):
+        row = (
+            status_models.Status.objects.using(alias)
+            .filter(pk=status_id)
+            .values(*status_columns, "user_id")
+            .first()
+        )
+
+        if row is not None:
+            author = user_services.user_id_selector(user_id=row.pop("user_id"))
+
+            return _with_author(row, author, columns) if author else None
+
+    return None
+
+
+async def _aget_status_row(
+    status_id: int, columns: tuple, user: "User" = None
+):
+    if not sharding.is_sharded():
+        with _replica_reads(user):
+            return (
+                await status_models.Status.objects.filter(pk=status_id)
+                .values(*columns)
+                .afirst()
+            )
+
+    status_columns = [c for c in columns if not c.startswith("user__")]
+    shard = None if user is None else await sharding.aget_user_shard(user.id)
+
+    for alias in sharding.get_search_shards(shard):
+        row = (
+            await status_models.Status.objects.using(alias)
+            .filter(pk=status_id)
+            .values(*status_columns, "user_id")
+            .afirst()
+        )
+
+        if row is not None:
+            author = await user_services.auser_id_selector(
+                user_id=row.pop("user_id")
+            )
+
+            return _with_author(row, author, columns) if author else None
+
+    return None
+
+
+def _get_owned_status(user: "User", status_id: int, fields: tuple = ()):
+    # A status about to be written by the user. One found on another shard
+    # belongs to another user, so it's forbidden rather than missing.
+    shard = sharding.get_user_shard(user.id)
+    user_status = status_models.Status.objects.using(shard)
+
+    if fields:
+        user_status = user_status.only(*fields)
+
+    status = user_status.filter(pk=status_id).first()
+
+    if status is None:
+        if not any(
+            status_models.Status.objects.using(alias)
+            .filter(pk=status_id)
+            .exists()
+            for alias in sharding.get_search_shards(shard)[1:]
+        ):
+            raise Http404("No Status matches the given query.")
+
+        raise exceptions.PermissionDenied("Forbidden")
+
+    if status.user_id != user.id:
+        raise exceptions.PermissionDenied("Forbidden")
+
+    return status
+
+
+async def _aget_owned_status(user: "User", status_id: int, fields: tuple = ()):
+    shard = await sharding.aget_user_shard(user.id)
+    user_status = status_models.Status.objects.using(shard)
+
+    if fields:
+        user_status = user_status.only(*fields)
+
+    status = await user_status.filter(pk=status_id).afirst()
+
+    if status is None:
+        for alias in sharding.get_search_shards(shard)[1:]:
+            if (
+                await status_models.Status.objects.using(alias)
+                .filter(pk=status_id)
+                .aexists()
+            ):
+                raise exceptions.PermissionDenied("Forbidden")
+
+        raise Http404("No Status matches the given query.")
+
+    if status.user_id != user.id:
+        raise exceptions.PermissionDenied("Forbidden")
+
+    return status
+
+
 """
 This data class represents a status.
 
@@ -28,25 +202,33 @@ class StatusDataClass:
     id: int = None
 
     @classmethod
-    def from_instance(cls, status_model: "Status") -> "StatusDataClass":
+    def from_instance(
+        cls, status_model: "Status", user: "User" = None
+    ) -> "StatusDataClass":
         """
         This method creates a StatusDataClass from a Status model.
 
         Args:
             status_model: The Status model to create the StatusDataClass from.
+            user: The author of the status, when the caller already has it.
+                Otherwise the author is read from `status_model.user`, which
+                should be loaded with `select_related("user")`.
 
         Returns:
             The StatusDataClass created from the Status model.
         """
+        if user is None:
+            user = status_model.user
 
         return cls(
             content=status_model.content,
             date_published=status_model.date_published,
             id=status_model.id,
-            user=status_model.user,
+            user=user_services.UserDataClass.from_instance(user),
         )
 
 
+@timing.instrument("status")
 def create_status(user, status_dc: "StatusDataClass") -> "StatusDataClass":
     """
     This function creates a new status.
@@ -58,47 +240,630 @@ def create_status(user, status_dc: "StatusDataClass") -> "StatusDataClass":
     Returns:
         The StatusDataClass created from the status_dc.
     """
-    status_create = status_models.Status.objects.create(
+    sharding.check_user_shard_writable(user.id)
+    status_create = status_models.Status.objects.using(
+        sharding.get_user_shard(user.id)
+    ).create(
+        id=sharding.new_status_id(),
         content=status_dc.content,
-        user=user,
+        user_id=user.id,
     )
+    _statuses_changed(user.id)
+    timeline.push(user.id, [(status_create.id, status_create.date_published)])
 
-    return StatusDataClass.from_instance(status_model=status_create)
+    return StatusDataClass.from_instance(status_model=status_create, user=user)
 
 
-def get_user_status(user: "User") -> list["StatusDataClass"]:
+@timing.instrument("status")
+def bulk_create_status(
+    user, status_dcs: list["StatusDataClass"]
+) -> list["StatusDataClass"]:
     """
-    This function gets the statuses for a user.
+    This function creates several statuses at once.
+
+    The statuses are inserted with a single `bulk_create` in one transaction.
 
     Args:
-        user: The user to get the statuses for.
+        user: The user who created the statuses.
+        status_dcs: The StatusDataClass objects to create the statuses from.
 
     Returns:
-        A list of StatusDataClass objects for the user.
+        The StatusDataClass objects of the created statuses, with their IDs.
     """
-    user_status = status_models.Status.objects.filter(user=user)
+    sharding.check_user_shard_writable(user.id)
+    shard = sharding.get_user_shard(user.id)
+
+    with transaction.atomic(using=shard):
+        statuses = status_models.Status.objects.using(shard).bulk_create(
+            [
+                status_models.Status(
+                    id=sharding.new_status_id(),
+                    content=status_dc.content,
+                    user_id=user.id,
+                )
+                for status_dc in status_dcs
+            ]
+        )
+
+    _statuses_changed(user.id)
+    timeline.push(
+        user.id, [(status.id, status.date_published) for status in statuses]
+    )
 
     return [
-        StatusDataClass.from_instance(single_status)
-        for single_status in user_status
+        StatusDataClass.from_instance(status_model=status, user=user)
+        for status in statuses
+    ]
+
+
+"""
+This data class represents a page of statuses.
+
+It contains the statuses of the page and the cursor of the next page.
+"""
+
+
+@dataclasses.dataclass
+class StatusPageDataClass:
+    results: list["StatusDataClass"]
+    next: str = None
+
+
+def encode_status_cursor(
+    date_published: datetime.datetime, status_id: int
+) -> str:
+    """
+    This function encodes the position of a status into an opaque cursor.
+
+    Args:
+        date_published: The date published of the last status of a page.
+        status_id: The ID of the last status of a page.
+
+    Returns:
+        The cursor pointing right after the status.
+    """
+    position = f"{date_published.isoformat()}|{status_id}"
+
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_status_cursor(cursor: str) -> tuple[datetime.datetime, int]:
+    """
+    This function decodes a cursor created by `encode_status_cursor`.
+
+    Args:
+        cursor: The cursor to decode.
+
+    Returns:
+        The date published and the ID of the status the cursor points after.
+    """
+    try:
+        position = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date_published, status_id = position.split("|")
+
+        return datetime.datetime.fromisoformat(date_published), int(status_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise exceptions.ValidationError({"cursor": "Invalid cursor"})
+
+
+def _user_status_page_queryset(user_status, limit: int, cursor: str = None):
+    if cursor:
+        date_published, status_id = decode_status_cursor(cursor)
+        # The redundant upper bound lets the index seek straight to the cursor
+        user_status = user_status.filter(
+            Q(date_published__lt=date_published) | Q(id__lt=status_id),
+            date_published__lte=date_published,
+        )
+
+    # One extra row tells whether there is a next page
+    return user_status.order_by(*STATUS_ORDERING)[: limit + 1]
+
+
+# Columns read by the fast read path, see `serializer.StatusReadSerializer`
+STATUS_VALUES = ("id", "content", "date_published", "updated_at")
+STATUS_DETAILS_VALUES = STATUS_VALUES + (
+    "user__id",
+    "user__first_name",
+    "user__last_name",
+    "user__email",
+    "user__profile_version",
+)
+
+
+def get_status_page_limit(limit: str = None) -> int:
+    """
+    This function validates the `limit` query parameter of a status page.
+
+    Args:
+        limit: The requested number of statuses, `STATUS_PAGE_SIZE` if None.
+
+    Returns:
+        The limit, capped at `STATUS_PAGE_MAX_SIZE`.
+    """
+    if limit is None:
+        limit = settings.STATUS_PAGE_SIZE
+
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise exceptions.ValidationError({"limit": "Invalid limit"})
+
+    if limit < 1:
+        raise exceptions.ValidationError({"limit": "Invalid limit"})
+
+    return min(limit, settings.STATUS_PAGE_MAX_SIZE)
+
+
+@timing.instrument("status")
+def get_user_status_values(user: "User") -> list[dict]:
+    """
+    This function gets the statuses for a user as rows, newest first.
+
+    Args:
+        user: The user to get the statuses for.
+
+    Returns:
+        A list of dicts with the `STATUS_VALUES` columns of each status.
+    """
+    user_status = _user_statuses(user)
+
+    with _replica_reads(user):
+        return list(
+            user_status.order_by(*STATUS_ORDERING).values(*STATUS_VALUES)
+        )
+
+
+def iter_user_status_values(user: "User", chunk_size: int):
+    """
+    This function iterates over the statuses for a user as rows, newest first.
+
+    The rows are fetched from the database `chunk_size` at a time instead of
+    being loaded all at once.
+
+    Args:
+        user: The user to get the statuses for.
+        chunk_size: The number of rows fetched from the database at a time.
+
+    Returns:
+        An iterator of dicts with the `STATUS_VALUES` columns of each status.
+    """
+    user_status = _user_statuses(user)
+
+    with _replica_reads(user):
+        # The rows are read after the block, from the database chosen in it
+        user_status = user_status.using(user_status.db)
+
+    return (
+        user_status.order_by(*STATUS_ORDERING)
+        .values(*STATUS_VALUES)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+@timing.instrument("status")
+def get_user_status_values_page(
+    user: "User", limit: int, cursor: str = None
+) -> "StatusPageDataClass":
+    """
+    This function gets a page of statuses for a user as rows, newest first.
+
+    Args:
+        user: The user to get the statuses for.
+        limit: The maximum number of statuses in the page.
+        cursor: The cursor returned with the previous page.
+
+    Returns:
+        A StatusPageDataClass with the rows and the next cursor.
+    """
+    user_status = _user_status_page_queryset(
+        _user_statuses(user), limit, cursor
+    )
+
+    with _replica_reads(user):
+        results = list(user_status.values(*STATUS_VALUES))
+
+    return _values_page(results, limit)
+
+
+@timing.instrument("status")
+def search_user_status_values_page(
+    user: "User", query: str, limit: int, cursor: str = None
+) -> "StatusPageDataClass":
+    """
+    This function searches the statuses of a user as rows, best match first.
+
+    The statuses containing every word of the query are found by the search
+    backend of the database, see `status/search.py`.
+
+    Args:
+        user: The user to search the statuses of.
+        query: The words to look for.
+        limit: The maximum number of statuses in the page.
+        cursor: The cursor returned with the previous page.
+
+    Returns:
+        A StatusPageDataClass with the rows and the next cursor.
+    """
+    terms = search.get_search_terms(query)
+    offset = decode_search_cursor(cursor) if cursor else 0
+
+    if not terms:
+        return StatusPageDataClass(results=[])
+
+    with _replica_reads(user):
+        user_status = _user_statuses(user)
+        alias = user_status.db
+        status_ids = search.get_search_backend(alias).search(
+            alias, user.id, terms, limit + 1, offset
+        )
+        rows = {
+            row["id"]: row
+            for row in user_status.using(alias)
+            .filter(id__in=status_ids[:limit])
+            .values(*STATUS_VALUES)
+        }
+
+    # A status deleted since the search is left out of the page
+    results = [
+        rows[status_id] for status_id in status_ids if status_id in rows
     ]
 
+    if len(status_ids) <= limit:
+        return StatusPageDataClass(results=results)
+
+    return StatusPageDataClass(
+        results=results, next=encode_search_cursor(offset + limit)
+    )
+
+
+def encode_search_cursor(offset: int) -> str:
+    """
+    This function encodes the position of a search page into a cursor.
+
+    Search results are ranked, so the position is the number of results
+    already returned.
+
+    Args:
+        offset: The number of results before the next page.
+
+    Returns:
+        The cursor of the next page.
+    """
+    return base64.urlsafe_b64encode(f"search|{offset}".encode()).decode()
+
 
-def get_user_status_details(status_id: int) -> "StatusDataClass":
+def decode_search_cursor(cursor: str) -> int:
     """
-    This function gets the details of a status.
+    This function decodes a cursor created by `encode_search_cursor`.
+
+    Args:
+        cursor: The cursor to decode.
+
+    Returns:
+        The number of results before the page.
+    """
+    try:
+        kind, offset = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+
+        if kind != "search" or int(offset) < 0:
+            raise ValueError(cursor)
+
+        return int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise exceptions.ValidationError({"cursor": "Invalid cursor"})
+
+
+@timing.instrument("status")
+def get_home_timeline_values_page(
+    user: "User", limit: int, cursor: str = None
+) -> "StatusPageDataClass":
+    """
+    This function gets a page of the home timeline of a user, newest first.
+
+    The timeline holds the statuses of the users the user follows. Most of
+    them were pushed to the timeline when they were created, the statuses
+    of the authors in pull mode are read from the authors' statuses.
+
+    Args:
+        user: The user to get the timeline of.
+        limit: The maximum number of statuses in the page.
+        cursor: The cursor returned with the previous page.
+
+    Returns:
+        A StatusPageDataClass with the rows, with their author, and the next
+        cursor.
+    """
+    position = decode_status_cursor(cursor) if cursor else None
+    refs = timeline.get_pushed(user.id, limit + 1, position)
+
+    for author_id in timeline.get_pull_authors(user.id):
+        author_status = _user_status_page_queryset(
+            _author_statuses(author_id), limit, cursor
+        )
+
+        with routers.replica_reads(routers.user_key(author_id)):
+            refs += author_status.values_list(
+                "date_published", "id", "user_id"
+            )
+
+    # Statuses pushed before their author switched to pull mode are pulled
+    # as well, the duplicates are dropped
+    refs = sorted(set(refs), reverse=True)[: limit + 1]
+    rows = _get_status_rows(refs[:limit])
+    # A status deleted since it was pushed is left out of the page
+    results = [rows[ref[1]] for ref in refs[:limit] if ref[1] in rows]
+
+    if len(refs) <= limit:
+        return StatusPageDataClass(results=results)
+
+    date_published, status_id, _ = refs[limit - 1]
+
+    return StatusPageDataClass(
+        results=results, next=encode_status_cursor(date_published, status_id)
+    )
+
+
+def _get_status_rows(refs: list[tuple]) -> dict[int, dict]:
+    # The `STATUS_DETAILS_VALUES` rows of statuses of any author, by ID
+    if not sharding.is_sharded():
+        with _replica_reads():
+            return {
+                row["id"]: row
+                for row in status_models.Status.objects.filter(
+                    id__in=[status_id for _, status_id, _ in refs]
+                ).values(*STATUS_DETAILS_VALUES)
+            }
+
+    status_ids = {}
+
+    for _, status_id, author_id in refs:
+        shard = sharding.get_user_shard(author_id)
+        status_ids.setdefault(shard, []).append(status_id)
+
+    rows = {}
+
+    for alias, ids in status_ids.items():
+        for row in (
+            status_models.Status.objects.using(alias)
+            .filter(id__in=ids)
+            .values(*STATUS_VALUES, "user_id")
+        ):
+            author = user_services.user_id_selector(user_id=row.pop("user_id"))
+
+            if author is not None:
+                rows[row["id"]] = _with_author(
+                    row, author, STATUS_DETAILS_VALUES
+                )
+
+    return rows
+
+
+def backfill_timeline(follower_id: int, author_id: int):
+    """
+    This function pushes the last statuses of an author to a new follower.
+
+    Args:
+        follower_id: The ID of the user who started following the author.
+        author_id: The ID of the followed user.
+    """
+    if timeline.is_pull_mode(author_id):
+        return
+
+    statuses = _author_statuses(author_id).order_by(*STATUS_ORDERING)
+    timeline.push_to_follower(
+        follower_id,
+        author_id,
+        list(
+            statuses.values_list("id", "date_published")[
+                : settings.TIMELINE["BACKFILL"]
+            ]
+        ),
+    )
+
+
+def _values_page(results: list[dict], limit: int) -> "StatusPageDataClass":
+    if len(results) <= limit:
+        return StatusPageDataClass(results=results)
+
+    results = results[:limit]
+
+    return StatusPageDataClass(
+        results=results,
+        next=encode_status_cursor(
+            results[-1]["date_published"], results[-1]["id"]
+        ),
+    )
+
+
+@timing.instrument("status")
+def get_user_status_details_values(
+    status_id: int, user: "User" = None
+) -> dict:
+    """
+    This function gets the details of a status as a row.
 
     Args:
         status_id: The ID of the status to get the details for.
+        user: The user reading the status, who reads their own writes.
+
+    Returns:
+        A dict with the `STATUS_DETAILS_VALUES` columns of the status.
+    """
+    status = _get_status_row(status_id, STATUS_DETAILS_VALUES, user)
+
+    if status is None:
+        raise Http404("No Status matches the given query.")
+
+    return status
+
+
+"""
+This data class represents the validators of a status response.
+
+They are used to answer conditional requests without reading the statuses.
+"""
+
+
+@dataclasses.dataclass
+class StatusValidatorDataClass:
+    etag: str
+    last_modified: datetime.datetime = None
+
+
+def _user_status_validator(
+    user: "User", count: int, last_modified, variant: str
+) -> "StatusValidatorDataClass":
+    parts = (user.id, user.profile_version, count, last_modified, variant)
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+
+    # Deleting a status doesn't move the last edit, so the lists have no
+    # `Last-Modified`
+    return StatusValidatorDataClass(etag=f'"{digest}"')
+
+
+@timing.instrument("status")
+def get_user_status_validator(
+    user: "User", variant: str = ""
+) -> "StatusValidatorDataClass":
+    """
+    This function computes the validators of the statuses for a user.
+
+    It only reads the number of statuses and the last time one of them was
+    edited, from the `status_user_updated_idx` index. Creating, editing or
+    deleting a status, or editing the user, changes the ETag. It still reads
+    the whole history of the user, so it is only used to answer conditional
+    requests.
+
+    Args:
+        user: The user who owns the statuses.
+        variant: What distinguishes the representation, like a page cursor.
+
+    Returns:
+        The StatusValidatorDataClass of the statuses.
+    """
+    with _replica_reads(user):
+        aggregate = _user_statuses(user).aggregate(
+            count=Count("id"), last_modified=Max("updated_at")
+        )
+
+    return _user_status_validator(
+        user, aggregate["count"], aggregate["last_modified"], variant
+    )
+
+
+def get_user_status_rows_validator(
+    user: "User", rows: list[dict], variant: str = ""
+) -> "StatusValidatorDataClass":
+    """
+    This function computes the validators from all the statuses of a user.
+
+    It gives the same result as `get_user_status_validator` when the rows
+    were already fetched, without another query.
+
+    Args:
+        user: The user who owns the statuses.
+        rows: All the rows returned by `get_user_status_values`.
+        variant: What distinguishes the representation.
+
+    Returns:
+        The StatusValidatorDataClass of the statuses.
+    """
+    last_modified = max((row["updated_at"] for row in rows), default=None)
+
+    return _user_status_validator(user, len(rows), last_modified, variant)
+
+
+def get_status_page_validator(
+    user: "User", page: "StatusPageDataClass", variant: str = ""
+) -> "StatusValidatorDataClass":
+    """
+    This function computes the validators of a page of statuses from its
+    rows.
+
+    Only the statuses of the page are hashed, the history of the user isn't
+    read again.
+
+    Args:
+        user: The user who owns the statuses.
+        page: The page returned by `get_user_status_values_page` or
+            `search_user_status_values_page`.
+        variant: What distinguishes the representation, like a page cursor.
+
+    Returns:
+        The StatusValidatorDataClass of the page.
+    """
+    parts = (
+        user.id,
+        user.profile_version,
+        [(row["id"], row["updated_at"]) for row in page.results],
+        page.next,
+        variant,
+    )
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+
+    return StatusValidatorDataClass(etag=f'"{digest}"')
+
+
+def get_status_details_row_validator(row: dict) -> "StatusValidatorDataClass":
+    """
+    This function computes the validators of a status from its row.
+
+    Args:
+        row: A row with the `STATUS_DETAILS_VALIDATOR_VALUES` columns, like
+            the one returned by `get_user_status_details_values`.
+
+    Returns:
+        The StatusValidatorDataClass of the status.
+    """
+    parts = (
+        row["id"],
+        row["user__id"],
+        row["user__profile_version"],
+        row["updated_at"],
+    )
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+
+    return StatusValidatorDataClass(
+        etag=f'"{digest}"', last_modified=row["updated_at"]
+    )
+
+
+# Columns needed by `get_status_details_row_validator`
+STATUS_DETAILS_VALIDATOR_VALUES = (
+    "id",
+    "updated_at",
+    "user__id",
+    "user__profile_version",
+)
+
+
+@timing.instrument("status")
+def get_user_status_details_validator(
+    status_id: int, user: "User" = None
+) -> "StatusValidatorDataClass":
+    """
+    This function computes the validators of a status.
+
+    It doesn't read the content of the status.
+
+    Args:
+        status_id: The ID of the status.
+        user: The user reading the status, who reads their own writes.
 
     Returns:
-        The StatusDataClass for the status.
+        The StatusValidatorDataClass of the status.
     """
-    status = get_object_or_404(status_models.Status, pk=status_id)
+    status = _get_status_row(status_id, STATUS_DETAILS_VALIDATOR_VALUES, user)
 
-    return StatusDataClass.from_instance(status_model=status)
+    if status is None:
+        raise Http404("No Status matches the given query.")
 
+    return get_status_details_row_validator(status)
 
+
+@timing.instrument("status")
 def delete_user_status(user: "User", status_id: int) -> "StatusDataClass":
     """
     This function deletes a status.
@@ -110,15 +875,16 @@ def delete_user_status(user: "User", status_id: int) -> "StatusDataClass":
     Returns:
         The StatusDataClass for the deleted status.
     """
-    status = get_object_or_404(status_models.Status, pk=status_id)
-
-    if status.user.id != user.id:
-        raise exceptions.PermissionDenied("Forbidden")
+    sharding.check_user_shard_writable(user.id)
+    status = _get_owned_status(user, status_id, fields=("id", "user_id"))
 
     # It is not recommended to delete objects from the database because it can affect its performance in the future
     status.delete()
+    _statuses_changed(user.id)
+    timeline.remove([status_id])
 
 
+@timing.instrument("status")
 def update_user_status(
     user: "User", status_id: int, status_data: "StatusDataClass"
 ):
@@ -133,12 +899,364 @@ def update_user_status(
     Returns:
         The StatusDataClass for the updated status.
     """
-    status = get_object_or_404(status_models.Status, pk=status_id)
+    sharding.check_user_shard_writable(user.id)
+    status = _get_owned_status(user, status_id)
 
-    if status.user.id != user.id:
-        raise exceptions.PermissionDenied("Forbidden")
+    status.content = status_data.content
+    status.save(update_fields=["content", "updated_at"])
+    _statuses_changed(user.id)
+
+    return StatusDataClass.from_instance(status_model=status, user=user)
+
+
+"""
+This data class represents the outcome of a bulk operation on statuses.
+
+It contains the IDs that were applied and the IDs that were rejected, with
+the reason they were rejected.
+"""
+
+
+@dataclasses.dataclass
+class StatusBulkResultDataClass:
+    applied: list[int]
+    rejected: list[dict]
+
+
+def _split_owned_status_ids(
+    user: "User", status_ids: list[int], shard=None
+) -> tuple[list[int], list[dict]]:
+    owners = dict(
+        status_models.Status.objects.using(shard)
+        .filter(id__in=status_ids)
+        .values_list("id", "user_id")
+    )
+
+    # The IDs missing from the user's shard may belong to other users
+    for alias in sharding.get_search_shards(shard)[1:]:
+        missing = [
+            status_id for status_id in status_ids if status_id not in owners
+        ]
+
+        if not missing:
+            break
+
+        owners.update(
+            status_models.Status.objects.using(alias)
+            .filter(id__in=missing)
+            .values_list("id", "user_id")
+        )
+
+    owned = []
+    rejected = []
+
+    for status_id in status_ids:
+        if status_id not in owners:
+            rejected.append(dict(id=status_id, reason="not_found"))
+        elif owners[status_id] != user.id:
+            rejected.append(dict(id=status_id, reason="forbidden"))
+        else:
+            owned.append(status_id)
+
+    return owned, rejected
+
+
+@timing.instrument("status")
+def bulk_delete_user_status(
+    user: "User", status_ids: list[int]
+) -> "StatusBulkResultDataClass":
+    """
+    This function deletes several statuses at once.
+
+    The statuses owned by the user are removed with a single `DELETE`, the
+    other IDs are reported as rejected.
+
+    Args:
+        user: The user who owns the statuses.
+        status_ids: The IDs of the statuses to delete.
+
+    Returns:
+        The StatusBulkResultDataClass with the applied and rejected IDs.
+    """
+    status_ids = list(dict.fromkeys(status_ids))
+    sharding.check_user_shard_writable(user.id)
+    shard = sharding.get_user_shard(user.id)
+
+    with transaction.atomic(using=shard):
+        owned, rejected = _split_owned_status_ids(user, status_ids, shard)
+
+        if owned:
+            status_models.Status.objects.using(shard).filter(
+                user_id=user.id, id__in=owned
+            ).delete()
+
+    if owned:
+        _statuses_changed(user.id)
+        timeline.remove(owned)
+
+    return StatusBulkResultDataClass(applied=owned, rejected=rejected)
+
+
+@timing.instrument("status")
+def bulk_update_user_status(
+    user: "User", status_dcs: list["StatusDataClass"]
+) -> "StatusBulkResultDataClass":
+    """
+    This function updates the content of several statuses at once.
+
+    The statuses owned by the user are updated with a single `bulk_update`,
+    the other IDs are reported as rejected.
+
+    Args:
+        user: The user who owns the statuses.
+        status_dcs: The StatusDataClass objects with the ID and new content.
+
+    Returns:
+        The StatusBulkResultDataClass with the applied and rejected IDs.
+    """
+    contents = {status_dc.id: status_dc.content for status_dc in status_dcs}
+    # `bulk_update` doesn't fill `auto_now` fields
+    updated_at = timezone.now()
+    sharding.check_user_shard_writable(user.id)
+    shard = sharding.get_user_shard(user.id)
+
+    with transaction.atomic(using=shard):
+        owned, rejected = _split_owned_status_ids(user, list(contents), shard)
+
+        status_models.Status.objects.using(shard).bulk_update(
+            [
+                status_models.Status(
+                    id=status_id,
+                    content=contents[status_id],
+                    updated_at=updated_at,
+                )
+                for status_id in owned
+            ],
+            ["content", "updated_at"],
+        )
+
+    if owned:
+        _statuses_changed(user.id)
+
+    return StatusBulkResultDataClass(applied=owned, rejected=rejected)
+
+
+"""
+These functions are the async versions of the status services.
+
+They are used by the async API views and run on the async ORM.
+"""
+
+
+@timing.instrument("status")
+async def acreate_status(
+    user, status_dc: "StatusDataClass"
+) -> "StatusDataClass":
+    """
+    This function creates a new status from an async view.
+
+    Args:
+        user: The user who created the status.
+        status_dc: The StatusDataClass to create the status from.
+
+    Returns:
+        The StatusDataClass created from the status_dc.
+    """
+    sharding.check_user_shard_writable(user.id)
+    status_create = await status_models.Status.objects.using(
+        await sharding.aget_user_shard(user.id)
+    ).acreate(
+        id=sharding.new_status_id(),
+        content=status_dc.content,
+        user_id=user.id,
+    )
+    await _astatuses_changed(user.id)
+    await timeline.apush(
+        user.id, [(status_create.id, status_create.date_published)]
+    )
+
+    return StatusDataClass.from_instance(status_model=status_create, user=user)
+
+
+@timing.instrument("status")
+async def aget_user_status_values(user: "User") -> list[dict]:
+    """
+    This function gets the statuses for a user as rows from an async view.
+
+    Args:
+        user: The user to get the statuses for.
+
+    Returns:
+        A list of dicts with the `STATUS_VALUES` columns of each status.
+    """
+    user_status = await _auser_statuses(user)
+
+    with _replica_reads(user):
+        return [
+            row
+            async for row in user_status.order_by(*STATUS_ORDERING).values(
+                *STATUS_VALUES
+            )
+        ]
+
+
+async def aiter_user_status_values(user: "User", chunk_size: int):
+    """
+    This function iterates over the statuses for a user from an async view.
+
+    Args:
+        user: The user to get the statuses for.
+        chunk_size: The number of rows fetched from the database at a time.
+
+    Returns:
+        An async iterator of dicts with the `STATUS_VALUES` columns.
+    """
+    user_status = await _auser_statuses(user)
+
+    with _replica_reads(user):
+        user_status = user_status.using(user_status.db)
+
+    async for row in (
+        user_status.order_by(*STATUS_ORDERING)
+        .values(*STATUS_VALUES)
+        .aiterator(chunk_size=chunk_size)
+    ):
+        yield row
+
+
+@timing.instrument("status")
+async def aget_user_status_values_page(
+    user: "User", limit: int, cursor: str = None
+) -> "StatusPageDataClass":
+    """
+    This function gets a page of statuses for a user from an async view.
+
+    Args:
+        user: The user to get the statuses for.
+        limit: The maximum number of statuses in the page.
+        cursor: The cursor returned with the previous page.
+
+    Returns:
+        A StatusPageDataClass with the rows and the next cursor.
+    """
+    user_status = _user_status_page_queryset(
+        await _auser_statuses(user), limit, cursor
+    )
+
+    with _replica_reads(user):
+        results = [row async for row in user_status.values(*STATUS_VALUES)]
 
+    return _values_page(results, limit)
+
+
+@timing.instrument("status")
+async def aget_user_status_details_values(
+    status_id: int, user: "User" = None
+) -> dict:
+    """
+    This function gets the details of a status as a row from an async view.
+
+    Args:
+        status_id: The ID of the status to get the details for.
+        user: The user reading the status, who reads their own writes.
+
+    Returns:
+        A dict with the `STATUS_DETAILS_VALUES` columns of the status.
+    """
+    status = await _aget_status_row(status_id, STATUS_DETAILS_VALUES, user)
+
+    if status is None:
+        raise Http404("No Status matches the given query.")
+
+    return status
+
+
+@timing.instrument("status")
+async def aget_user_status_validator(
+    user: "User", variant: str = ""
+) -> "StatusValidatorDataClass":
+    """
+    This function computes the validators of the statuses for a user from an
+    async view.
+
+    Args:
+        user: The user who owns the statuses.
+        variant: What distinguishes the representation, like a page cursor.
+
+    Returns:
+        The StatusValidatorDataClass of the statuses.
+    """
+    with _replica_reads(user):
+        aggregate = await (await _auser_statuses(user)).aaggregate(
+            count=Count("id"), last_modified=Max("updated_at")
+        )
+
+    return _user_status_validator(
+        user, aggregate["count"], aggregate["last_modified"], variant
+    )
+
+
+@timing.instrument("status")
+async def aget_user_status_details_validator(
+    status_id: int, user: "User" = None
+) -> "StatusValidatorDataClass":
+    """
+    This function computes the validators of a status from an async view.
+
+    Args:
+        status_id: The ID of the status.
+        user: The user reading the status, who reads their own writes.
+
+    Returns:
+        The StatusValidatorDataClass of the status.
+    """
+    status = await _aget_status_row(
+        status_id, STATUS_DETAILS_VALIDATOR_VALUES, user
+    )
+
+    if status is None:
+        raise Http404("No Status matches the given query.")
+
+    return get_status_details_row_validator(status)
+
+
+@timing.instrument("status")
+async def adelete_user_status(user: "User", status_id: int):
+    """
+    This function deletes a status from an async view.
+
+    Args:
+        user: The user who owns the status.
+        status_id: The ID of the status to delete.
+    """
+    sharding.check_user_shard_writable(user.id)
+    status = await _aget_owned_status(
+        user, status_id, fields=("id", "user_id")
+    )
+    await status.adelete()
+    await _astatuses_changed(user.id)
+    await timeline.aremove([status_id])
+
+
+@timing.instrument("status")
+async def aupdate_user_status(
+    user: "User", status_id: int, status_data: "StatusDataClass"
+) -> "StatusDataClass":
+    """
+    This function updates a status from an async view.
+
+    Args:
+        user: The user who owns the status.
+        status_id: The ID of the status to update.
+        status_data: The updated status data.
+
+    Returns:
+        The StatusDataClass for the updated status.
+    """
+    sharding.check_user_shard_writable(user.id)
+    status = await _aget_owned_status(user, status_id)
     status.content = status_data.content
-    status.save()
+    await status.asave(update_fields=["content", "updated_at"])
+    await _astatuses_changed(user.id)
 
-    return StatusDataClass.from_instance(status_model=status)
+    return StatusDataClass.from_instance(status_model=status, user=user)
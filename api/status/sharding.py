@@ -0,0 +1,315 @@
+import os
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import exceptions
+
+from . import models as status_models
+
+"""
+This module spreads the statuses over several databases by user.
+
+`settings.STATUS_SHARDS` lists the database aliases holding statuses. All
+the statuses of a user live on one shard, computed from the user ID with a
+stable hash unless the user was moved by `rebalance_statuses`, in which case
+the `UserShard` table of the `default` database tells where they are.
+The shards read from the table are cached for
+`settings.STATUS_SHARD_CACHE_TIMEOUT` seconds.
+
+With `default` as the only shard, statuses aren't sharded and none of this
+costs anything.
+"""
+
+SHARD_KEY_PREFIX = "status:shard:"
+LOCK_KEY_PREFIX = "status:shard_lock:"
+
+
+class StatusShardLocked(exceptions.APIException):
+    """
+    This exception refuses a write while the user's statuses are moved.
+    """
+
+    status_code = 503
+    default_detail = "Statuses are being moved, retry later"
+    default_code = "statuses_moving"
+
+
+def is_sharded() -> bool:
+    return list(settings.STATUS_SHARDS) != ["default"]
+
+
+def hash_shard(user_id: int) -> str:
+    """
+    This function computes the shard of a user from the user ID.
+
+    Args:
+        user_id: The ID of the user.
+
+    Returns:
+        The alias of the shard, the same in every process.
+    """
+    shards = settings.STATUS_SHARDS
+
+    return shards[zlib.crc32(str(user_id).encode()) % len(shards)]
+
+
+def get_user_shard(user_id: int):
+    """
+    This function returns the shard holding the statuses of a user.
+
+    Args:
+        user_id: The ID of the user.
+
+    Returns:
+        The alias of the shard, or None when statuses aren't sharded.
+    """
+    if not is_sharded():
+        return None
+
+    key = f"{SHARD_KEY_PREFIX}{user_id}"
+    shard = _cache().get(key)
+
+    if shard is None:
+        shard = (
+            status_models.UserShard.objects.using("default")
+            .filter(user_id=user_id)
+            .values_list("shard", flat=True)
+            .first()
+        ) or hash_shard(user_id)
+        _cache().set(key, shard, timeout=settings.STATUS_SHARD_CACHE_TIMEOUT)
+
+    return shard
+
+
+async def aget_user_shard(user_id: int):
+    """
+    This function returns the shard of a user from async code.
+
+    It works like `get_user_shard` with the async ORM.
+    """
+    if not is_sharded():
+        return None
+
+    key = f"{SHARD_KEY_PREFIX}{user_id}"
+    shard = _cache().get(key)
+
+    if shard is None:
+        shard = (
+            await status_models.UserShard.objects.using("default")
+            .filter(user_id=user_id)
+            .values_list("shard", flat=True)
+            .afirst()
+        ) or hash_shard(user_id)
+        _cache().set(key, shard, timeout=settings.STATUS_SHARD_CACHE_TIMEOUT)
+
+    return shard
+
+
+def set_user_shard(user_id: int, shard: str):
+    """
+    This function records that the statuses of a user moved to a shard.
+
+    Args:
+        user_id: The ID of the user.
+        shard: The alias of the shard now holding the statuses.
+    """
+    status_models.UserShard.objects.using("default").update_or_create(
+        user_id=user_id, defaults=dict(shard=shard)
+    )
+    _cache().set(
+        f"{SHARD_KEY_PREFIX}{user_id}",
+        shard,
+        timeout=settings.STATUS_SHARD_CACHE_TIMEOUT,
+    )
+
+
+def get_search_shards(shard=None) -> list:
+    """
+    This function lists the shards to search for a status by ID.
+
+    Args:
+        shard: The shard to search first, usually the reader's.
+
+    Returns:
+        The shard aliases, `[None]` when statuses aren't sharded.
+    """
+    if not is_sharded():
+        return [None]
+
+    others = [alias for alias in settings.STATUS_SHARDS if alias != shard]
+
+    return [shard] + others if shard else others
+
+
+def lock_user_shard(user_id: int, timeout: int):
+    """
+    This function refuses the writes to the statuses of a user for a while.
+
+    Args:
+        user_id: The ID of the user.
+        timeout: The number of seconds after which the lock is released.
+    """
+    _cache().set(f"{LOCK_KEY_PREFIX}{user_id}", True, timeout=timeout)
+
+
+def unlock_user_shard(user_id: int):
+    _cache().delete(f"{LOCK_KEY_PREFIX}{user_id}")
+
+
+def check_user_shard_writable(user_id: int):
+    """
+    This function is called before writing the statuses of a user.
+
+    Raises:
+        StatusShardLocked: If the user's statuses are being moved.
+    """
+    if is_sharded() and _cache().get(f"{LOCK_KEY_PREFIX}{user_id}"):
+        raise StatusShardLocked()
+
+
+class StatusShardRouter:
+    """
+    This class routes the saves and deletes of a Status to its user's shard.
+
+    Querysets are bound to the shard by the status services with `using`.
+    """
+
+    def db_for_read(self, model, **hints):
+        return self._instance_shard(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._instance_shard(model, hints)
+
+    def _instance_shard(self, model, hints):
+        instance = hints.get("instance")
+
+        if (
+            model is not status_models.Status
+            or instance is None
+            or not is_sharded()
+        ):
+            return None
+
+        if instance._state.db is not None:
+            return instance._state.db
+
+        return get_user_shard(instance.user_id)
+
+
+class StatusIdGenerator:
+    """
+    This class generates status IDs unique across all the shards.
+
+    The IDs are made of the milliseconds since `epoch_ms` (41 bits), the ID
+    of the generating process (10 bits) and a sequence (12 bits), so they
+    grow over time like the autoincrement IDs they replace.
+    """
+
+    epoch_ms = 1672531200000  # 2023-01-01
+    worker_bits = 10
+    sequence_bits = 12
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id % (1 << self.worker_bits)
+        self.last_ms = -1
+        self.sequence = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            now_ms = self._now_ms()
+
+            if now_ms == self.last_ms:
+                self.sequence = (self.sequence + 1) % (1 << self.sequence_bits)
+
+                if self.sequence == 0:
+                    # The sequence ran out in this millisecond
+                    now_ms = self._wait_after(self.last_ms)
+            else:
+                self.sequence = 0
+
+            self.last_ms = now_ms
+
+            return (
+                (now_ms - self.epoch_ms)
+                << (self.worker_bits + self.sequence_bits)
+                | self.worker_id << self.sequence_bits
+                | self.sequence
+            )
+
+    def _now_ms(self) -> int:
+        now_ms = time.time_ns() // 1_000_000
+
+        if now_ms < self.last_ms:
+            # The clock went back, wait until it reaches the last ID again
+            now_ms = self._wait_after(self.last_ms - 1)
+
+        return now_ms
+
+    def _wait_after(self, last_ms: int) -> int:
+        now_ms = time.time_ns() // 1_000_000
+
+        while now_ms <= last_ms:
+            time.sleep(0.0001)
+            now_ms = time.time_ns() // 1_000_000
+
+        return now_ms
+
+
+_id_generator = None
+_id_generator_pid = None
+_id_generator_lock = threading.Lock()
+
+
+def new_status_id():
+    """
+    This function returns the ID of a new status.
+
+    Returns:
+        A generated ID when statuses are sharded, None otherwise to let the
+        database number the status.
+
+    Raises:
+        ImproperlyConfigured: If statuses are sharded without
+            `settings.STATUS_ID_WORKER`.
+    """
+    global _id_generator, _id_generator_pid
+
+    if not is_sharded():
+        return None
+
+    # Forked workers must not share the generator of their parent
+    if _id_generator_pid != os.getpid():
+        with _id_generator_lock:
+            if _id_generator_pid != os.getpid():
+                worker_id = settings.STATUS_ID_WORKER
+
+                # PIDs collide modulo the 10 bits of the worker ID
+                if worker_id is None:
+                    raise ImproperlyConfigured(
+                        "STATUS_ID_WORKER is required when statuses are "
+                        "sharded"
+                    )
+
+                _id_generator = StatusIdGenerator(worker_id)
+                _id_generator_pid = os.getpid()
+
+    return _id_generator.next_id()
+
+
+@receiver(setting_changed)
+def _reset_id_generator(setting, **kwargs):
+    global _id_generator, _id_generator_pid
+
+    if setting == "STATUS_ID_WORKER":
+        _id_generator = _id_generator_pid = None
+
+
+def _cache():
+    return caches[settings.STATUS_SHARD_CACHE_ALIAS]
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user.models import Follow, User
+
+from . import models, services, sharding, timeline
+
+"""
+These receivers keep the statuses in line with the users.
+
+The statuses of a deleted user are deleted from every shard, the `default`
+database cascades the delete itself but the other shards aren't reached by
+the foreign key of the statuses. Following a user pushes their last
+statuses to the follower's timeline, unfollowing removes them.
+"""
+
+
+@receiver(post_delete, sender=User)
+def delete_sharded_statuses_on_user_delete(sender, instance, **kwargs):
+    if not sharding.is_sharded():
+        return
+
+    for alias in sharding.get_search_shards():
+        models.Status.objects.using(alias).filter(user_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=Follow)
+def backfill_timeline_on_follow(sender, instance, created, **kwargs):
+    if created:
+        services.backfill_timeline(instance.follower_id, instance.followee_id)
+
+
+@receiver(post_delete, sender=Follow)
+def drop_timeline_on_unfollow(sender, instance, **kwargs):
+    timeline.drop(instance.follower_id, instance.followee_id)
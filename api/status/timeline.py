@@ -0,0 +1,217 @@
+import datetime
+
+from django.conf import settings
+from django.db.models import Q
+
+from core import routers
+from user.models import Follow
+
+from . import models as status_models
+
+"""
+This module keeps the home timelines of the users.
+
+A new status is pushed to the timeline of every follower of its author
+(fan-out on write), so reading a timeline is one index range scan instead of
+a join across the follow graph. Pushing to millions of followers would make
+posting too slow, so an author with more than `TIMELINE["PULL_THRESHOLD"]`
+followers is switched to pull mode for good: their statuses aren't pushed
+and are merged into the timelines when they are read. The push runs in the
+request, so a bulk creation whose push would write more than
+`TIMELINE["MAX_PUSH_ROWS"]` rows also switches its author.
+
+A follow backfills the timeline while statuses may be pushed to it, so the
+rows already there are skipped.
+"""
+
+
+def is_pull_mode(author_id: int) -> bool:
+    return status_models.PullModeAuthor.objects.filter(
+        user_id=author_id
+    ).exists()
+
+
+def push(author_id: int, statuses: list[tuple[int, datetime.datetime]]):
+    """
+    This function pushes new statuses to the timelines of the followers.
+
+    Args:
+        author_id: The ID of the author of the statuses.
+        statuses: The ID and date published of every new status.
+    """
+    if not statuses or is_pull_mode(author_id):
+        return
+
+    threshold = _get_follower_limit(len(statuses))
+    follower_ids = list(
+        Follow.objects.filter(followee_id=author_id).values_list(
+            "follower_id", flat=True
+        )[: threshold + 1]
+    )
+
+    if len(follower_ids) > threshold:
+        status_models.PullModeAuthor.objects.get_or_create(user_id=author_id)
+        return
+
+    status_models.TimelineEntry.objects.bulk_create(
+        _entries(follower_ids, author_id, statuses),
+        batch_size=settings.TIMELINE["BATCH_SIZE"],
+        ignore_conflicts=True,
+    )
+
+
+async def apush(author_id: int, statuses: list[tuple[int, datetime.datetime]]):
+    """
+    This function pushes new statuses to the timelines from async code.
+
+    It works like `push` with the async ORM.
+    """
+    if (
+        not statuses
+        or await status_models.PullModeAuthor.objects.filter(
+            user_id=author_id
+        ).aexists()
+    ):
+        return
+
+    threshold = _get_follower_limit(len(statuses))
+    follower_ids = [
+        follower_id
+        async for follower_id in Follow.objects.filter(
+            followee_id=author_id
+        ).values_list("follower_id", flat=True)[: threshold + 1]
+    ]
+
+    if len(follower_ids) > threshold:
+        await status_models.PullModeAuthor.objects.aget_or_create(
+            user_id=author_id
+        )
+        return
+
+    await status_models.TimelineEntry.objects.abulk_create(
+        _entries(follower_ids, author_id, statuses),
+        batch_size=settings.TIMELINE["BATCH_SIZE"],
+        ignore_conflicts=True,
+    )
+
+
+def push_to_follower(
+    follower_id: int,
+    author_id: int,
+    statuses: list[tuple[int, datetime.datetime]],
+):
+    """
+    This function pushes existing statuses to the timeline of a follower.
+
+    Args:
+        follower_id: The ID of the user who started following the author.
+        author_id: The ID of the author of the statuses.
+        statuses: The ID and date published of every status.
+    """
+    status_models.TimelineEntry.objects.bulk_create(
+        _entries([follower_id], author_id, statuses),
+        batch_size=settings.TIMELINE["BATCH_SIZE"],
+        ignore_conflicts=True,
+    )
+
+
+def drop(follower_id: int, author_id: int):
+    """
+    This function removes the statuses of an author from a timeline.
+
+    Args:
+        follower_id: The ID of the user who stopped following the author.
+        author_id: The ID of the author.
+    """
+    status_models.TimelineEntry.objects.filter(
+        user_id=follower_id, author_id=author_id
+    ).delete()
+
+
+def remove(status_ids: list[int]):
+    """
+    This function removes deleted statuses from every timeline.
+
+    Args:
+        status_ids: The IDs of the deleted statuses.
+    """
+    status_models.TimelineEntry.objects.filter(
+        status_id__in=status_ids
+    ).delete()
+
+
+async def aremove(status_ids: list[int]):
+    await status_models.TimelineEntry.objects.filter(
+        status_id__in=status_ids
+    ).adelete()
+
+
+def get_pushed(
+    user_id: int, limit: int, position: tuple = None
+) -> list[tuple[datetime.datetime, int, int]]:
+    """
+    This function reads the statuses pushed to a timeline, newest first.
+
+    Args:
+        user_id: The ID of the owner of the timeline.
+        limit: The maximum number of statuses.
+        position: The date published and ID of the status to start after.
+
+    Returns:
+        The date published, ID and author ID of the statuses.
+    """
+    entries = status_models.TimelineEntry.objects.filter(user_id=user_id)
+
+    if position is not None:
+        date_published, status_id = position
+        # The redundant upper bound lets the index seek straight to it
+        entries = entries.filter(
+            Q(date_published__lt=date_published) | Q(status_id__lt=status_id),
+            date_published__lte=date_published,
+        )
+
+    with routers.replica_reads(routers.user_key(user_id)):
+        return list(
+            entries.order_by("-date_published", "-status_id").values_list(
+                "date_published", "status_id", "author_id"
+            )[:limit]
+        )
+
+
+def get_pull_authors(user_id: int) -> list[int]:
+    """
+    This function lists the authors in pull mode followed by a user.
+
+    Args:
+        user_id: The ID of the follower.
+
+    Returns:
+        The IDs of the authors whose statuses are read with the timeline.
+    """
+    with routers.replica_reads(routers.user_key(user_id)):
+        return list(
+            Follow.objects.filter(
+                follower_id=user_id, followee__pull_mode__isnull=False
+            ).values_list("followee_id", flat=True)
+        )
+
+
+def _get_follower_limit(status_count: int) -> int:
+    # The most followers the statuses can be pushed to within the request
+    return min(
+        settings.TIMELINE["PULL_THRESHOLD"],
+        settings.TIMELINE["MAX_PUSH_ROWS"] // status_count,
+    )
+
+
+def _entries(follower_ids, author_id, statuses):
+    return (
+        status_models.TimelineEntry(
+            user_id=follower_id,
+            author_id=author_id,
+            status_id=status_id,
+            date_published=date_published,
+        )
+        for follower_id in follower_ids
+        for status_id, date_published in statuses
+    )
@@ -1,11 +1,32 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     path("", views.StatusCreateListApi.as_view(), name="status"),
+    path("bulk/", views.StatusBulkApi.as_view(), name="status_bulk"),
+    path(
+        "bulk/delete/",
+        views.StatusBulkDeleteApi.as_view(),
+        name="status_bulk_delete",
+    ),
+    path(
+        "timeline/",
+        views.StatusTimelineApi.as_view(),
+        name="status_timeline",
+    ),
     path(
         "<int:status_id>/",
         views.StatusRetrieveUpdateDelete.as_view(),
         name="status_details",
     ),
+    path(
+        "async/",
+        async_views.AsyncStatusCreateListApi.as_view(),
+        name="async_status",
+    ),
+    path(
+        "async/<int:status_id>/",
+        async_views.AsyncStatusRetrieveUpdateDelete.as_view(),
+        name="async_status_details",
+    ),
 ]
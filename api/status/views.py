@@ -1,7 +1,11 @@
-from rest_framework import views, response, permissions
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import views, response, permissions, renderers
 from rest_framework import status as rest_status
 from . import serializer as status_serializer
-from . import services
+from . import conditional, services
+from .cache import get_status_list_cache
+from .renderers import FastJSONRenderer, render_json_array
 from user import authentication
 
 
@@ -15,6 +19,7 @@ It allows users to create and list their statuses.
 class StatusCreateListApi(views.APIView):
     authentication_classes = (authentication.CustomUserAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
+    renderer_classes = (FastJSONRenderer, renderers.BrowsableAPIRenderer)
 
     def post(self, request):
         """
@@ -38,16 +43,253 @@ class StatusCreateListApi(views.APIView):
         """
         This method handles GET requests to the endpoint.
 
-        It returns the user's statuses.
+        It returns the user's statuses. When `limit` or `cursor` is passed,
+        it returns one page of statuses and the cursor of the next page.
+        When `stream=1` is passed, it streams all the statuses. When `q` is
+        passed, it returns one page of the statuses containing its words,
+        best match first.
+
+        The serialized statuses are cached until the user changes one of
+        them, conditional requests are answered with 304 when they haven't
+        changed.
+        """
+        variant = conditional.get_list_variant(request.query_params)
+        stream = (
+            request.query_params.get("stream") == "1"
+            and "q" not in request.query_params
+        )
+        paged = any(
+            param in request.query_params for param in ("limit", "cursor", "q")
+        )
+        list_cache = get_status_list_cache()
+        validator = None
+
+        # Without a cached entry, the validators of the full list are cheaper
+        # than the list. A page is validated from its own rows.
+        if conditional.is_conditional(request) and (
+            stream or not (paged or list_cache.enabled)
+        ):
+            validator = services.get_user_status_validator(
+                user=request.user, variant=variant
+            )
+            not_modified = conditional.get_not_modified_response(
+                request, validator
+            )
+
+            if not_modified is not None:
+                return not_modified
+
+        if stream:
+            # The validators read the whole history, a stream only gets them
+            # when it is revalidated with the ETag of the full list
+            if validator is None:
+                return self._stream(request)
+
+            return conditional.set_validator_headers(
+                self._stream(request), validator
+            )
+
+        entry = list_cache.get_or_build(
+            user=request.user,
+            variant=variant,
+            build=lambda: self._build(request, variant),
+        )
+        not_modified = conditional.get_not_modified_response(
+            request, entry["validator"]
+        )
+
+        if not_modified is not None:
+            return not_modified
+
+        return conditional.set_validator_headers(
+            response.Response(data=entry["data"]), entry["validator"]
+        )
+
+    def _build(self, request, variant):
+        # The serialized statuses and their validators, as they are cached
+        if any(
+            param in request.query_params for param in ("limit", "cursor", "q")
+        ):
+            page_kwargs = dict(
+                user=request.user,
+                limit=services.get_status_page_limit(
+                    request.query_params.get("limit")
+                ),
+                cursor=request.query_params.get("cursor"),
+            )
+
+            if "q" in request.query_params:
+                status_page = services.search_user_status_values_page(
+                    query=request.query_params["q"], **page_kwargs
+                )
+            else:
+                status_page = services.get_user_status_values_page(
+                    **page_kwargs
+                )
+
+            serializer = status_serializer.StatusReadSerializer(
+                status_page.results, many=True, user=request.user
+            )
+            data = {"results": serializer.data, "next": status_page.next}
+            validator = services.get_status_page_validator(
+                user=request.user, page=status_page, variant=variant
+            )
+
+            return dict(data=data, validator=validator)
+
+        status_collection = services.get_user_status_values(user=request.user)
+        serializer = status_serializer.StatusReadSerializer(
+            status_collection, many=True, user=request.user
+        )
+        validator = services.get_user_status_rows_validator(
+            user=request.user, rows=status_collection, variant=variant
+        )
+
+        return dict(data=serializer.data, validator=validator)
+
+    def _stream(self, request):
+        chunk_size = settings.STATUS_STREAM_CHUNK_SIZE
+        status_collection = services.iter_user_status_values(
+            user=request.user, chunk_size=chunk_size
+        )
+        serializer = status_serializer.StatusReadSerializer(
+            None, user=request.user
+        )
+
+        return StreamingHttpResponse(
+            render_json_array(
+                map(serializer.to_representation, status_collection),
+                chunk_size=chunk_size,
+            ),
+            content_type="application/json",
+        )
+
+
+"""
+This class defines the `/api/status/bulk/` endpoint.
+
+It allows users to create and update many statuses in one request.
+"""
+
+
+class StatusBulkApi(views.APIView):
+    authentication_classes = (authentication.CustomUserAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+    renderer_classes = (FastJSONRenderer, renderers.BrowsableAPIRenderer)
+
+    def post(self, request):
+        """
+        This method handles POST requests to the endpoint.
+
+        It validates a list of statuses and creates them all at once.
         """
-        status_collection = services.get_user_status(user=request.user)
         serializer = status_serializer.StatusSerializer(
-            status_collection, many=True
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.STATUS_BULK_MAX_SIZE,
+        )
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        serializer.instance = services.bulk_create_status(
+            user=request.user, status_dcs=data
+        )
+
+        return response.Response(
+            data=serializer.data, status=rest_status.HTTP_201_CREATED
+        )
+
+    def put(self, request):
+        """
+        This method handles PUT requests to the endpoint.
+
+        It updates the content of a list of statuses at once and reports
+        which ones were applied and which ones were rejected.
+        """
+        serializer = status_serializer.StatusBulkUpdateSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.STATUS_BULK_MAX_SIZE,
+        )
+        serializer.is_valid(raise_exception=True)
+
+        result = services.bulk_update_user_status(
+            user=request.user, status_dcs=serializer.validated_data
+        )
+        serializer = status_serializer.StatusBulkResultSerializer(result)
+
+        return response.Response(data=serializer.data)
+
+
+"""
+This class defines the `/api/status/bulk/delete/` endpoint.
+
+It allows users to delete many statuses in one request.
+"""
+
+
+class StatusBulkDeleteApi(views.APIView):
+    authentication_classes = (authentication.CustomUserAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+    renderer_classes = (FastJSONRenderer, renderers.BrowsableAPIRenderer)
+
+    def post(self, request):
+        """
+        This method handles POST requests to the endpoint.
+
+        It deletes a list of statuses at once and reports which ones were
+        applied and which ones were rejected.
+        """
+        serializer = status_serializer.StatusBulkDeleteSerializer(
+            data=request.data
+        )
+        serializer.is_valid(raise_exception=True)
+
+        result = services.bulk_delete_user_status(
+            user=request.user, status_ids=serializer.validated_data["ids"]
         )
+        serializer = status_serializer.StatusBulkResultSerializer(result)
 
         return response.Response(data=serializer.data)
 
 
+"""
+This class defines the `/api/status/timeline/` endpoint.
+
+It allows users to read the statuses of the users they follow.
+"""
+
+
+class StatusTimelineApi(views.APIView):
+    authentication_classes = (authentication.CustomUserAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+    renderer_classes = (FastJSONRenderer, renderers.BrowsableAPIRenderer)
+
+    def get(self, request):
+        """
+        This method handles GET requests to the endpoint.
+
+        It returns one page of the user's home timeline, newest first, and
+        the cursor of the next page.
+        """
+        status_page = services.get_home_timeline_values_page(
+            user=request.user,
+            limit=services.get_status_page_limit(
+                request.query_params.get("limit")
+            ),
+            cursor=request.query_params.get("cursor"),
+        )
+        serializer = status_serializer.StatusReadSerializer(
+            status_page.results, many=True
+        )
+
+        return response.Response(
+            data={"results": serializer.data, "next": status_page.next}
+        )
+
+
 """
 This class defines the `/api/status/<status_id>/` endpoint.
 
@@ -58,17 +300,35 @@ It allows users to retrieve, update, and delete their statuses.
 class StatusRetrieveUpdateDelete(views.APIView):
     authentication_classes = (authentication.CustomUserAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
+    renderer_classes = (FastJSONRenderer, renderers.BrowsableAPIRenderer)
 
     def get(self, request, status_id):
         """
         This method handles GET requests to the endpoint.
 
-        It returns the details of a specific status.
+        It returns the details of a specific status, or 304 when the status
+        hasn't changed since the conditional request's validators.
         """
-        status = services.get_user_status_details(status_id=status_id)
-        serializer = status_serializer.StatusSerializer(status)
+        if conditional.is_conditional(request):
+            validator = services.get_user_status_details_validator(
+                status_id=status_id, user=request.user
+            )
+            not_modified = conditional.get_not_modified_response(
+                request, validator
+            )
 
-        return response.Response(data=serializer.data)
+            if not_modified is not None:
+                return not_modified
+
+        status = services.get_user_status_details_values(
+            status_id=status_id, user=request.user
+        )
+        serializer = status_serializer.StatusReadSerializer(status)
+        resp = response.Response(data=serializer.data)
+
+        return conditional.set_validator_headers(
+            resp, services.get_status_details_row_validator(status)
+        )
 
     def delete(self, request, status_id):
         """
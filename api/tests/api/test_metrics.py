@@ -0,0 +1,177 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from core import metrics
+
+
+def _metrics_settings(**overrides) -> dict:
+    return {
+        "ENABLED": True,
+        "TOKEN": None,
+        "MULTIPROCESS_DIRECTORY": None,
+        "FLUSH_INTERVAL": 5,
+        **overrides,
+    }
+
+
+def _samples(response) -> dict:
+    samples = {}
+
+    for line in response.content.decode().splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+
+    return samples
+
+
+@override_settings(
+    METRICS=_metrics_settings(), STATUS_LIST_CACHE={"ENABLED": True}
+)
+@pytest.mark.django_db
+def test_metrics(user, client_factory):
+    """
+    Test that the requests, logins, queries and cache lookups are measured.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        client_factory (Callable): The factory of APIClient instances.
+    """
+    metrics.registry.clear()
+    client = client_factory()
+    client.post(
+        "/api/users/login/", dict(email=user.email, password="wrongpassword")
+    )
+    client.post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+    client.get("/api/users/me/")
+    client.get("/api/status/")
+    client.get("/api/status/")
+
+    response = client.get("/metrics")
+    samples = _samples(response)
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert samples['auth_attempts_total{method="login",result="failure"}'] == 1
+    assert samples['auth_attempts_total{method="login",result="success"}'] == 1
+    assert samples['auth_attempts_total{method="jwt",result="success"}'] == 3
+    assert (
+        samples[
+            "http_request_duration_seconds_count"
+            '{view="login",method="POST",status="403"}'
+        ]
+        == 1
+    )
+    assert (
+        samples[
+            "http_request_duration_seconds_bucket"
+            '{view="me",method="GET",status="200",le="+Inf"}'
+        ]
+        == 1
+    )
+    assert samples['http_request_db_queries_count{view="status"}'] == 2
+    assert samples['db_query_duration_seconds_count{database="default"}'] > 0
+    assert samples['cache_hit_ratio{cache="status_list"}'] == 0.5
+
+
+@pytest.mark.django_db
+def test_metrics_multiprocess(client_factory, tmp_path):
+    """
+    Test that the metrics of the other processes are added up.
+
+    Args:
+        client_factory (Callable): The factory of APIClient instances.
+        tmp_path (Path): A temporary directory shared by the "processes".
+    """
+    config = _metrics_settings(MULTIPROCESS_DIRECTORY=str(tmp_path))
+
+    with override_settings(METRICS=config):
+        metrics.registry.clear()
+        metrics.count_auth("login", success=True)
+        metrics.CACHE_REQUESTS.inc(cache="user", result="hit")
+        metrics.REQUEST_QUERIES.observe(3, view="me")
+        # The file of another worker process
+        metrics.flush()
+        (snapshot_path,) = tmp_path.glob("metrics-*.json")
+        (tmp_path / "metrics-1.json").write_text(snapshot_path.read_text())
+        snapshot_path.unlink()
+        metrics.CACHE_REQUESTS.inc(cache="user", result="miss")
+
+        response = client_factory().get("/metrics")
+
+    samples = _samples(response)
+
+    assert samples['auth_attempts_total{method="login",result="success"}'] == 2
+    assert samples['cache_hit_ratio{cache="user"}'] == 2 / 3
+    assert samples['http_request_db_queries_bucket{view="me",le="2"}'] == 0
+    assert samples['http_request_db_queries_bucket{view="me",le="3"}'] == 2
+    assert json.loads((tmp_path / "metrics-1.json").read_text())
+
+
+@pytest.mark.django_db
+def test_metrics_dead_processes(client_factory, tmp_path, monkeypatch):
+    """
+    Test that the metrics of dead processes are kept, even when their PID is
+    taken again, and that `clear_metrics` deletes them.
+
+    Args:
+        client_factory (Callable): The factory of APIClient instances.
+        tmp_path (Path): A temporary directory shared by the "processes".
+        monkeypatch (MonkeyPatch): Resets the PID of the last flush.
+    """
+    config = _metrics_settings(MULTIPROCESS_DIRECTORY=str(tmp_path))
+    snapshot = json.dumps({"auth_attempts_total": [[["login", "success"], 1]]})
+    process = subprocess.Popen([sys.executable, "-c", ""])
+    process.wait()
+    dead_path = tmp_path / f"metrics-{process.pid}.json"
+    dead_path.write_text(snapshot)
+    # Left by a dead process with the PID of this one
+    (tmp_path / f"metrics-{os.getpid()}.json").write_text(snapshot)
+
+    with override_settings(METRICS=config):
+        metrics.registry.clear()
+        monkeypatch.setattr(metrics, "_flushed_pid", None)
+        metrics.flush()
+        response = client_factory().get("/metrics")
+
+        assert not dead_path.exists()
+        assert (tmp_path / metrics.DEAD_SNAPSHOT_NAME).exists()
+
+        call_command("clear_metrics", stdout=io.StringIO())
+
+    samples = _samples(response)
+
+    assert samples['auth_attempts_total{method="login",result="success"}'] == 2
+    assert not list(tmp_path.glob("*.json"))
+
+
+@pytest.mark.django_db
+def test_metrics_access(client_factory):
+    """
+    Test that `/metrics` requires its token and is off when disabled.
+
+    Args:
+        client_factory (Callable): The factory of APIClient instances.
+    """
+    with override_settings(METRICS=_metrics_settings(TOKEN="scraper")):
+        client = client_factory()
+
+        assert client.get("/metrics").status_code == 401
+        assert (
+            client.get(
+                "/metrics", HTTP_AUTHORIZATION="Bearer scraper"
+            ).status_code
+            == 200
+        )
+
+    assert client_factory().get("/metrics").status_code == 404
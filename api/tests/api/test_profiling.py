@@ -0,0 +1,94 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from core import profiling
+from status import models
+
+
+def _profiling_settings(directory, **overrides) -> dict:
+    return {
+        "ENABLED": True,
+        "SAMPLE_RATE": 0,
+        "HEADER_MAX_AGE": 60,
+        "DIRECTORY": directory,
+        "MAX_DUMPS": 10,
+        "PROFILER": "cprofile",
+        **overrides,
+    }
+
+
+def _login(user, client_factory):
+    client = client_factory()
+    client.post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+
+    return client
+
+
+@pytest.mark.django_db
+def test_profile_signed_request(user, client_factory, tmp_path):
+    """
+    Test that a request with a signed header is profiled and summarized.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        client_factory (Callable): The factory of APIClient instances.
+        tmp_path (Path): A temporary directory for the profiles.
+    """
+    models.Status.objects.create(user_id=user.id, content="Lorem")
+
+    with override_settings(PROFILING=_profiling_settings(tmp_path)):
+        client = _login(user, client_factory)
+
+        response = client.get("/api/status/")
+        forged = client.get("/api/status/", HTTP_X_PROFILE="profile:forged")
+        profiled = client.get(
+            "/api/status/", HTTP_X_PROFILE=profiling.make_profile_token()
+        )
+
+        assert not response.has_header("X-Profile-Dump")
+        assert not forged.has_header("X-Profile-Dump")
+        assert profiled.status_code == 200
+
+        name = profiled["X-Profile-Dump"]
+        (dump,) = profiling.list_dumps()
+
+        assert dump.name == name
+        assert dump.method == "GET"
+        assert dump.request_path == "api-status"
+
+        listing = io.StringIO()
+        call_command("profiles", "list", stdout=listing)
+        summary = io.StringIO()
+        call_command("profiles", "summary", name, stdout=summary)
+
+    assert name in listing.getvalue()
+    assert "status/views.py" in summary.getvalue()
+    assert "rest_framework/views.py" in summary.getvalue()
+    assert "django/core" not in summary.getvalue()
+
+
+@pytest.mark.django_db
+def test_profile_sampling_ring(user, client_factory, tmp_path):
+    """
+    Test that sampled requests are profiled and only the last ones kept.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        client_factory (Callable): The factory of APIClient instances.
+        tmp_path (Path): A temporary directory for the profiles.
+    """
+    config = _profiling_settings(tmp_path, SAMPLE_RATE=1, MAX_DUMPS=2)
+
+    with override_settings(PROFILING=config):
+        client = _login(user, client_factory)
+        names = [
+            client.get("/api/status/")["X-Profile-Dump"] for _ in range(3)
+        ]
+
+        assert [dump.name for dump in profiling.list_dumps()] == names[1:]
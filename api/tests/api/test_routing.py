@@ -0,0 +1,77 @@
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+
+from core import routers
+from status import models, services
+from user import services as user_services
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1", "replica_2"])
+def test_router_reads_replicas_in_scope():
+    """
+    Test that only the reads made in a replica scope go to a replica.
+    """
+    router = routers.PrimaryReplicaRouter()
+
+    assert models.Status.objects.all().db == "default"
+    assert router.db_for_write(models.Status) == "default"
+
+    with routers.replica_reads(routers.user_key(1)):
+        assert models.Status.objects.all().db in ("replica_1", "replica_2")
+
+        routers.pin_primary(routers.user_key(1))
+
+        assert models.Status.objects.all().db == "default"
+
+    with routers.replica_reads(routers.user_key(2)):
+        assert models.Status.objects.all().db != "default"
+
+
+def test_router_without_replicas():
+    """
+    Test that everything goes to the primary when there is no replica.
+    """
+    with routers.replica_reads(routers.user_key(1)):
+        assert models.Status.objects.all().db == "default"
+
+
+@pytest.mark.django_db
+def test_selectors_read_their_writes(user):
+    """
+    Test that the selectors read a replica until the user writes.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+    """
+    # The replica is a stand-in for the test database, only the choice of
+    # a replica is observed.
+    with override_settings(DATABASE_REPLICAS=["replica_1"]), mock.patch(
+        "core.routers.random.choice", return_value="default"
+    ) as choose_replica:
+        services.get_user_status_values(user=user)
+        user_services.user_email_selector(email=user.email)
+
+        assert choose_replica.call_count == 2
+
+        status = services.create_status(
+            user=user, status_dc=services.StatusDataClass(content="Lorem")
+        )
+        services.get_user_status_values(user=user)
+        services.get_user_status_details_values(status_id=status.id, user=user)
+
+        assert choose_replica.call_count == 2
+
+        other = user_services.create_user(
+            user_dc=user_services.UserDataClass(
+                first_name="Walter",
+                last_name="White",
+                email="walterwhite@gmail.com",
+                password="superstrongpassword",
+            )
+        )
+        user_services.user_email_selector(email=other.email)
+        user_services.user_id_selector(user_id=other.id)
+
+        assert choose_replica.call_count == 2
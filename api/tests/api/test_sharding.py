@@ -0,0 +1,292 @@
+import io
+import time
+from unittest import mock
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+from status import models, services, sharding
+from user import models as user_models
+from user import services as user_services
+
+SHARDS = ["default", "shard_1", "shard_2"]
+
+
+def _shared_caches(path) -> dict:
+    return {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(path),
+        }
+    }
+
+
+def _statuses(alias: str) -> list:
+    return list(
+        models.Status.objects.using(alias)
+        .order_by("id")
+        .values_list("id", "user_id", "content")
+    )
+
+
+def _other_user():
+    return user_services.create_user(
+        user_dc=user_services.UserDataClass(
+            first_name="Walter",
+            last_name="White",
+            email="walterwhite@gmail.com",
+            password="superstrongpassword",
+        )
+    )
+
+
+@override_settings(STATUS_SHARDS=SHARDS)
+@pytest.mark.django_db(databases=SHARDS)
+def test_sharded_status_api(user, client_factory, async_client, async_call):
+    """
+    Test that the statuses of a user are written to and read from their
+    shard, and that other users can't edit them from another shard.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        client_factory (Callable): The factory of APIClient instances.
+        async_client (AsyncClient): The AsyncClient instance.
+        async_call (Callable): The helper running the async requests.
+    """
+    other = _other_user()
+    sharding.set_user_shard(user.id, "shard_1")
+    sharding.set_user_shard(other.id, "shard_2")
+
+    auth_client = client_factory()
+    auth_client.post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+    other_client = client_factory()
+    other_client.post(
+        "/api/users/login/",
+        dict(email=other.email, password="superstrongpassword"),
+    )
+
+    created = auth_client.post("/api/status/", dict(content="Lorem")).data
+
+    assert _statuses("shard_1") == [(created["id"], user.id, "Lorem")]
+    assert _statuses("default") == _statuses("shard_2") == []
+
+    response = auth_client.get("/api/status/")
+
+    assert [status["id"] for status in response.data] == [created["id"]]
+
+    # Any user reads a status, the author comes from the default database
+    response = other_client.get(f"/api/status/{created['id']}/")
+
+    assert response.status_code == 200
+    assert response.data["user"]["email"] == user.email
+
+    async_client.cookies = other_client.cookies
+    response = async_call(
+        async_client.get, f"/api/status/async/{created['id']}/"
+    )
+
+    assert response.json()["user"]["id"] == user.id
+
+    response = other_client.put(
+        f"/api/status/{created['id']}/", dict(content="Edited")
+    )
+
+    assert response.status_code == 403
+    assert other_client.delete("/api/status/999/").status_code == 404
+
+    response = auth_client.put(
+        f"/api/status/{created['id']}/", dict(content="Edited")
+    )
+
+    assert response.data["content"] == "Edited"
+
+    response = auth_client.delete(f"/api/status/{created['id']}/")
+
+    assert response.status_code == 204
+    assert _statuses("shard_1") == []
+
+
+@override_settings(STATUS_SHARDS=SHARDS)
+@pytest.mark.django_db(databases=SHARDS)
+def test_sharded_bulk_status(user):
+    """
+    Test that the bulk services tell the statuses of other shards apart
+    from the missing ones.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+    """
+    other = _other_user()
+    sharding.set_user_shard(user.id, "shard_1")
+    sharding.set_user_shard(other.id, "shard_2")
+
+    owned = services.bulk_create_status(
+        user=user,
+        status_dcs=[services.StatusDataClass(content="Lorem")] * 3,
+    )
+    (foreign,) = services.bulk_create_status(
+        user=other, status_dcs=[services.StatusDataClass(content="Ipsum")]
+    )
+
+    result = services.bulk_update_user_status(
+        user=user,
+        status_dcs=[
+            services.StatusDataClass(id=owned[0].id, content="Edited"),
+            services.StatusDataClass(id=foreign.id, content="Edited"),
+        ],
+    )
+
+    assert result.applied == [owned[0].id]
+    assert result.rejected == [dict(id=foreign.id, reason="forbidden")]
+
+    result = services.bulk_delete_user_status(
+        user=user, status_ids=[owned[1].id, foreign.id, 999]
+    )
+
+    assert result.applied == [owned[1].id]
+    assert result.rejected == [
+        dict(id=foreign.id, reason="forbidden"),
+        dict(id=999, reason="not_found"),
+    ]
+    assert _statuses("shard_1") == [
+        (owned[0].id, user.id, "Edited"),
+        (owned[2].id, user.id, "Lorem"),
+    ]
+    assert _statuses("shard_2") == [(foreign.id, other.id, "Ipsum")]
+
+
+@override_settings(STATUS_SHARDS=SHARDS)
+@pytest.mark.django_db(databases=SHARDS)
+def test_rebalance_statuses(user, tmp_path):
+    """
+    Test moving the statuses of a user to another shard.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        tmp_path (Path): A temporary directory for the shared cache.
+    """
+    sharding.set_user_shard(user.id, "shard_1")
+    services.bulk_create_status(
+        user=user,
+        status_dcs=[
+            services.StatusDataClass(content=f"Status {index}")
+            for index in range(5)
+        ],
+    )
+    before = services.get_user_status_values(user=user)
+
+    # The API processes wouldn't see a move made in a LocMemCache
+    with pytest.raises(CommandError, match="isn't shared"):
+        call_command("rebalance_statuses", user.id, "shard_2", grace=0)
+
+    def delete_during_grace(seconds):
+        # A status deleted while the copy was running
+        models.Status.objects.using("shard_1").filter(
+            id=before[2]["id"]
+        ).delete()
+
+    with override_settings(CACHES=_shared_caches(tmp_path)):
+        out = io.StringIO()
+
+        with mock.patch.object(
+            time, "sleep", side_effect=delete_during_grace
+        ), mock.patch.object(
+            sharding, "lock_user_shard", wraps=sharding.lock_user_shard
+        ) as lock_user_shard:
+            call_command(
+                "rebalance_statuses",
+                user.id,
+                "shard_2",
+                batch_size=2,
+                grace=0,
+                stdout=out,
+            )
+
+        # Locked once, then renewed by every batch of the deleted check
+        assert lock_user_shard.call_count == 4
+        assert "5 rows copied" in out.getvalue()
+        assert sharding.get_user_shard(user.id) == "shard_2"
+        assert _statuses("shard_1") == []
+        assert services.get_user_status_values(user=user) == [
+            status for status in before if status["id"] != before[2]["id"]
+        ]
+
+        sharding.lock_user_shard(user.id, timeout=60)
+
+        with pytest.raises(sharding.StatusShardLocked):
+            services.create_status(
+                user=user, status_dc=services.StatusDataClass(content="Lorem")
+            )
+
+        sharding.unlock_user_shard(user.id)
+        user_models.User.objects.get(pk=user.id).delete()
+
+        assert _statuses("shard_2") == []
+
+
+@override_settings(STATUS_SHARDS=SHARDS)
+def test_status_ids_are_unique_and_increasing():
+    """
+    Test that the generated status IDs increase and don't collide between
+    processes.
+    """
+    ids = [sharding.new_status_id() for _ in range(10_000)]
+    other_worker = sharding.StatusIdGenerator(worker_id=1023)
+    other_ids = [other_worker.next_id() for _ in range(1000)]
+
+    assert ids == sorted(set(ids))
+    assert not set(ids) & set(other_ids)
+
+    # A worker ID derived from the PID could collide with another process
+    with override_settings(STATUS_ID_WORKER=None):
+        with pytest.raises(ImproperlyConfigured):
+            sharding.new_status_id()
+
+
+@override_settings(STATUS_SHARDS=SHARDS, STATUS_SHARD_CACHE_TIMEOUT=60)
+@pytest.mark.django_db(databases=SHARDS)
+def test_user_shard_cache_expires(user):
+    """
+    Test that the shard of a user is read again from the `UserShard` table
+    once its cache entry expires.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+    """
+    sharding.set_user_shard(user.id, "shard_1")
+    models.UserShard.objects.filter(user_id=user.id).update(shard="shard_2")
+
+    assert sharding.get_user_shard(user.id) == "shard_1"
+
+    now = time.time()
+
+    with mock.patch("time.time", return_value=now + 61):
+        assert sharding.get_user_shard(user.id) == "shard_2"
+
+
+@override_settings(STATUS_SHARDS=SHARDS)
+@pytest.mark.django_db(databases=SHARDS)
+def test_sharded_home_timeline(user):
+    """
+    Test that the timeline reads the statuses from their authors' shards.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+    """
+    other = _other_user()
+    sharding.set_user_shard(user.id, "shard_1")
+    sharding.set_user_shard(other.id, "shard_2")
+    user_services.follow_user(user=user, followee_id=other.id)
+
+    status = services.create_status(
+        user=other, status_dc=services.StatusDataClass(content="Lorem")
+    )
+    page = services.get_home_timeline_values_page(user=user, limit=10)
+
+    assert [row["id"] for row in page.results] == [status.id]
+    assert page.results[0]["user__email"] == other.email
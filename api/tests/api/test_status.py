@@ -1,6 +1,19 @@
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import renderers
 
-from status import models
+from status import models, serializer, services, timeline
+from status.cache import StatusListCache, get_status_list_cache
+from user import models as user_models
+from user import services as user_services
 
 
 @pytest.mark.django_db
@@ -124,3 +137,926 @@ def test_delete_status(user, auth_client):
 
     with pytest.raises(models.Status.DoesNotExist):
         status.refresh_from_db()
+
+
+@pytest.mark.django_db
+@override_settings(JWT_CLAIMS_TOKENS=True)
+def test_create_status_with_claims_token(shared_cache, user, client):
+    """
+    Test the creation of a status by a user authenticated from token claims.
+
+    Args:
+        shared_cache (None): Makes the default cache shared.
+        user (User): The user object created by the 'user' fixture.
+        client (APIClient): The APIClient instance.
+    """
+    client.post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+
+    payload = dict(content="Lorem ipsum dolor sit amet")
+
+    response = client.post("/api/status/", payload)
+
+    assert response.status_code == 201
+    assert response.data["user"]["id"] == user.id
+    assert models.Status.objects.filter(user_id=user.id).count() == 1
+
+
+@pytest.mark.django_db
+def test_get_status_pages(user, auth_client):
+    """
+    Test walking through the statuses with the cursor pagination.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    models.Status.objects.bulk_create(
+        [
+            models.Status(user_id=user.id, content=f"Status {index}")
+            for index in range(5)
+        ]
+    )
+
+    response = auth_client.get("/api/status/", {"limit": 2})
+
+    pages = [response.data["results"]]
+
+    while response.data["next"] is not None:
+        response = auth_client.get(
+            "/api/status/", {"limit": 2, "cursor": response.data["next"]}
+        )
+        pages.append(response.data["results"])
+
+    ids = [status["id"] for page in pages for status in page]
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert ids == sorted(ids, reverse=True)
+    assert len(set(ids)) == 5
+
+
+@pytest.mark.django_db
+def test_get_status_page_invalid_cursor(auth_client):
+    """
+    Test that a malformed cursor is rejected.
+
+    Args:
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    response = auth_client.get("/api/status/", {"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("status_count", [1, 10, 50])
+def test_get_status_query_count(
+    user, auth_client, django_assert_num_queries, status_count
+):
+    """
+    Test that listing statuses costs the same number of queries for any size.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+        status_count (int): The number of statuses to list.
+    """
+    models.Status.objects.bulk_create(
+        [
+            models.Status(user_id=user.id, content=f"Status {index}")
+            for index in range(status_count)
+        ]
+    )
+
+    # Warms up the user cache used by the authentication
+    auth_client.get("/api/users/me/")
+
+    with django_assert_num_queries(1):
+        response = auth_client.get("/api/status/")
+
+    # The ETag of the page is computed from its rows
+    with django_assert_num_queries(1):
+        page = auth_client.get("/api/status/", {"limit": 5})
+
+    assert len(response.data) == status_count
+    assert all(item["user"]["id"] == user.id for item in response.data)
+    assert len(page.data["results"]) == min(status_count, 5)
+
+
+@pytest.mark.django_db
+def test_status_details_query_count(
+    user, auth_client, django_assert_num_queries
+):
+    """
+    Test that reading, updating and deleting a status don't load its author.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    status = models.Status.objects.create(
+        user_id=user.id, content="Lorem ipsum dolor sit amet"
+    )
+
+    auth_client.get("/api/users/me/")
+
+    with django_assert_num_queries(1):
+        response = auth_client.get(f"/api/status/{status.id}/")
+
+    assert response.data["user"]["email"] == user.email
+
+    with django_assert_num_queries(2):
+        auth_client.put(f"/api/status/{status.id}/", dict(content="Edited"))
+
+    # The delete also removes the status from the timelines
+    with django_assert_num_queries(3):
+        auth_client.delete(f"/api/status/{status.id}/")
+
+
+@pytest.mark.django_db
+def test_status_read_path_matches_serializer(user, auth_client):
+    """
+    Test that the fast read path renders the same bytes as StatusSerializer.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    models.Status.objects.bulk_create(
+        [
+            models.Status(
+                user_id=user.id, content="Lorem ipsum dolor sit amet"
+            ),
+            models.Status(user_id=user.id, content='Ünïcödé "quoted"   😀'),
+            models.Status(user_id=user.id, content="line\nbreak\ttab\x01"),
+        ]
+    )
+    renderer = renderers.JSONRenderer()
+    status_collection = [
+        services.StatusDataClass.from_instance(status)
+        for status in models.Status.objects.select_related("user").order_by(
+            *services.STATUS_ORDERING
+        )
+    ]
+    expected = renderer.render(
+        serializer.StatusSerializer(status_collection, many=True).data
+    )
+
+    assert auth_client.get("/api/status/").content == expected
+
+    response = auth_client.get("/api/status/", {"limit": 2})
+    expected = renderer.render(
+        dict(
+            results=serializer.StatusSerializer(
+                status_collection[:2], many=True
+            ).data,
+            next=services.encode_status_cursor(
+                status_collection[1].date_published, status_collection[1].id
+            ),
+        )
+    )
+
+    assert response.content == expected
+
+    status = status_collection[1]
+    expected = renderer.render(serializer.StatusSerializer(status).data)
+
+    assert auth_client.get(f"/api/status/{status.id}/").content == expected
+
+
+def _stream_peak_memory(client) -> tuple[int, int]:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    try:
+        response = client.get("/api/status/", {"stream": "1"})
+        size = 0
+        tail = b""
+
+        for piece in response.streaming_content:
+            size += len(piece)
+            tail = piece
+
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    assert tail.endswith(b"]")
+
+    return peak, size
+
+
+@pytest.mark.django_db
+@override_settings(STATUS_STREAM_CHUNK_SIZE=100)
+def test_stream_status(user, auth_client):
+    """
+    Test that streaming the statuses renders the same JSON as the list.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    response = auth_client.get("/api/status/", {"stream": "1"})
+
+    assert b"".join(response.streaming_content) == b"[]"
+
+    models.Status.objects.bulk_create(
+        [
+            models.Status(user_id=user.id, content=f"Status {index}")
+            for index in range(250)
+        ]
+    )
+
+    response = auth_client.get("/api/status/", {"stream": "1"})
+    expected = auth_client.get("/api/status/").content
+
+    assert b"".join(response.streaming_content) == expected
+
+
+@pytest.mark.django_db
+@override_settings(STATUS_STREAM_CHUNK_SIZE=100)
+def test_stream_status_memory_is_flat(user, auth_client):
+    """
+    Test that the peak memory of a stream doesn't grow with the row count.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    content = "Lorem ipsum dolor sit amet " * 20
+    auth_client.get("/api/users/me/")
+
+    models.Status.objects.bulk_create(
+        [models.Status(user_id=user.id, content=content) for _ in range(1_000)]
+    )
+    small_peak, small_size = _stream_peak_memory(auth_client)
+
+    models.Status.objects.bulk_create(
+        [
+            models.Status(user_id=user.id, content=content)
+            for _ in range(9_000)
+        ],
+        batch_size=1_000,
+    )
+    large_peak, large_size = _stream_peak_memory(auth_client)
+
+    assert large_size > 9 * small_size
+    assert large_peak < 2 * small_peak
+
+
+@pytest.mark.django_db
+def test_bulk_create_status(user, auth_client):
+    """
+    Test the creation of several statuses in one request.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    payload = [dict(content=f"Status {index}") for index in range(3)]
+
+    response = auth_client.post("/api/status/bulk/", payload, format="json")
+
+    statuses_from_db = models.Status.objects.filter(user_id=user.id)
+
+    assert response.status_code == 201
+    assert [item["content"] for item in response.data] == [
+        item["content"] for item in payload
+    ]
+    assert {item["id"] for item in response.data} == {
+        status.id for status in statuses_from_db
+    }
+    assert all(item["user"]["id"] == user.id for item in response.data)
+
+
+@pytest.mark.django_db
+@override_settings(STATUS_BULK_MAX_SIZE=2)
+def test_bulk_create_status_too_many(auth_client):
+    """
+    Test that a batch larger than the maximum size is rejected.
+
+    Args:
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    payload = [dict(content=f"Status {index}") for index in range(3)]
+
+    response = auth_client.post("/api/status/bulk/", payload, format="json")
+
+    assert response.status_code == 400
+    assert not models.Status.objects.exists()
+
+
+def _other_user_status():
+    other_user = user_services.create_user(
+        user_dc=user_services.UserDataClass(
+            first_name="Walter",
+            last_name="White",
+            email="walterwhite@gmail.com",
+            password="superstrongpassword",
+        )
+    )
+
+    return models.Status.objects.create(
+        user_id=other_user.id, content="Say my name"
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_delete_status(user, auth_client):
+    """
+    Test deleting several statuses in one request.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    owned = models.Status.objects.bulk_create(
+        [
+            models.Status(user_id=user.id, content=f"Status {index}")
+            for index in range(3)
+        ]
+    )
+    other = _other_user_status()
+    payload = dict(ids=[owned[0].id, owned[1].id, other.id, 999])
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.post(
+            "/api/status/bulk/delete/", payload, format="json"
+        )
+
+    deletes = [
+        q
+        for q in queries
+        if q["sql"].startswith('DELETE FROM "status_status"')
+    ]
+
+    assert response.status_code == 200
+    assert response.data["applied"] == [owned[0].id, owned[1].id]
+    assert response.data["rejected"] == [
+        dict(id=other.id, reason="forbidden"),
+        dict(id=999, reason="not_found"),
+    ]
+    assert len(deletes) == 1
+    assert list(models.Status.objects.values_list("id", flat=True)) == [
+        owned[2].id,
+        other.id,
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_update_status(user, auth_client):
+    """
+    Test editing several statuses in one request.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    owned = models.Status.objects.bulk_create(
+        [
+            models.Status(user_id=user.id, content=f"Status {index}")
+            for index in range(2)
+        ]
+    )
+    other = _other_user_status()
+    payload = [
+        dict(id=owned[0].id, content="Edited 0"),
+        dict(id=owned[1].id, content="Edited 1"),
+        dict(id=other.id, content="Edited other"),
+    ]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.put("/api/status/bulk/", payload, format="json")
+
+    updates = [q for q in queries if q["sql"].startswith("UPDATE")]
+
+    assert response.status_code == 200
+    assert response.data["applied"] == [owned[0].id, owned[1].id]
+    assert response.data["rejected"] == [dict(id=other.id, reason="forbidden")]
+    assert len(updates) == 1
+    assert list(
+        models.Status.objects.order_by("id").values_list("content", flat=True)
+    ) == ["Edited 0", "Edited 1", "Say my name"]
+
+
+@pytest.mark.django_db
+def test_async_status_views(user, auth_client, async_client, async_call):
+    """
+    Test creating, listing, reading, updating and deleting statuses through
+    the async views.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+        async_client (AsyncClient): The AsyncClient instance.
+        async_call (Callable): The helper running the async requests.
+    """
+    async_client.cookies = auth_client.cookies
+
+    response = async_call(
+        async_client.post,
+        "/api/status/async/",
+        dict(content="Lorem ipsum dolor sit amet"),
+        content_type="application/json",
+    )
+    created = response.json()
+
+    assert response.status_code == 201
+    assert created["user"]["id"] == user.id
+
+    response = async_call(async_client.get, "/api/status/async/")
+
+    assert response.content == auth_client.get("/api/status/").content
+
+    async def read_stream():
+        response = await async_client.get("/api/status/async/?stream=1")
+
+        return b"".join([piece async for piece in response.streaming_content])
+
+    assert async_call(read_stream) == auth_client.get("/api/status/").content
+
+    response = async_call(async_client.get, "/api/status/async/?limit=1")
+
+    assert response.json()["results"][0]["id"] == created["id"]
+
+    response = async_call(
+        async_client.put,
+        f"/api/status/async/{created['id']}/",
+        dict(content="risus in hendrerit gravida rutrum"),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert response.json()["content"] == "risus in hendrerit gravida rutrum"
+
+    response = async_call(
+        async_client.get, f"/api/status/async/{created['id']}/"
+    )
+
+    assert (
+        response.content
+        == auth_client.get(f"/api/status/{created['id']}/").content
+    )
+
+    response = async_call(
+        async_client.delete, f"/api/status/async/{created['id']}/"
+    )
+
+    assert response.status_code == 204
+    assert not models.Status.objects.exists()
+
+    response = async_call(
+        async_client.get, f"/api/status/async/{created['id']}/"
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_async_status_views_unauthenticated(async_client, async_call):
+    """
+    Test that the async status views require an authenticated user.
+
+    Args:
+        async_client (AsyncClient): The AsyncClient instance.
+        async_call (Callable): The helper running the async requests.
+    """
+    response = async_call(async_client.get, "/api/status/async/")
+
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_async_status_views_deleted_user(
+    user, auth_client, async_client, async_call
+):
+    """
+    Test that the token of a deleted user is refused by the async views.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+        async_client (AsyncClient): The AsyncClient instance.
+        async_call (Callable): The helper running the async requests.
+    """
+    async_client.cookies = auth_client.cookies
+    user_models.User.objects.filter(id=user.id).delete()
+
+    response = async_call(async_client.get, "/api/status/async/")
+
+    assert response.status_code == 403
+    assert auth_client.get("/api/status/").status_code == 403
+
+
+@override_settings(STATUS_LIST_CACHE={"ENABLED": False})
+@pytest.mark.django_db
+def test_get_status_not_modified(user, auth_client, django_assert_num_queries):
+    """
+    Test that polling an unchanged status list answers 304 from validators.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    status = models.Status.objects.create(
+        user_id=user.id, content="Lorem ipsum dolor sit amet"
+    )
+
+    response = auth_client.get("/api/status/")
+    etag = response["ETag"]
+
+    # A delete doesn't move the last edit of the statuses
+    assert not response.has_header("Last-Modified")
+    assert auth_client.get("/api/status/", {"limit": 5})["ETag"] != etag
+
+    with django_assert_num_queries(1):
+        response = auth_client.get("/api/status/", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+    # A stream has the content, and the ETag, of the full list
+    response = auth_client.get(
+        "/api/status/", {"stream": 1}, HTTP_IF_NONE_MATCH=etag
+    )
+
+    assert response.status_code == 304
+    assert not auth_client.get("/api/status/", {"stream": 1}).has_header(
+        "ETag"
+    )
+
+    page = auth_client.get("/api/status/", {"limit": 5})
+
+    with django_assert_num_queries(1):
+        response = auth_client.get(
+            "/api/status/", {"limit": 5}, HTTP_IF_NONE_MATCH=page["ETag"]
+        )
+
+    assert response.status_code == 304
+
+    auth_client.put(f"/api/status/{status.id}/", dict(content="Edited"))
+
+    response = auth_client.get("/api/status/", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+    etag = response["ETag"]
+    auth_client.delete(f"/api/status/{status.id}/")
+
+    response = auth_client.get(
+        "/api/status/",
+        HTTP_IF_NONE_MATCH=etag,
+        HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT",
+    )
+
+    assert response.status_code == 200
+    assert response.data == []
+
+
+@pytest.mark.django_db
+def test_retrieve_status_not_modified(
+    user, auth_client, django_assert_num_queries
+):
+    """
+    Test that polling an unchanged status answers 304 without its content.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    status = models.Status.objects.create(
+        user_id=user.id, content="Lorem ipsum dolor sit amet"
+    )
+
+    etag = auth_client.get(f"/api/status/{status.id}/")["ETag"]
+
+    with django_assert_num_queries(1) as queries:
+        response = auth_client.get(
+            f"/api/status/{status.id}/", HTTP_IF_NONE_MATCH=etag
+        )
+
+    assert response.status_code == 304
+    assert "content" not in queries.captured_queries[0]["sql"]
+
+    auth_client.put(f"/api/status/{status.id}/", dict(content="Edited"))
+
+    response = auth_client.get(
+        f"/api/status/{status.id}/", HTTP_IF_NONE_MATCH=etag
+    )
+
+    assert response.status_code == 200
+    assert response.data["content"] == "Edited"
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+        },
+        "shared": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": "/tmp/status-list-cache",
+        },
+    }
+)
+def test_status_list_cache_needs_shared_cache():
+    """
+    Test that the list cache is only enabled by default on a shared cache.
+    """
+    with override_settings(STATUS_LIST_CACHE={"ENABLED": None}):
+        assert not get_status_list_cache().enabled
+
+    with override_settings(
+        STATUS_LIST_CACHE={"ENABLED": None, "CACHE_ALIAS": "shared"}
+    ):
+        assert get_status_list_cache().enabled
+
+    with override_settings(STATUS_LIST_CACHE={"ENABLED": True}):
+        assert get_status_list_cache().enabled
+
+
+@override_settings(STATUS_LIST_CACHE={"ENABLED": True})
+@pytest.mark.django_db
+def test_get_status_cached(user, auth_client, django_assert_num_queries):
+    """
+    Test that the status list is cached until the user changes a status.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    list_cache = get_status_list_cache()
+    list_cache.reset_stats()
+    status = models.Status.objects.create(
+        user_id=user.id, content="Lorem ipsum dolor sit amet"
+    )
+    expected = auth_client.get("/api/status/").data
+
+    with django_assert_num_queries(0):
+        response = auth_client.get("/api/status/")
+
+    assert response.data == expected
+    assert list_cache.stats()["hit_ratio"] == 0.5
+
+    with django_assert_num_queries(0):
+        response = auth_client.get(
+            "/api/status/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+    assert response.status_code == 304
+
+    auth_client.put(f"/api/status/{status.id}/", dict(content="Edited"))
+    assert auth_client.get("/api/status/").data[0]["content"] == "Edited"
+
+    auth_client.post(
+        "/api/status/bulk/", [dict(content="Bulk")], format="json"
+    )
+    assert len(auth_client.get("/api/status/").data) == 2
+
+    auth_client.post(
+        "/api/status/bulk/delete/", dict(ids=[status.id]), format="json"
+    )
+    assert auth_client.get("/api/status/").data[0]["content"] == "Bulk"
+
+    page = auth_client.get("/api/status/", dict(limit=1)).data
+    auth_client.delete(f"/api/status/{page['results'][0]['id']}/")
+
+    assert auth_client.get("/api/status/", dict(limit=1)).data == dict(
+        results=[], next=None
+    )
+
+
+def test_status_list_cache_single_flight():
+    """
+    Test that concurrent misses on the same key rebuild the entry once.
+    """
+    list_cache = StatusListCache(timeout=60, cache_alias="default")
+    owner = user_models.User(id=1, profile_version=1)
+    started = threading.Event()
+    release = threading.Event()
+    builds = []
+
+    def build():
+        builds.append(1)
+        started.set()
+        release.wait(5)
+        return dict(data=[], validator=None)
+
+    def get():
+        return list_cache.get_or_build(user=owner, variant="", build=build)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(get)
+        started.wait(5)
+        followers = [executor.submit(get) for _ in range(3)]
+
+        # Give the followers time to join the rebuild before it finishes
+        time.sleep(0.2)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert len(builds) == 1
+    assert all(result == results[0] for result in results)
+    assert list_cache.stats() == dict(
+        hits=3, misses=1, collapsed=3, hit_ratio=0.75
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("backends", [None, {}], ids=["full-text", "fallback"])
+def test_search_status(user, auth_client, backends):
+    """
+    Test searching the statuses of the user, with the full-text index and
+    with the fallback scan.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+        backends (dict): The search backends by vendor, None for the default.
+    """
+    search_settings = dict(settings.STATUS_SEARCH)
+
+    if backends is not None:
+        search_settings["BACKENDS"] = backends
+
+    statuses = models.Status.objects.bulk_create(
+        [
+            models.Status(user_id=user.id, content=content)
+            for content in [
+                "A blue car parked under a grey sky, far in the desert",
+                "Blue sky, blue sky, blue sky",
+                "Nothing to see here",
+                "A café in the desert",
+            ]
+        ]
+    )
+    _other_user_status()
+    models.Status.objects.filter(id=statuses[2].id).update(
+        content="Blue again"
+    )
+
+    with override_settings(STATUS_SEARCH=search_settings):
+        response = auth_client.get("/api/status/", {"q": "BLUE sky"})
+        ids = [status["id"] for status in response.data["results"]]
+
+        if backends is None:
+            # The status repeating the words ranks first
+            assert ids == [statuses[1].id, statuses[0].id]
+        else:
+            assert sorted(ids) == [statuses[0].id, statuses[1].id]
+
+        response = auth_client.get("/api/status/", {"q": "blue", "limit": 2})
+        page = [status["id"] for status in response.data["results"]]
+        response = auth_client.get(
+            "/api/status/",
+            {"q": "blue", "limit": 2, "cursor": response.data["next"]},
+        )
+        page += [status["id"] for status in response.data["results"]]
+
+        assert sorted(page) == [s.id for s in statuses[:3]]
+        assert response.data["next"] is None
+
+        response = auth_client.get("/api/status/", {"q": '"name" OR *'})
+
+        assert response.data["results"] == []
+
+        response = auth_client.get("/api/status/", {"q": "cafe"})
+
+        if backends is None:
+            assert response.data["results"][0]["id"] == statuses[3].id
+
+        auth_client.delete(f"/api/status/{statuses[0].id}/")
+        response = auth_client.get("/api/status/", {"q": "sky"})
+
+        assert [s["id"] for s in response.data["results"]] == [statuses[1].id]
+
+
+@pytest.mark.django_db
+@override_settings(
+    TIMELINE={
+        "PULL_THRESHOLD": 1,
+        "MAX_PUSH_ROWS": 10000,
+        "BACKFILL": 2,
+        "BATCH_SIZE": 1000,
+    }
+)
+def test_home_timeline(user, auth_client):
+    """
+    Test that the timeline merges the statuses pushed by light authors with
+    the statuses pulled from heavy ones, newest first.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    light, heavy, fan = [
+        user_services.create_user(
+            user_dc=user_services.UserDataClass(
+                first_name=name,
+                last_name="White",
+                email=f"{name.lower()}@gmail.com",
+                password="superstrongpassword",
+            )
+        )
+        for name in ("Walter", "Skyler", "Flynn")
+    ]
+
+    def post(author, content):
+        return services.create_status(
+            user=author, status_dc=services.StatusDataClass(content=content)
+        )
+
+    old = [post(light, f"Old {index}") for index in range(3)]
+    user_services.follow_user(user=fan, followee_id=heavy.id)
+    auth_client.post(f"/api/users/{light.id}/follow/")
+    auth_client.post(f"/api/users/{heavy.id}/follow/")
+
+    # The last BACKFILL statuses of the light author were pushed
+    assert models.TimelineEntry.objects.filter(user_id=user.id).count() == 2
+
+    statuses = [
+        post(light, "Light 1"),
+        post(heavy, "Heavy 1"),
+        post(light, "Light 2"),
+        post(heavy, "Heavy 2"),
+    ]
+
+    assert models.PullModeAuthor.objects.filter(user_id=heavy.id).exists()
+    assert not models.TimelineEntry.objects.filter(author_id=heavy.id)
+
+    response = auth_client.get("/api/status/timeline/", {"limit": 4})
+
+    assert [s["id"] for s in response.data["results"]] == [
+        status.id for status in reversed(statuses)
+    ]
+    assert response.data["results"][0]["user"]["id"] == heavy.id
+
+    response = auth_client.get(
+        "/api/status/timeline/",
+        {"limit": 4, "cursor": response.data["next"]},
+    )
+
+    assert [s["id"] for s in response.data["results"]] == [
+        old[2].id,
+        old[1].id,
+    ]
+    assert response.data["next"] is None
+
+    services.delete_user_status(user=light, status_id=statuses[2].id)
+    auth_client.delete(f"/api/users/{heavy.id}/follow/")
+    response = auth_client.get("/api/status/timeline/")
+
+    assert [s["id"] for s in response.data["results"]] == [
+        statuses[0].id,
+        old[2].id,
+        old[1].id,
+    ]
+
+
+@pytest.mark.django_db
+@override_settings(
+    TIMELINE={
+        "PULL_THRESHOLD": 1000,
+        "MAX_PUSH_ROWS": 3,
+        "BACKFILL": 20,
+        "BATCH_SIZE": 1000,
+    }
+)
+def test_timeline_push_bounds(user):
+    """
+    Test that a push skips the rows of a concurrent backfill and that a
+    push too large for the request switches its author to pull mode.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+    """
+    author = user_services.create_user(
+        user_dc=user_services.UserDataClass(
+            first_name="Walter",
+            last_name="White",
+            email="walterwhite@gmail.com",
+            password="superstrongpassword",
+        )
+    )
+    user_services.follow_user(user=user, followee_id=author.id)
+    status = models.Status.objects.create(user_id=author.id, content="Lorem")
+    pushed = [(status.id, status.date_published)]
+
+    # The row written by the backfill of the follow
+    timeline.push_to_follower(user.id, author.id, pushed)
+    timeline.push(author.id, pushed)
+
+    assert models.TimelineEntry.objects.filter(user_id=user.id).count() == 1
+
+    services.bulk_create_status(
+        user=author,
+        status_dcs=[services.StatusDataClass(content="Ipsum")] * 4,
+    )
+
+    assert models.PullModeAuthor.objects.filter(user_id=author.id).exists()
+    assert models.TimelineEntry.objects.filter(user_id=user.id).count() == 1
@@ -0,0 +1,120 @@
+import logging
+import re
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+
+from core import metrics, queries, timing
+from status import models
+
+ENABLED = {"ENABLED": True, "LOG": True}
+
+
+def _metrics(response) -> dict:
+    return dict(re.findall(r"(\w+);dur=([\d.]+)", response["Server-Timing"]))
+
+
+@override_settings(SERVER_TIMING=ENABLED)
+@pytest.mark.django_db
+def test_server_timing_header(user, client_factory, caplog):
+    """
+    Test that a status list reports the time of its parts and its queries.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        client_factory (Callable): The factory of APIClient instances.
+        caplog (LogCaptureFixture): The captured log records.
+    """
+    models.Status.objects.create(user_id=user.id, content="Lorem")
+    client = client_factory()
+    client.post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+    # Warms up the user cache used by the authentication
+    client.get("/api/users/me/")
+
+    with caplog.at_level(logging.INFO, logger="core.timing"):
+        response = client.get("/api/status/", {"limit": 10})
+
+    metrics = _metrics(response)
+
+    assert {"auth", "status", "db", "serialize", "render", "total"} <= set(
+        metrics
+    )
+    assert float(metrics["total"]) >= float(metrics["status"])
+    assert 'desc="1 queries"' in response["Server-Timing"]
+
+    (record,) = caplog.records
+
+    assert record.server_timing["db_queries"] == 1
+    assert record.getMessage().startswith("GET /api/status/ 200")
+
+
+@override_settings(SERVER_TIMING=ENABLED)
+@pytest.mark.django_db
+def test_server_timing_async_view(user, auth_client, async_client, async_call):
+    """
+    Test that the queries of the async ORM are counted as well.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+        async_client (AsyncClient): The AsyncClient instance.
+        async_call (Callable): The helper running the async requests.
+    """
+    status = models.Status.objects.create(user_id=user.id, content="Lorem")
+    async_client.cookies = auth_client.cookies
+    auth_client.get("/api/users/me/")
+
+    response = async_call(async_client.get, f"/api/status/async/{status.id}/")
+
+    assert {"auth", "status", "db"} <= set(_metrics(response))
+    assert 'desc="1 queries"' in response["Server-Timing"]
+
+
+@override_settings(
+    SERVER_TIMING=ENABLED,
+    METRICS={
+        "ENABLED": True,
+        "TOKEN": None,
+        "MULTIPROCESS_DIRECTORY": None,
+        "FLUSH_INTERVAL": 5,
+    },
+)
+@pytest.mark.django_db
+def test_server_timing_with_metrics(user, client_factory):
+    """
+    Test that the timings and the metrics share one wrapper per connection.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        client_factory (Callable): The factory of APIClient instances.
+    """
+    client = client_factory()
+    client.post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+    client.get("/api/users/me/")
+    metrics.registry.clear()
+    response = client.get("/api/status/")
+
+    assert connection.execute_wrappers.count(queries._observe_query) == 1
+    assert 'desc="1 queries"' in response["Server-Timing"]
+    assert metrics.REQUEST_QUERIES.samples()[0][1]["sum"] == 1
+
+
+@pytest.mark.django_db
+def test_server_timing_disabled(auth_client):
+    """
+    Test that nothing is timed when the middleware is disabled.
+
+    Args:
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    response = auth_client.get("/api/status/")
+
+    assert not response.has_header("Server-Timing")
+    assert timing.timed("status") is timing.timed("db")
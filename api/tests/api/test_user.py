@@ -1,4 +1,23 @@
+import io
+import time
+from unittest import mock
+
+import jwt
 import pytest
+from django.contrib.auth.hashers import check_password, make_password
+from django.core import checks
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from status import models as status_models
+from user import models
+from user import services as user_services
+from user.cache import LocalUserCacheBackend, get_user_cache
+from user.hashing import get_password_hashing_pool
+from user.revocation import TokenDenylist, get_token_denylist
+from user.signing import KeyRing, SigningKey, get_key_ring
 
 
 @pytest.mark.django_db
@@ -93,3 +112,725 @@ def test_logout_user(user, auth_client):
 
     assert response.status_code == 200
     assert response.data["message"] == "Logout complete"
+
+
+@pytest.mark.django_db
+def test_logout_revokes_token(shared_cache, user, auth_client, client_factory):
+    """
+    Test that a token copied before logout is refused afterwards.
+
+    Args:
+        shared_cache (None): Makes the default cache shared.
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+        client_factory (Callable): The factory of APIClient instances.
+    """
+    token = auth_client.cookies["jwt"].value
+    other_client = client_factory()
+    other_client.post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+
+    auth_client.post("/api/users/logout/")
+
+    copied_client = client_factory()
+    copied_client.cookies["jwt"] = token
+
+    assert copied_client.get("/api/users/me/").status_code == 403
+    assert other_client.get("/api/users/me/").status_code == 200
+
+
+def test_token_denylist_needs_shared_cache():
+    """
+    Test that the denylist is disabled, with a system check warning, when
+    its cache is kept by each process.
+    """
+    assert not get_token_denylist().enabled
+    assert "user.W001" in [error.id for error in checks.run_checks()]
+
+    with override_settings(JWT_DENYLIST={"ENABLED": True}):
+        assert get_token_denylist().enabled
+        assert "user.W001" not in [error.id for error in checks.run_checks()]
+
+
+def test_token_denylist_sync_and_prune():
+    """
+    Test that revocations reach the other processes and expire with tokens.
+    """
+    revoking = TokenDenylist(
+        cache_alias="default", sync_interval=0, token_lifetime=3600
+    )
+    other = TokenDenylist(
+        cache_alias="default", sync_interval=0, token_lifetime=3600
+    )
+    now = time.time()
+
+    revoking.revoke(jti="expiring", expires_at=now + 1)
+    revoking.revoke(jti="copied", expires_at=now + 3600)
+    revoking.revoke(jti="expired", expires_at=now - 1)
+
+    assert other.is_revoked("copied")
+    assert other.is_revoked("expiring")
+    assert not other.is_revoked("expired")
+    assert not other.is_revoked("unknown")
+
+    with mock.patch("user.revocation.time.time", return_value=now + 2):
+        other.sync()
+
+    assert len(other) == 1
+
+
+def test_token_denylist_pending_entry():
+    """
+    Test that a sync comes back for a revocation still writing its entry.
+    """
+    revoking = TokenDenylist(
+        cache_alias="default", sync_interval=0, token_lifetime=3600
+    )
+    other = TokenDenylist(
+        cache_alias="default", sync_interval=0, token_lifetime=3600
+    )
+    expires_at = time.time() + 3600
+
+    revoking.revoke(jti="first", expires_at=expires_at)
+    other.sync()
+
+    with mock.patch.object(revoking.cache, "set"):
+        revoking.revoke(jti="pending", expires_at=expires_at)
+
+    revoking.revoke(jti="last", expires_at=expires_at)
+
+    assert not other.is_revoked("last")
+
+    revoking.cache.set(
+        f"{TokenDenylist.entry_key_prefix}2", ("pending", expires_at)
+    )
+
+    assert other.is_revoked("pending")
+    assert other.is_revoked("last")
+
+
+def test_token_denylist_low_water_mark():
+    """
+    Test that a new process doesn't read the revocations of expired tokens.
+    """
+    revoking = TokenDenylist(
+        cache_alias="default", sync_interval=0, token_lifetime=3600
+    )
+    now = time.time()
+
+    with mock.patch("user.revocation.time.time", return_value=now - 7200):
+        revoking.revoke(jti="old", expires_at=now + 3600)
+
+    revoking.revoke(jti="recent", expires_at=now + 3600)
+    other = TokenDenylist(
+        cache_alias="default", sync_interval=0, token_lifetime=3600
+    )
+
+    with mock.patch.object(
+        other.cache, "get_many", wraps=other.cache.get_many
+    ) as get_many:
+        other.sync()
+
+    assert other.is_revoked("recent")
+    assert not other.is_revoked("old")
+    assert f"{TokenDenylist.entry_key_prefix}1" not in get_many.call_args[0][0]
+
+
+@pytest.mark.django_db
+def test_get_user_is_cached(user, auth_client, django_assert_num_queries):
+    """
+    Test that the authenticated user is served from the user cache.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    auth_client.get("/api/users/me/")
+
+    with django_assert_num_queries(0):
+        response = auth_client.get("/api/users/me/")
+
+    stats = get_user_cache().stats()
+
+    assert response.status_code == 200
+    assert response.data["id"] == user.id
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+@pytest.mark.django_db
+def test_get_user_cache_invalidated_on_save(user, auth_client):
+    """
+    Test that saving a user drops it from the user cache.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    auth_client.get("/api/users/me/")
+
+    instance = models.User.objects.get(id=user.id)
+    instance.first_name = "Walter"
+    instance.save()
+
+    response = auth_client.get("/api/users/me/")
+
+    assert response.data["first_name"] == "Walter"
+
+
+def test_local_user_cache_evicts_by_size_and_ttl():
+    """
+    Test that the local backend honours its size limit and TTL.
+    """
+    backend = LocalUserCacheBackend(max_size=2, ttl=60)
+
+    backend.set(1, models.User(id=1))
+    backend.set(2, models.User(id=2))
+    backend.get(1)
+    backend.set(3, models.User(id=3))
+
+    assert backend.get(2) is None
+    assert backend.get(1).id == 1
+    assert backend.get(3).id == 3
+
+    backend.ttl = 0
+    backend.set(4, models.User(id=4))
+
+    assert backend.get(4) is None
+
+
+@pytest.mark.django_db
+@override_settings(JWT_CLAIMS_TOKENS=True)
+def test_get_user_from_claims(
+    shared_cache, user, client, django_assert_num_queries
+):
+    """
+    Test that a claims token serves `/me/` without touching the database.
+
+    Args:
+        shared_cache (None): Makes the default cache shared.
+        user (User): The user object created by the 'user' fixture.
+        client (APIClient): The APIClient instance.
+    """
+    client.post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+
+    with django_assert_num_queries(0):
+        response = client.get("/api/users/me/")
+
+    assert response.status_code == 200
+    assert response.data["id"] == user.id
+    assert response.data["email"] == user.email
+    assert response.data["first_name"] == user.first_name
+
+
+@pytest.mark.django_db
+@override_settings(JWT_CLAIMS_TOKENS=True, USER_CACHE={"BACKEND": "disabled"})
+def test_claims_need_shared_cache(user, client, django_assert_num_queries):
+    """
+    Test that the claims aren't trusted, and that a system check fails, when
+    the profile versions are kept by each process.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        client (APIClient): The APIClient instance.
+        django_assert_num_queries (Callable): Counts the queries of a block.
+    """
+    client.post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+
+    with django_assert_num_queries(1):
+        response = client.get("/api/users/me/")
+
+    assert response.status_code == 200
+    assert "user.E001" in [error.id for error in checks.run_checks()]
+
+
+@pytest.mark.django_db
+@override_settings(JWT_CLAIMS_TOKENS=True)
+def test_get_user_from_stale_claims(shared_cache, user, client):
+    """
+    Test that a claims token with an old profile version is not trusted.
+
+    Args:
+        shared_cache (None): Makes the default cache shared.
+        user (User): The user object created by the 'user' fixture.
+        client (APIClient): The APIClient instance.
+    """
+    client.post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+
+    instance = models.User.objects.get(id=user.id)
+    instance.first_name = "Walter"
+    instance.save()
+
+    response = client.get("/api/users/me/")
+
+    assert response.status_code == 200
+    assert response.data["first_name"] == "Walter"
+
+
+@pytest.mark.django_db
+@override_settings(JWT_CLAIMS_TOKENS=True)
+def test_claims_of_deleted_user(shared_cache, user, client):
+    """
+    Test that the claims token of a deleted user is refused.
+
+    Args:
+        shared_cache (None): Makes the default cache shared.
+        user (User): The user object created by the 'user' fixture.
+        client (APIClient): The APIClient instance.
+    """
+    client.post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+
+    models.User.objects.filter(id=user.id).delete()
+
+    assert client.get("/api/users/me/").status_code == 403
+    assert (
+        client.post("/api/status/", dict(content="Orphan")).status_code == 403
+    )
+    assert not status_models.Status.objects.exists()
+
+
+@pytest.mark.django_db
+def test_async_register_and_login_user(async_client, async_call):
+    """
+    Test the registration and login of a user through the async views.
+
+    Args:
+        async_client (AsyncClient): The AsyncClient instance.
+        async_call (Callable): The helper running the async requests.
+    """
+    payload = dict(
+        first_name="Jesse",
+        last_name="Pinkman",
+        email="jessepinkman@gmail.com",
+        password="superstrongpassword",
+    )
+
+    response = async_call(
+        async_client.post,
+        "/api/users/async/register/",
+        payload,
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert response.json()["email"] == payload["email"]
+    assert "password" not in response.json()
+
+    response = async_call(
+        async_client.post,
+        "/api/users/async/login/",
+        dict(email=payload["email"], password="wrongpassword"),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 403
+
+    response = async_call(
+        async_client.post,
+        "/api/users/async/login/",
+        dict(email=payload["email"], password=payload["password"]),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert response.cookies["jwt"].value
+
+
+@pytest.mark.django_db
+@override_settings(
+    PASSWORD_HASHERS=[
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+    ]
+)
+def test_async_login_upgrades_password_hash(user, async_client, async_call):
+    """
+    Test that the async login hashes again a password with an old hasher.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        async_client (AsyncClient): The AsyncClient instance.
+        async_call (Callable): The helper running the async requests.
+    """
+    models.User.objects.filter(id=user.id).update(
+        password=make_password("superstrongpassword", hasher="md5")
+    )
+
+    response = async_call(
+        async_client.post,
+        "/api/users/async/login/",
+        dict(email=user.email, password="superstrongpassword"),
+        content_type="application/json",
+    )
+
+    password = models.User.objects.get(id=user.id).password
+
+    assert response.status_code == 200
+    assert password.startswith("pbkdf2_sha256$")
+    assert check_password("superstrongpassword", password)
+
+
+@pytest.mark.django_db
+@override_settings(
+    PASSWORD_HASHING={"EXECUTOR": "thread", "MAX_WORKERS": 1, "MAX_PENDING": 0}
+)
+def test_async_login_user_pool_full(user, async_client, async_call):
+    """
+    Test that the async login is refused while the hashing pool is full.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        async_client (AsyncClient): The AsyncClient instance.
+        async_call (Callable): The helper running the async requests.
+    """
+    pool = get_password_hashing_pool()
+    pool.slots.acquire()
+
+    try:
+        response = async_call(
+            async_client.post,
+            "/api/users/async/login/",
+            dict(email=user.email, password="superstrongpassword"),
+            content_type="application/json",
+        )
+    finally:
+        pool.slots.release()
+
+    assert response.status_code == 503
+    assert response["Retry-After"] == "1"
+
+
+ROTATED_KEYS = {
+    "default": {"ALGORITHM": "HS256", "SECRET": "old-secret"},
+    "2024": {"ALGORITHM": "HS512", "SECRET": "new-secret"},
+}
+
+
+@pytest.mark.django_db
+def test_signing_key_rotation(user, client):
+    """
+    Test that tokens of every configured key are accepted during a rotation.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        client (APIClient): The APIClient instance.
+    """
+    legacy_token = jwt.encode(
+        dict(id=user.id, exp=time.time() + 60), "old-secret", "HS256"
+    )
+
+    with override_settings(JWT_KEYS=ROTATED_KEYS, JWT_SIGNING_KEY_ID="2024"):
+        token = user_services.create_token(user_id=user.id)
+
+        assert jwt.get_unverified_header(token)["kid"] == "2024"
+
+        for cookie in (legacy_token, token):
+            client.cookies["jwt"] = cookie
+            assert client.get("/api/users/me/").status_code == 200
+
+    retired_keys = {"2024": ROTATED_KEYS["2024"]}
+
+    with override_settings(JWT_KEYS=retired_keys, JWT_SIGNING_KEY_ID="2024"):
+        client.cookies["jwt"] = legacy_token
+        assert client.get("/api/users/me/").status_code == 403
+
+        client.cookies["jwt"] = token
+        assert client.get("/api/users/me/").status_code == 200
+
+        forged_token = jwt.encode(
+            dict(id=user.id, exp=time.time() + 60),
+            "new-secret",
+            "HS256",
+            headers={"kid": "2024"},
+        )
+        client.cookies["jwt"] = forged_token
+        assert client.get("/api/users/me/").status_code == 403
+
+
+@pytest.mark.django_db
+def test_verified_token_cache(user):
+    """
+    Test that a verified token isn't verified again until it expires.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+    """
+    key_ring = get_key_ring()
+    token = user_services.create_token(user_id=user.id)
+    payload = key_ring.decode(token)
+
+    with mock.patch("user.signing.jwt.decode") as decode:
+        assert key_ring.decode(token) is payload
+
+        decode.assert_not_called()
+
+        with mock.patch(
+            "user.signing.time.time", return_value=payload["exp"] + 1
+        ):
+            key_ring.decode(token)
+
+        decode.assert_called_once()
+
+    header, claims, signature = token.split(".")
+
+    with pytest.raises(jwt.InvalidTokenError):
+        key_ring.decode(f"{header}.{claims}.{signature[:-4]}AAAA")
+
+
+def test_asymmetric_signing_keys():
+    """
+    Test that Ed25519 and RSA keys sign tokens verified by their public key.
+    """
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    private_keys = {
+        "EdDSA": ed25519.Ed25519PrivateKey.generate(),
+        "RS256": rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        ),
+    }
+
+    for algorithm, private_key in private_keys.items():
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        signing = KeyRing(
+            keys={
+                "a": SigningKey.from_config(
+                    "a", dict(ALGORITHM=algorithm, PRIVATE_KEY=pem)
+                )
+            },
+            signing_kid="a",
+        )
+        verifying = SigningKey.from_config(
+            "a", dict(ALGORITHM=algorithm, PUBLIC_KEY=public_pem)
+        )
+        token = signing.encode(dict(id=1, exp=time.time() + 60))
+
+        assert verifying.signing_key is None
+        assert (
+            jwt.decode(token, verifying.verifying_key, algorithms=[algorithm])[
+                "id"
+            ]
+            == 1
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("backend", ["local", "cache"])
+def test_login_throttled_before_password_check(user, client, backend):
+    """
+    Test that throttled logins are refused without checking the password.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        client (APIClient): The APIClient instance.
+        backend (str): The backend keeping the throttle history.
+    """
+    rates = dict(login_ip="", login_email="3/min")
+    credentials = dict(email=user.email, password="wrongpassword")
+
+    with override_settings(
+        AUTH_THROTTLE=dict(BACKEND=backend, RATES=rates)
+    ), mock.patch(
+        "django.contrib.auth.base_user.check_password", wraps=check_password
+    ) as password_check:
+        for _ in range(3):
+            response = client.post("/api/users/login/", credentials)
+
+            assert response.status_code == 403
+
+        # The user exists, so every attempt so far hashed the password
+        assert password_check.call_count == 3
+
+        for _ in range(20):
+            response = client.post("/api/users/login/", credentials)
+
+            assert response.status_code == 429
+
+        assert password_check.call_count == 3
+
+        response = client.post(
+            "/api/users/login/", dict(credentials, email="other@gmail.com")
+        )
+
+    assert response.status_code == 403
+
+
+@override_settings(
+    AUTH_THROTTLE=dict(BACKEND="local", RATES=dict(register_ip="2/min"))
+)
+@pytest.mark.django_db
+def test_register_throttled_per_ip(client, async_client, async_call):
+    """
+    Test that an IP can only register a few accounts per window.
+
+    Args:
+        client (APIClient): The APIClient instance.
+        async_client (AsyncClient): The AsyncClient instance.
+        async_call (Callable): The helper running the async requests.
+    """
+
+    def register(index, **extra):
+        return client.post(
+            "/api/users/register/",
+            dict(
+                first_name="Walter",
+                last_name="White",
+                email=f"walter{index}@gmail.com",
+                password="superstrongpassword",
+            ),
+            **extra,
+        )
+
+    assert register(1).status_code == 200
+    assert register(2).status_code == 200
+
+    response = register(3)
+
+    assert response.status_code == 429
+    assert int(response["Retry-After"]) > 0
+    assert register(4, REMOTE_ADDR="10.0.0.2").status_code == 200
+    # A spoofed X-Forwarded-For isn't trusted without proxies
+    assert register(5, HTTP_X_FORWARDED_FOR="10.0.0.3").status_code == 429
+
+    response = async_call(
+        async_client.post,
+        "/api/users/async/register/",
+        dict(email="walter6@gmail.com"),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 429
+    assert int(response["Retry-After"]) > 0
+
+
+@pytest.mark.django_db
+def test_follow_user(user, auth_client):
+    """
+    Test following and unfollowing another user.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    other = user_services.create_user(
+        user_dc=user_services.UserDataClass(
+            first_name="Walter",
+            last_name="White",
+            email="walterwhite@gmail.com",
+            password="superstrongpassword",
+        )
+    )
+
+    response = auth_client.post(f"/api/users/{other.id}/follow/")
+
+    assert response.status_code == 201
+    assert (
+        auth_client.post(f"/api/users/{other.id}/follow/").status_code == 200
+    )
+    assert models.Follow.objects.filter(
+        follower_id=user.id, followee_id=other.id
+    ).exists()
+    assert auth_client.post(f"/api/users/{user.id}/follow/").status_code == 400
+    assert auth_client.post("/api/users/999/follow/").status_code == 404
+
+    response = auth_client.delete(f"/api/users/{other.id}/follow/")
+
+    assert response.status_code == 204
+    assert not models.Follow.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_users(user, client, tmp_path):
+    """
+    Test that users are imported in chunks, skipping duplicates and invalid
+    rows.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        client (APIClient): The APIClient instance.
+        tmp_path (Path): A temporary directory for the files to import.
+    """
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "first_name,last_name,email,password\n"
+        "Walter,White,walter@example.com,superstrongpassword\n"
+        f"Jesse,Pinkman,{user.email},superstrongpassword\n"
+        "Skyler,White,skyler@EXAMPLE.com,\n"
+        "Walter,Junior,walter@example.com,superstrongpassword\n"
+        "Saul,Goodman,not-an-email,superstrongpassword\n"
+    )
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    with CaptureQueriesContext(connection) as queries:
+        call_command(
+            "import_users",
+            str(csv_path),
+            "--batch-size=2",
+            "--workers=2",
+            "--report-duplicates",
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+    existence_checks = [
+        query
+        for query in queries
+        if query["sql"].startswith('SELECT "user_user"."email"')
+    ]
+
+    # One per chunk, the last chunk has no valid row to check
+    assert len(existence_checks) == 2
+    assert stdout.getvalue().startswith(
+        "Imported 2 users from 5 rows, skipped 2 duplicate emails and 1 "
+        "invalid rows"
+    )
+    assert "Row 2: jessepinkman@gmail.com already exists" in stderr.getvalue()
+    assert "Row 4: walter@example.com already exists" in stderr.getvalue()
+    assert "Row 5: email:" in stderr.getvalue()
+    assert not models.User.objects.get(
+        email="skyler@example.com"
+    ).has_usable_password()
+    assert (
+        client.post(
+            "/api/users/login/",
+            dict(email="walter@example.com", password="superstrongpassword"),
+        ).status_code
+        == 200
+    )
+
+    ndjson_path = tmp_path / "users.ndjson"
+    ndjson_path.write_text(
+        '{"first_name": "Gus", "last_name": "Fring", '
+        '"email": "gus@example.com"}\n'
+        "{not json\n"
+    )
+    call_command(
+        "import_users", str(ndjson_path), stdout=stdout, stderr=stderr
+    )
+
+    assert models.User.objects.filter(email="gus@example.com").exists()
+    assert "Row 2: Not an object" in stderr.getvalue()
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import time
+
+"""
+This module drives the ASGI application from `core/asgi.py` in process.
+
+It sends requests straight to the application callable, the same way an
+ASGI server would, so the benchmarks can measure the views under ASGI
+without starting a server.
+"""
+
+
+async def asgi_request(
+    app, method: str, path: str, data=None, cookies: dict = None
+) -> tuple[int, dict, bytes]:
+    """
+    This function sends one HTTP request to an ASGI application.
+
+    Args:
+        app: The ASGI application.
+        method: The HTTP method of the request.
+        path: The path of the request, with an optional query string.
+        data: The JSON body of the request.
+        cookies: The cookies of the request.
+
+    Returns:
+        The status code, the headers and the body of the response.
+    """
+    path, _, query_string = path.partition("?")
+    body = b"" if data is None else json.dumps(data).encode()
+    headers = [
+        (b"host", b"testserver"),
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+
+    if cookies:
+        cookie = "; ".join(f"{key}={value}" for key, value in cookies.items())
+        headers.append((b"cookie", cookie.encode()))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    disconnected = asyncio.Event()
+    response = {"headers": {}, "body": []}
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+
+        await disconnected.wait()
+
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {
+                key.decode().lower(): value.decode()
+                for key, value in message["headers"]
+            }
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    disconnected.set()
+
+    return response["status"], response["headers"], b"".join(response["body"])
+
+
+async def run_concurrently(request_factory, total: int, concurrency: int):
+    """
+    This function sends `total` requests, at most `concurrency` at a time.
+
+    Args:
+        request_factory: A function returning the coroutine of one request.
+        total: The number of requests to send.
+        concurrency: The number of requests in flight at a time.
+
+    Returns:
+        The list of (status code, latency in seconds) of every request.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            status, _, _ = await request_factory()
+
+            return status, time.perf_counter() - started
+
+    return await asyncio.gather(*(one() for _ in range(total)))
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """
+    This function returns the nearest-rank percentile of a list of values.
+    """
+    values = sorted(values)
+    index = max(
+        0, min(len(values) - 1, round(percent / 100 * len(values)) - 1)
+    )
+
+    return values[index]
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from .results import BenchmarkResults
+
+
+@pytest.fixture(scope="session")
+def benchmark_results():
+    """
+    Fixture that collects the endpoint benchmark results of the run.
+
+    They are compared to `BENCHMARK_BASELINE` and written to
+    `BENCHMARK_RESULTS` when those are set.
+
+    Returns:
+        BenchmarkResults: The results of the run.
+    """
+    results = BenchmarkResults.from_file(
+        os.getenv("BENCHMARK_BASELINE"),
+        max_slowdown=float(os.getenv("BENCHMARK_MAX_SLOWDOWN", 25)),
+    )
+
+    yield results
+
+    if os.getenv("BENCHMARK_RESULTS"):
+        results.dump(os.getenv("BENCHMARK_RESULTS"))
@@ -0,0 +1,96 @@
+import dataclasses
+
+from django.contrib.auth.hashers import make_password
+
+from status import models as status_models
+from user import models as user_models
+
+"""
+This module seeds the datasets of the endpoint benchmarks.
+
+The rows are inserted with `bulk_create` and every user shares one password
+hash, so seeding doesn't hash a password per user. The signals of the user
+model don't run, the user cache starts empty.
+"""
+
+PASSWORD = "superstrongpassword"
+
+
+@dataclasses.dataclass
+class Dataset:
+    user: user_models.User
+    users: list[user_models.User]
+    status_ids: list[int]
+
+
+def seed_users(count: int, prefix: str = "user") -> list[user_models.User]:
+    """
+    This function creates users who all log in with `PASSWORD`.
+
+    Args:
+        count: The number of users.
+        prefix: The start of their email addresses.
+
+    Returns:
+        The created users.
+    """
+    password = make_password(PASSWORD)
+
+    return user_models.User.objects.bulk_create(
+        (
+            user_models.User(
+                first_name="Bench",
+                last_name=str(index),
+                email=f"{prefix}{index}@example.com",
+                password=password,
+            )
+            for index in range(count)
+        ),
+        batch_size=5000,
+    )
+
+
+def seed_statuses(user_ids: list[int], per_user: int) -> list[int]:
+    """
+    This function creates statuses for users.
+
+    Args:
+        user_ids: The IDs of the authors.
+        per_user: The number of statuses of every author.
+
+    Returns:
+        The IDs of the created statuses.
+    """
+    statuses = status_models.Status.objects.bulk_create(
+        (
+            status_models.Status(
+                user_id=user_id, content=f"Status {index} of user {user_id}"
+            )
+            for user_id in user_ids
+            for index in range(per_user)
+        ),
+        batch_size=5000,
+    )
+
+    return [status.id for status in statuses]
+
+
+def seed(users: int, statuses: int, others_statuses: int = 10) -> Dataset:
+    """
+    This function seeds the dataset of a benchmark.
+
+    Args:
+        users: The number of users besides the benchmarked one.
+        statuses: The number of statuses of the benchmarked user.
+        others_statuses: The number of statuses of every other user.
+
+    Returns:
+        The Dataset with the benchmarked user and the IDs of their statuses.
+    """
+    (user,) = seed_users(1, prefix="bench")
+    others = seed_users(users)
+    seed_statuses([other.id for other in others], others_statuses)
+
+    return Dataset(
+        user=user, users=others, status_ids=seed_statuses([user.id], statuses)
+    )
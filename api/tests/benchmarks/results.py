@@ -0,0 +1,106 @@
+import json
+import platform
+import statistics
+
+import django
+from django.db import connection
+
+"""
+This module collects the results of the endpoint benchmarks as JSON.
+
+With `BENCHMARK_RESULTS=<path>` the results are written to a file, with
+`BENCHMARK_BASELINE=<path>` they are compared to a previous file and an
+endpoint more than `BENCHMARK_MAX_SLOWDOWN` percent slower fails.
+"""
+
+
+class BenchmarkResults:
+    """
+    This class records the timings and query counts of a benchmark run.
+    """
+
+    def __init__(self, baseline: dict = None, max_slowdown: float = 25.0):
+        self.baseline = baseline or {}
+        self.max_slowdown = max_slowdown
+        self.results = {}
+
+    @classmethod
+    def from_file(cls, path: str = None, max_slowdown: float = 25.0):
+        """
+        This method creates the results compared to a baseline file.
+
+        Args:
+            path: The JSON file of a previous run, if any.
+            max_slowdown: The slowdown in percent failing an endpoint.
+
+        Returns:
+            The BenchmarkResults of the run.
+        """
+        baseline = None
+
+        if path:
+            with open(path) as baseline_file:
+                baseline = json.load(baseline_file)["results"]
+
+        return cls(baseline=baseline, max_slowdown=max_slowdown)
+
+    def record(self, name: str, timings: list[float], queries: int) -> dict:
+        """
+        This method records the runs of an endpoint.
+
+        Args:
+            name: The name of the endpoint and dataset, like `me[1000]`.
+            timings: The duration of every run, in seconds.
+            queries: The most SQL queries made by a run.
+
+        Returns:
+            The recorded result, with its slowdown against the baseline.
+        """
+        result = {
+            "median_ms": statistics.median(timings) * 1000,
+            "min_ms": min(timings) * 1000,
+            "runs": len(timings),
+            "queries": queries,
+        }
+        baseline = self.baseline.get(name)
+
+        if baseline is not None:
+            result["slowdown"] = (
+                result["median_ms"] / baseline["median_ms"] - 1
+            ) * 100
+
+        self.results[name] = result
+
+        return result
+
+    def regressions(self) -> list[str]:
+        """
+        This method lists the endpoints slower than the baseline allows.
+
+        Returns:
+            A description of every regression.
+        """
+        return [
+            f"{name}: {result['slowdown']:+.1f}% "
+            f"({self.baseline[name]['median_ms']:.2f}ms -> "
+            f"{result['median_ms']:.2f}ms)"
+            for name, result in self.results.items()
+            if result.get("slowdown", 0) > self.max_slowdown
+        ]
+
+    def dump(self, path: str):
+        with open(path, "w") as results_file:
+            json.dump(
+                {
+                    "environment": {
+                        "python": platform.python_version(),
+                        "django": django.get_version(),
+                        "database": connection.vendor,
+                        "machine": platform.machine(),
+                    },
+                    "results": self.results,
+                },
+                results_file,
+                indent=2,
+                sort_keys=True,
+            )
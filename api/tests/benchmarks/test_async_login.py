@@ -0,0 +1,74 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.test import Client, override_settings
+
+from .asgi import asgi_request, run_concurrently
+
+LOGINS = int(os.getenv("BENCHMARK_LOGINS", 16))
+CONCURRENCY = int(os.getenv("BENCHMARK_CONCURRENCY", 64))
+
+
+def _sync_login(user) -> int:
+    response = Client().post(
+        "/api/users/login/",
+        dict(email=user.email, password="superstrongpassword"),
+    )
+
+    return response.status_code
+
+
+# Every login comes from the same client and email, they must not be throttled
+@override_settings(AUTH_THROTTLE=dict(BACKEND="local", RATES={}))
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+def test_async_login_throughput(user):
+    """
+    Test the throughput of the async login against the sync login.
+
+    The sync view runs in as many threads as the password hashing pool has
+    workers, like the same number of WSGI workers would.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+    """
+    workers = settings.PASSWORD_HASHING["MAX_WORKERS"]
+
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        sync_statuses = list(executor.map(_sync_login, [user] * LOGINS))
+
+    sync_time = time.perf_counter() - started
+
+    app = get_asgi_application()
+
+    def login():
+        return asgi_request(
+            app,
+            "POST",
+            "/api/users/async/login/",
+            dict(email=user.email, password="superstrongpassword"),
+        )
+
+    started = time.perf_counter()
+    results = asyncio.run(run_concurrently(login, LOGINS, CONCURRENCY))
+    async_time = time.perf_counter() - started
+
+    accepted = [status for status, _ in results if status == 200]
+    rejected = [status for status, _ in results if status == 503]
+
+    print(
+        f"\n{LOGINS} logins with {workers} workers: "
+        f"sync {LOGINS / sync_time:.2f}/s, "
+        f"async {len(accepted) / async_time:.2f}/s "
+        f"({len(rejected)} rejected with 503)"
+    )
+
+    assert sync_statuses == [200] * LOGINS
+    assert len(accepted) + len(rejected) == LOGINS
@@ -0,0 +1,63 @@
+import asyncio
+import os
+import time
+
+import pytest
+from django.core.asgi import get_asgi_application
+
+from status import models
+from user import services as user_services
+
+from .asgi import asgi_request, percentile, run_concurrently
+
+REQUESTS = int(os.getenv("BENCHMARK_REQUESTS", 1_000))
+CONCURRENCY = int(os.getenv("BENCHMARK_CONCURRENCY", 100))
+
+
+def _measure(app, path: str, cookies: dict) -> tuple[float, float]:
+    def request():
+        return asgi_request(app, "GET", path, cookies=cookies)
+
+    started = time.perf_counter()
+    results = asyncio.run(run_concurrently(request, REQUESTS, CONCURRENCY))
+    elapsed = time.perf_counter() - started
+
+    assert all(status == 200 for status, _ in results)
+
+    latencies = [latency for _, latency in results]
+
+    return REQUESTS / elapsed, percentile(latencies, 99)
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+def test_async_status_views_under_asgi(user):
+    """
+    Test the requests per second and p99 latency of the sync and async status
+    views under the ASGI application.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+    """
+    models.Status.objects.bulk_create(
+        [
+            models.Status(user_id=user.id, content=f"Status {index}")
+            for index in range(20)
+        ]
+    )
+    cookies = {"jwt": user_services.create_token(user_id=user.id)}
+    app = get_asgi_application()
+
+    for label, path in [
+        ("sync list", "/api/status/"),
+        ("async list", "/api/status/async/"),
+        ("sync page", "/api/status/?limit=5"),
+        ("async page", "/api/status/async/?limit=5"),
+    ]:
+        rps, p99 = _measure(app, path, cookies)
+
+        print(
+            f"\n{label}: {rps:.0f} req/s, p99 {p99 * 1000:.1f}ms "
+            f"({REQUESTS} requests, {CONCURRENCY} concurrent)",
+            end="",
+        )
@@ -0,0 +1,173 @@
+import dataclasses
+import os
+import time
+from typing import Callable
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from . import datasets
+
+# Statuses of the benchmarked user, one dataset per size
+SIZES = [
+    int(size)
+    for size in os.getenv("BENCHMARK_ENDPOINT_SIZES", "10,1000,10000").split(
+        ","
+    )
+]
+USERS = int(os.getenv("BENCHMARK_ENDPOINT_USERS", 1000))
+RUNS = int(os.getenv("BENCHMARK_ENDPOINT_RUNS", 20))
+
+
+@dataclasses.dataclass
+class Endpoint:
+    name: str
+    # The request of a run, from the client, the dataset and the run number
+    request: Callable
+    status_code: int
+    max_queries: int
+    # Password hashing makes some endpoints too slow for RUNS runs
+    runs: int = RUNS
+
+
+ENDPOINTS = [
+    Endpoint(
+        "register",
+        lambda client, dataset, run: client.post(
+            "/api/users/register/",
+            dict(
+                first_name="Walter",
+                last_name="White",
+                email=f"new{run}@example.com",
+                password=datasets.PASSWORD,
+            ),
+        ),
+        200,
+        max_queries=1,
+        runs=3,
+    ),
+    Endpoint(
+        "login",
+        lambda client, dataset, run: client.post(
+            "/api/users/login/",
+            dict(email=dataset.user.email, password=datasets.PASSWORD),
+        ),
+        200,
+        max_queries=1,
+        runs=3,
+    ),
+    Endpoint(
+        "me",
+        lambda client, dataset, run: client.get("/api/users/me/"),
+        200,
+        max_queries=0,
+    ),
+    Endpoint(
+        "status_list",
+        lambda client, dataset, run: client.get("/api/status/"),
+        200,
+        max_queries=1,
+    ),
+    Endpoint(
+        "status_page",
+        lambda client, dataset, run: client.get("/api/status/", {"limit": 20}),
+        200,
+        max_queries=1,
+    ),
+    Endpoint(
+        "status_detail",
+        lambda client, dataset, run: client.get(
+            f"/api/status/{dataset.status_ids[run]}/"
+        ),
+        200,
+        max_queries=1,
+    ),
+    Endpoint(
+        "status_update",
+        lambda client, dataset, run: client.put(
+            f"/api/status/{dataset.status_ids[run]}/",
+            dict(content="Edited"),
+        ),
+        200,
+        max_queries=2,
+    ),
+    Endpoint(
+        "status_delete",
+        lambda client, dataset, run: client.delete(
+            f"/api/status/{dataset.status_ids[-run - 1]}/"
+        ),
+        204,
+        max_queries=3,
+    ),
+]
+
+
+def _measure(endpoint, client, dataset) -> tuple[list[float], int]:
+    timings = []
+    queries = 0
+
+    for run in range(endpoint.runs):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = endpoint.request(client, dataset, run)
+            timings.append(time.perf_counter() - started)
+
+        assert response.status_code == endpoint.status_code, endpoint.name
+        queries = max(queries, len(captured))
+
+    return timings, queries
+
+
+# The list cache and the throttles would hide the endpoints' own cost
+@override_settings(
+    STATUS_LIST_CACHE={"ENABLED": False},
+    AUTH_THROTTLE=dict(BACKEND="local", RATES={}),
+)
+@pytest.mark.benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", SIZES)
+def test_endpoints(client_factory, benchmark_results, size):
+    """
+    Test the latency and query count of the user and status endpoints.
+
+    Args:
+        client_factory (Callable): The factory of APIClient instances.
+        benchmark_results (BenchmarkResults): The results of the run.
+        size (int): The number of statuses of the benchmarked user.
+    """
+    dataset = datasets.seed(users=USERS, statuses=max(size, 2 * RUNS + 1))
+    client = client_factory()
+    client.post(
+        "/api/users/login/",
+        dict(email=dataset.user.email, password=datasets.PASSWORD),
+    )
+    # The first request loads the user into the user cache
+    client.get("/api/users/me/")
+    regressions = []
+
+    for endpoint in ENDPOINTS:
+        timings, queries = _measure(endpoint, client, dataset)
+        name = f"{endpoint.name}[{size}]"
+        result = benchmark_results.record(name, timings, queries)
+
+        print(
+            f"\n{name}: {result['median_ms']:.2f}ms median, "
+            f"{queries} queries"
+            + (
+                f", {result['slowdown']:+.1f}% against the baseline"
+                if "slowdown" in result
+                else ""
+            )
+        )
+
+        assert queries <= endpoint.max_queries, name
+
+        regressions += [
+            regression
+            for regression in benchmark_results.regressions()
+            if regression.startswith(f"{name}:")
+        ]
+
+    assert not regressions, regressions
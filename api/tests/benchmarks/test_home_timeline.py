@@ -0,0 +1,127 @@
+import datetime
+import os
+import time
+
+import pytest
+from django.db.models import Subquery
+from django.utils import timezone
+
+from status import models, services, timeline
+from user import models as user_models
+
+FOLLOWS = int(os.getenv("BENCHMARK_TIMELINE_FOLLOWS", 500))
+STATUSES_PER_AUTHOR = int(os.getenv("BENCHMARK_TIMELINE_STATUSES", 200))
+
+
+def _seed(user) -> list[int]:
+    authors = user_models.User.objects.bulk_create(
+        user_models.User(
+            first_name="Author",
+            last_name=str(index),
+            email=f"author{index}@gmail.com",
+            password="!",
+        )
+        for index in range(FOLLOWS * 2)
+    )
+    user_models.Follow.objects.bulk_create(
+        user_models.Follow(follower_id=user.id, followee_id=author.id)
+        for author in authors[:FOLLOWS]
+    )
+
+    started = timezone.now() - datetime.timedelta(days=30)
+    statuses = models.Status.objects.bulk_create(
+        (
+            models.Status(
+                user_id=author.id,
+                content=f"Status {index} of {author.id}",
+                date_published=started
+                + datetime.timedelta(seconds=index * len(authors) + offset),
+            )
+            for index in range(STATUSES_PER_AUTHOR)
+            for offset, author in enumerate(authors)
+        ),
+        batch_size=5000,
+    )
+    # `auto_now_add` replaced the dates, spread them over the month again
+    models.Status.objects.bulk_update(statuses, ["date_published"], 5000)
+
+    followed = {author.id for author in authors[:FOLLOWS]}
+    models.TimelineEntry.objects.bulk_create(
+        (
+            models.TimelineEntry(
+                user_id=user.id,
+                author_id=status.user_id,
+                status_id=status.id,
+                date_published=status.date_published,
+            )
+            for status in statuses
+            if status.user_id in followed
+        ),
+        batch_size=5000,
+    )
+
+    return [author.id for author in authors]
+
+
+def _join_on_read(user, limit: int) -> list[dict]:
+    followed = user_models.Follow.objects.filter(follower_id=user.id)
+
+    return list(
+        models.Status.objects.filter(
+            user_id__in=Subquery(followed.values("followee_id"))
+        )
+        .order_by(*services.STATUS_ORDERING)
+        .values(*services.STATUS_DETAILS_VALUES)[:limit]
+    )
+
+
+def _timed(func, runs: int) -> tuple[float, object]:
+    started = time.perf_counter()
+
+    for _ in range(runs):
+        result = func()
+
+    return (time.perf_counter() - started) / runs, result
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_home_timeline(user):
+    """
+    Test reading a home timeline pushed on write against joining the
+    follow graph on read.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+    """
+    author_ids = _seed(user)
+
+    join_time, joined = _timed(lambda: _join_on_read(user, 20), 20)
+    push_time, page = _timed(
+        lambda: services.get_home_timeline_values_page(user=user, limit=20),
+        20,
+    )
+
+    assert [row["id"] for row in page.results] == [row["id"] for row in joined]
+
+    # Every follower of one author, to time the write side
+    user_models.Follow.objects.bulk_create(
+        user_models.Follow(follower_id=author_id, followee_id=user.id)
+        for author_id in author_ids
+    )
+    status = models.Status.objects.create(user_id=user.id, content="Lorem")
+    fan_out_time, _ = _timed(
+        lambda: timeline.push(user.id, [(status.id, status.date_published)]),
+        1,
+    )
+
+    print(
+        f"\ntimeline of {FOLLOWS} follows x {STATUSES_PER_AUTHOR} statuses: "
+        f"{join_time * 1000:.2f}ms joining on read, "
+        f"{push_time * 1000:.2f}ms pushed on write, "
+        f"{join_time / push_time:.1f}x. "
+        f"Pushing a status to {len(author_ids)} followers: "
+        f"{fan_out_time * 1000:.1f}ms"
+    )
+
+    assert push_time < join_time
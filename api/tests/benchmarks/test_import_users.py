@@ -0,0 +1,59 @@
+import io
+import os
+import time
+
+import pytest
+from django.core.management import call_command
+
+from user import models
+from user import services as user_services
+
+# Every row costs a PBKDF2 hash, a few tenths of a second
+ROWS = int(os.getenv("BENCHMARK_IMPORT_USERS_ROWS", 40))
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_import_users(tmp_path):
+    """
+    Test `import_users` against a loop of `services.create_user`.
+
+    Args:
+        tmp_path (Path): A temporary directory for the file to import.
+    """
+    started = time.perf_counter()
+
+    for index in range(ROWS):
+        user_services.create_user(
+            user_dc=user_services.UserDataClass(
+                first_name="Loop",
+                last_name=str(index),
+                email=f"loop{index}@example.com",
+                password="superstrongpassword",
+            )
+        )
+
+    loop_time = time.perf_counter() - started
+
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "first_name,last_name,email,password\n"
+        + "".join(
+            f"Import,{index},import{index}@example.com,superstrongpassword\n"
+            for index in range(ROWS)
+        )
+    )
+
+    started = time.perf_counter()
+    call_command("import_users", str(path), stdout=io.StringIO())
+    import_time = time.perf_counter() - started
+
+    print(
+        f"\n{ROWS} users: loop {ROWS / loop_time:.1f} rows/s, import "
+        f"{ROWS / import_time:.1f} rows/s, {loop_time / import_time:.1f}x "
+        f"on {os.cpu_count()} cores"
+    )
+
+    assert models.User.objects.count() == 2 * ROWS
+    # Hashing dominates, it scales with the cores
+    assert loop_time / import_time > 0.7 * min(os.cpu_count(), 4)
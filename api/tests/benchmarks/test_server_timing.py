@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+from core import timing
+
+CALLS = 1_000_000
+
+
+def _work():
+    return None
+
+
+@timing.instrument("work")
+def _instrumented_work():
+    return None
+
+
+def _per_call(func) -> float:
+    started = time.perf_counter()
+
+    for _ in range(CALLS):
+        func()
+
+    return (time.perf_counter() - started) / CALLS
+
+
+@pytest.mark.benchmark
+def test_server_timing_overhead():
+    """
+    Test the cost of an instrumented call outside a timed request.
+    """
+    plain = _per_call(_work)
+    instrumented = _per_call(_instrumented_work)
+    overhead = instrumented - plain
+
+    print(
+        f"\ninstrumented call without Server-Timing: "
+        f"{overhead * 1_000_000_000:.0f}ns of overhead"
+    )
+
+    # A request makes a handful of instrumented calls
+    assert overhead < 0.000001
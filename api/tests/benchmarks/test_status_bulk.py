@@ -0,0 +1,40 @@
+import time
+
+import pytest
+
+from status import models
+
+BATCH_SIZE = 100
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_bulk_create_status(user, auth_client):
+    """
+    Test one bulk request against a loop of single status requests.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+    """
+    payload = [dict(content=f"Status {index}") for index in range(BATCH_SIZE)]
+
+    started = time.perf_counter()
+
+    for item in payload:
+        auth_client.post("/api/status/", item, format="json")
+
+    loop_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    response = auth_client.post("/api/status/bulk/", payload, format="json")
+    bulk_time = time.perf_counter() - started
+
+    print(
+        f"\n{BATCH_SIZE} statuses: loop {loop_time * 1000:.1f}ms, "
+        f"bulk {bulk_time * 1000:.1f}ms, {loop_time / bulk_time:.1f}x"
+    )
+
+    assert response.status_code == 201
+    assert models.Status.objects.count() == 2 * BATCH_SIZE
+    assert bulk_time < loop_time
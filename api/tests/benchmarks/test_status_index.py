@@ -0,0 +1,85 @@
+import os
+import time
+
+import pytest
+from django.db.models import Q
+
+from status import models, services
+
+STATUS_ROWS = int(os.getenv("BENCHMARK_STATUS_ROWS", 100_000))
+
+
+@pytest.fixture
+def heavy_user(user):
+    """
+    Fixture that gives the 'user' fixture a large history of statuses.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+
+    Returns:
+        User: The user owning `BENCHMARK_STATUS_ROWS` statuses.
+    """
+    models.Status.objects.bulk_create(
+        (
+            models.Status(user_id=user.id, content=f"Status {index}")
+            for index in range(STATUS_ROWS)
+        ),
+        batch_size=5000,
+    )
+
+    return user
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_user_status_query_uses_index(heavy_user):
+    """
+    Test that the newest statuses of a user are read from the composite index.
+
+    Args:
+        heavy_user (User): The user object created by the 'heavy_user' fixture.
+    """
+    user_status = models.Status.objects.filter(user_id=heavy_user.id)
+    page = services.get_user_status_values_page(user=heavy_user, limit=20)
+    date_published, status_id = services.decode_status_cursor(page.next)
+
+    plans = [
+        user_status.order_by(*services.STATUS_ORDERING)[:21].explain(),
+        user_status.filter(
+            Q(date_published__lt=date_published) | Q(id__lt=status_id),
+            date_published__lte=date_published,
+        )
+        .order_by(*services.STATUS_ORDERING)[:21]
+        .explain(),
+    ]
+
+    for plan in plans:
+        print(f"\n{plan}")
+
+        assert "status_user_published_idx" in plan
+        assert "TEMP B-TREE" not in plan
+
+    for label, cursor in [("first", None), ("last", _last_cursor(heavy_user))]:
+        started = time.perf_counter()
+
+        for _ in range(100):
+            services.get_user_status_values_page(
+                user=heavy_user, limit=20, cursor=cursor
+            )
+
+        elapsed = (time.perf_counter() - started) / 100
+
+        print(
+            f"{label} page of {STATUS_ROWS} statuses: {elapsed * 1000:.3f}ms"
+        )
+
+
+def _last_cursor(user) -> str:
+    last = (
+        models.Status.objects.filter(user_id=user.id)
+        .order_by("date_published", "id")
+        .values("date_published", "id")[20]
+    )
+
+    return services.encode_status_cursor(last["date_published"], last["id"])
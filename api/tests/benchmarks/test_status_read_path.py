@@ -0,0 +1,74 @@
+import time
+
+import pytest
+from rest_framework import renderers
+
+from status import models, serializer, services
+from status.renderers import FastJSONRenderer
+from user import models as user_models
+
+
+def _seed(user, rows: int):
+    models.Status.objects.bulk_create(
+        (
+            models.Status(user_id=user.id, content=f"Status number {index}")
+            for index in range(rows)
+        ),
+        batch_size=5000,
+    )
+
+
+def _serializer_path(user) -> bytes:
+    # The model instances and DRF serializer the read path replaced
+    status_collection = [
+        services.StatusDataClass.from_instance(status, user=user)
+        for status in models.Status.objects.filter(user_id=user.id).order_by(
+            *services.STATUS_ORDERING
+        )
+    ]
+    data = serializer.StatusSerializer(status_collection, many=True).data
+
+    return renderers.JSONRenderer().render(data)
+
+
+def _read_path(user) -> bytes:
+    status_collection = services.get_user_status_values(user=user)
+    data = serializer.StatusReadSerializer(
+        status_collection, many=True, user=user
+    ).data
+
+    return FastJSONRenderer().render(data)
+
+
+def _timed(func, user) -> tuple[float, bytes]:
+    started = time.perf_counter()
+    content = func(user)
+
+    return time.perf_counter() - started, content
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("rows", [1_000, 10_000, 100_000])
+def test_status_read_path(user, rows):
+    """
+    Test the fast read path against StatusSerializer for a list of statuses.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        rows (int): The number of statuses to list.
+    """
+    _seed(user, rows)
+    user = user_models.User.objects.get(id=user.id)
+
+    serializer_time, expected = _timed(_serializer_path, user)
+    read_time, content = _timed(_read_path, user)
+
+    print(
+        f"\n{rows} statuses: serializer {serializer_time * 1000:.1f}ms, "
+        f"read path {read_time * 1000:.1f}ms, "
+        f"{serializer_time / read_time:.1f}x"
+    )
+
+    assert content == expected
+    assert read_time < serializer_time
@@ -0,0 +1,93 @@
+import os
+import random
+import time
+
+import pytest
+
+from status import models, search, services
+
+SEARCH_ROWS = int(os.getenv("BENCHMARK_SEARCH_ROWS", 1_000_000))
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "ze", "qu"]
+# 1000 words, the first ones much more frequent like in real text
+WORDS = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+WEIGHTS = [1 / rank for rank in range(1, len(WORDS) + 1)]
+
+
+def _seed(user, rows: int):
+    generator = random.Random(0)
+    # A word written in only 10 statuses, spread over the history
+    rare_rows = set(generator.sample(range(rows), 10))
+
+    models.Status.objects.bulk_create(
+        (
+            models.Status(
+                user_id=user.id,
+                content=" ".join(
+                    generator.choices(WORDS, WEIGHTS, k=10)
+                    + (["heisenberg"] if index in rare_rows else [])
+                ),
+            )
+            for index in range(rows)
+        ),
+        batch_size=5000,
+    )
+
+
+def _timed(backend, user, terms: list[str], runs: int) -> tuple[float, list]:
+    started = time.perf_counter()
+
+    for _ in range(runs):
+        ids = backend.search("default", user.id, terms, 21, 0)
+
+    return (time.perf_counter() - started) / runs, ids
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_status_search(user):
+    """
+    Test the full-text search against an `icontains` scan.
+
+    The scan reads the statuses newest first and stops at the first page of
+    matches, so it only loses when the words are rare. The full-text search
+    ranks every match, and costs the same whatever the history.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+    """
+    _seed(user, SEARCH_ROWS)
+
+    cases = [
+        ("rare", ["heisenberg"], True),
+        ("missing", ["saymyname"], True),
+        ("two words", [WORDS[40], WORDS[60]], False),
+        ("frequent", [WORDS[10]], False),
+    ]
+
+    for label, terms, faster in cases:
+        scan_time, scan_ids = _timed(
+            search.ContainsSearchBackend(), user, terms, 3
+        )
+        index_time, index_ids = _timed(
+            search.SQLiteSearchBackend(), user, terms, 3
+        )
+
+        print(
+            f"\n{label} {terms} in {SEARCH_ROWS} statuses: "
+            f"{scan_time * 1000:.1f}ms with icontains, "
+            f"{index_time * 1000:.1f}ms with FTS5"
+        )
+
+        assert len(index_ids) == len(scan_ids)
+
+        if faster:
+            assert sorted(index_ids) == sorted(scan_ids)
+            assert index_time < scan_time
+
+    page = services.search_user_status_values_page(
+        user=user, query="heisenberg", limit=5
+    )
+
+    assert len(page.results) == 5
+    assert page.next is not None
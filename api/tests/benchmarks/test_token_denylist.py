@@ -0,0 +1,63 @@
+import time
+import uuid
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from user.revocation import get_token_denylist
+
+
+def _revoke_many(count: int):
+    denylist = get_token_denylist()
+    expires_at = time.time() + 3600
+
+    for _ in range(count):
+        denylist.revoke(jti=uuid.uuid4().hex, expires_at=expires_at)
+
+
+@pytest.mark.benchmark
+@override_settings(JWT_DENYLIST={"ENABLED": True})
+@pytest.mark.django_db
+@pytest.mark.parametrize("revoked", [0, 10_000])
+def test_token_denylist(user, auth_client, revoked):
+    """
+    Test that checking the denylist costs microseconds and no query.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+        auth_client (APIClient): The authenticated APIClient instance.
+        revoked (int): The number of tokens revoked before the requests.
+    """
+    _revoke_many(revoked)
+    denylist = get_token_denylist()
+    lookups = 100_000
+
+    started = time.perf_counter()
+
+    for _ in range(lookups):
+        denylist.is_revoked("0123456789abcdef0123456789abcdef")
+
+    per_lookup = (time.perf_counter() - started) / lookups
+
+    # The first request loads the user into the user cache
+    auth_client.get("/api/users/me/")
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+
+        for _ in range(100):
+            response = auth_client.get("/api/users/me/")
+
+        per_request = (time.perf_counter() - started) / 100
+
+    print(
+        f"\n{revoked} revoked tokens: {per_lookup * 1_000_000:.2f}us per "
+        f"lookup, {per_request * 1000:.2f}ms per request, "
+        f"{len(queries)} queries"
+    )
+
+    assert response.status_code == 200
+    assert len(queries) == 0
+    assert per_lookup < 0.00005
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+from django.test import RequestFactory, override_settings
+
+from user import services as user_services
+from user.authentication import CustomUserAuthentication
+
+
+def _authenticate(user, requests: int) -> float:
+    request = RequestFactory().get("/api/users/me/")
+    request.COOKIES["jwt"] = user_services.create_token(user_id=user.id)
+    authentication = CustomUserAuthentication()
+
+    # The first request verifies the token and loads the user into the cache
+    authentication.authenticate(request)
+
+    started = time.perf_counter()
+
+    for _ in range(requests):
+        authenticated_user, _ = authentication.authenticate(request)
+
+    assert authenticated_user.id == user.id
+
+    return (time.perf_counter() - started) / requests
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_token_verification(user, django_assert_num_queries):
+    """
+    Test the authentication overhead with and without the verified tokens.
+
+    Args:
+        user (User): The user object created by the 'user' fixture.
+    """
+    requests = 20_000
+
+    with override_settings(JWT_VERIFIED_TOKEN_CACHE_SIZE=0):
+        uncached = _authenticate(user, requests)
+
+    with override_settings(JWT_VERIFIED_TOKEN_CACHE_SIZE=4096):
+        with django_assert_num_queries(0):
+            cached = _authenticate(user, requests)
+
+    print(
+        f"\nauthentication: {uncached * 1_000_000:.1f}us verifying every "
+        f"token, {cached * 1_000_000:.1f}us with verified tokens, "
+        f"{uncached / cached:.1f}x"
+    )
+
+    assert cached < uncached
@@ -1,6 +1,55 @@
 import pytest
+from asgiref.sync import async_to_sync
 from rest_framework.test import APIClient
 from user import services as user_services
+from django.core.cache import caches
+from django.test import override_settings
+from user.cache import get_user_cache
+from user.revocation import get_token_denylist
+from user.throttling import get_throttle_cache
+
+
+def _clear_caches():
+    get_user_cache().clear()
+    get_token_denylist().clear()
+    get_throttle_cache().clear()
+
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Fixture that empties the user cache, the token denylist, the throttles
+    and the Django caches around every test.
+
+    The database is rolled back between tests, so ids are reused and a
+    cached entry could otherwise leak into the next test.
+    """
+    _clear_caches()
+    yield
+    _clear_caches()
+
+
+@pytest.fixture
+def shared_cache(tmp_path):
+    """
+    Fixture that replaces the default cache with a file based cache, which
+    the processes of a server could share.
+
+    The features that must reach every process are disabled with the
+    default per-process cache.
+    """
+    caches_setting = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "cache"),
+        }
+    }
+
+    with override_settings(CACHES=caches_setting):
+        yield
 
 
 @pytest.fixture
@@ -34,6 +83,17 @@ def client():
     return APIClient()
 
 
+@pytest.fixture
+def client_factory():
+    """
+    Fixture that creates more APIClient instances, for tests needing several.
+
+    Returns:
+        Callable: A function returning a new APIClient.
+    """
+    return APIClient
+
+
 @pytest.fixture
 def auth_client(user, client):
     """
@@ -52,3 +112,21 @@ def auth_client(user, client):
     )
 
     return client
+
+
+@pytest.fixture
+def async_call():
+    """
+    Fixture that runs an async call, like an AsyncClient request, from a test.
+
+    Returns:
+        Callable: A function taking the async callable and its arguments.
+    """
+
+    def call(func, *args, **kwargs):
+        async def run():
+            return await func(*args, **kwargs)
+
+        return async_to_sync(run)()
+
+    return call
@@ -0,0 +1,222 @@
+import json
+import math
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions, renderers
+
+from core import metrics
+
+from . import serializer as user_serialzier
+from . import services, throttling
+from .hashing import PasswordHashingPoolFull, get_password_hashing_pool
+
+"""
+This class is the base of the async API views.
+
+These views run natively under `core/asgi.py`. Like the DRF views, they are
+exempt from CSRF checks, authenticate the request with the async versions of
+the authentication classes and answer errors with a `detail` message.
+"""
+
+
+class AsyncAPIView(View):
+    authentication_classes = ()
+    # Like `permissions.IsAuthenticated`
+    authentication_required = False
+    throttle_classes = ()
+    renderer_class = renderers.JSONRenderer
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.authenticate(request)
+            self.check_throttles(request)
+
+            return await super().dispatch(request, *args, **kwargs)
+        except Http404:
+            return self.error_response("Not found.", status=404)
+        except (
+            exceptions.NotAuthenticated,
+            exceptions.AuthenticationFailed,
+        ) as exc:
+            # Same as DRF without a `WWW-Authenticate` header
+            return self.error_response(exc.detail, status=403)
+        except exceptions.Throttled as exc:
+            resp = self.error_response(exc.detail, exc.status_code)
+            resp["Retry-After"] = str(math.ceil(exc.wait))
+
+            return resp
+        except exceptions.APIException as exc:
+            return self.error_response(exc.detail, exc.status_code)
+        except PasswordHashingPoolFull:
+            resp = self.error_response("Server busy, retry later", status=503)
+            resp["Retry-After"] = str(settings.PASSWORD_HASHING_RETRY_AFTER)
+
+            return resp
+
+    async def authenticate(self, request):
+        """
+        This method sets `request.user` and `request.auth`.
+
+        Raises:
+            NotAuthenticated: If the view requires a user and none is found.
+        """
+        for authentication_class in self.authentication_classes:
+            result = await authentication_class().authenticate(request)
+
+            if result is not None:
+                request.user, request.auth = result
+                break
+
+        # Like `permissions.IsAuthenticated`, the token of a deleted user
+        # leaves the request without a user
+        user = getattr(request, "user", None)
+
+        if self.authentication_required and not (
+            user and user.is_authenticated
+        ):
+            raise exceptions.NotAuthenticated()
+
+    def check_throttles(self, request):
+        """
+        This method refuses the request if any throttle refuses it.
+
+        Raises:
+            Throttled: With the longest wait of the refusing throttles.
+        """
+        waits = [
+            throttle.wait()
+            for throttle in (cls() for cls in self.throttle_classes)
+            if not throttle.allow_request(request, self)
+        ]
+
+        if waits:
+            raise exceptions.Throttled(wait=max(waits))
+
+    def render(self, data, status: int = 200) -> "HttpResponse":
+        """
+        This method renders the data into a JSON response.
+        """
+        renderer = self.renderer_class()
+
+        return HttpResponse(
+            renderer.render(data),
+            status=status,
+            content_type=renderer.media_type,
+        )
+
+    def error_response(self, detail, status: int) -> "HttpResponse":
+        if isinstance(detail, str):
+            detail = {"detail": detail}
+
+        return self.render(detail, status=status)
+
+    def get_data(self, request):
+        """
+        This method parses the JSON or form body of the request.
+        """
+        if request.content_type == "application/json":
+            try:
+                return json.loads(request.body or b"{}")
+            except ValueError:
+                raise exceptions.ParseError()
+
+        return request.POST
+
+
+"""
+This class defines the `/api/users/async/register/` endpoint.
+
+It is the async version of `RegisterApi`.
+"""
+
+
+class AsyncRegisterApi(AsyncAPIView):
+    throttle_classes = (throttling.RegisterIPRateThrottle,)
+
+    async def post(self, request):
+        """
+        This method handles POST requests to the endpoint.
+
+        It validates the request data and creates a new user account, the
+        password is hashed in the password hashing pool.
+        """
+        serializer = user_serialzier.UserSerialzier(
+            data=self.get_data(request)
+        )
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data
+        serializer.instance = await services.acreate_user(user_dc=data)
+
+        return self.render(serializer.data)
+
+
+"""
+This class defines the `/api/users/async/login/` endpoint.
+
+It is the async version of `LoginApi`.
+"""
+
+
+class AsyncLoginApi(AsyncAPIView):
+    throttle_classes = (
+        throttling.LoginIPRateThrottle,
+        throttling.LoginEmailRateThrottle,
+    )
+
+    async def post(self, request):
+        """
+        This method handles POST requests to the endpoint.
+
+        It validates the request data and logs the user in, the password is
+        checked in the password hashing pool.
+        """
+        data = self.get_data(request)
+        email = data.get("email")
+        password = data.get("password")
+
+        if email is None or password is None:
+            metrics.count_auth("login", success=False)
+            raise exceptions.AuthenticationFailed("Invalid Credentials")
+
+        user = await services.auser_email_selector(email=email)
+
+        if user is None:
+            metrics.count_auth("login", success=False)
+            raise exceptions.AuthenticationFailed("Invalid Credentials")
+
+        pool = get_password_hashing_pool()
+
+        async def setter(raw_password):
+            # Like `AbstractBaseUser.check_password`, outdated hashes are
+            # upgraded on login
+            try:
+                user.password = await pool.make_password(raw_password)
+            except PasswordHashingPoolFull:
+                # The hash is upgraded on a later login
+                return
+
+            await user.asave(update_fields=["password"])
+
+        if not await pool.check_password(password, user.password, setter):
+            metrics.count_auth("login", success=False)
+            raise exceptions.AuthenticationFailed("Invalid Credentials")
+
+        metrics.count_auth("login", success=True)
+
+        token = services.create_token(user_id=user.id, user=user)
+
+        resp = HttpResponse()
+
+        resp.set_cookie(key="jwt", value=token, httponly=True)
+
+        return resp
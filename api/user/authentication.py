@@ -1,8 +1,11 @@
-from django.conf import settings
 from rest_framework import authentication, exceptions
-import jwt
 
-from . import models
+from core import metrics, timing
+
+from . import services
+from .cache import get_profile_version, has_shared_profile_versions
+from .revocation import get_token_denylist
+from .signing import get_key_ring
 
 """
 This class is a custom authentication class that uses JWT tokens.
@@ -12,12 +15,42 @@ It authenticates users by decoding the JWT token in the request cookies.
 
 
 class CustomUserAuthentication(authentication.BaseAuthentication):
+    @timing.instrument("auth")
     def authenticate(self, request):
         """
         This method authenticates the user.
 
         It gets the JWT token from the request cookies and decodes it.
-        If the token is valid, it returns the user object.
+        If the token is valid, it returns the user object and the payload
+        of the token.
+
+        Tokens carrying the user's profile are served without loading the
+        user, unless the profile has changed since the token was issued.
+        """
+        payload = self.get_payload(request)
+
+        if payload is None:
+            return None
+
+        token_user = self.get_token_user(payload)
+
+        if token_user is not None:
+            return (token_user, payload)
+
+        user = services.user_id_selector(user_id=payload["id"])
+
+        return (user, payload)
+
+    def get_payload(self, request):
+        """
+        This method decodes the JWT token of the request cookies.
+
+        The token is verified with the key named by its `kid` header, see
+        `signing.KeyRing.decode`. Revoked tokens are refused. Tokens issued
+        without a `jti` can't be revoked and are accepted until they expire.
+
+        Returns:
+            The payload of the token, or None if there is no token.
         """
         token = request.COOKIES.get("jwt")
 
@@ -25,12 +58,62 @@ class CustomUserAuthentication(authentication.BaseAuthentication):
             return None
 
         try:
-            payload = jwt.decode(
-                token, settings.JWT_SECRET, algorithms=["HS256"]
-            )
+            payload = get_key_ring().decode(token)
         except:
+            metrics.count_auth("jwt", success=False)
+            raise exceptions.AuthenticationFailed("Unauthorized")
+
+        if "jti" in payload and get_token_denylist().is_revoked(
+            payload["jti"]
+        ):
+            metrics.count_auth("jwt", success=False)
             raise exceptions.AuthenticationFailed("Unauthorized")
 
-        user = models.User.objects.filter(id=payload["id"]).first()
+        metrics.count_auth("jwt", success=True)
+
+        return payload
+
+    def get_token_user(self, payload: dict):
+        """
+        This method builds the user from the claims of the token.
+
+        Returns:
+            The TokenUser, or None if the token doesn't carry up to date
+            claims and the user has to be loaded.
+        """
+        # Without a shared cache the version can be stale in this process
+        if "ver" in payload and has_shared_profile_versions():
+            if get_profile_version(payload["id"]) == payload["ver"]:
+                return services.TokenUser.from_payload(payload)
+
+        return None
+
+
+"""
+This class is the async version of `CustomUserAuthentication`.
+
+It is used by the async API views and loads the user with the async ORM.
+"""
+
+
+class AsyncCustomUserAuthentication(CustomUserAuthentication):
+    @timing.instrument("auth")
+    async def authenticate(self, request):
+        """
+        This method authenticates the user.
+
+        It works like `CustomUserAuthentication.authenticate`.
+        """
+        payload = self.get_payload(request)
+
+        if payload is None:
+            return None
+
+        token_user = self.get_token_user(payload)
+
+        if token_user is not None:
+            return (token_user, payload)
+
+        user = await services.auser_id_selector(user_id=payload["id"])
 
-        return (user, None)
+        return (user, payload)
@@ -0,0 +1,290 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from core import metrics
+from core.cache import is_shared_cache
+
+if TYPE_CHECKING:
+    from .models import User
+
+"""
+This module contains the cache of authenticated users.
+
+It lets the authentication class resolve the user from the JWT payload
+without querying the database on every request.
+"""
+
+
+class LocalUserCacheBackend:
+    """
+    This backend keeps users in the memory of the current process.
+
+    Entries are evicted in least recently used order once `max_size` is
+    reached and expire `ttl` seconds after they were stored.
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int):
+        with self._lock:
+            entry = self._entries.get(user_id)
+
+            if entry is None:
+                return None
+
+            expires_at, user = entry
+
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+
+            self._entries.move_to_end(user_id)
+
+        # Every request gets its own copy so that one request can't leak
+        # attribute changes into another.
+        return copy.copy(user)
+
+    def set(self, user_id: int, user: "User"):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user_id)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SharedUserCacheBackend:
+    """
+    This backend keeps users in one of the caches from `settings.CACHES`.
+
+    It should be used when several processes serve the API, so that an
+    invalidation done by one of them is seen by all the others.
+    """
+
+    key_prefix = "user:cache:"
+
+    def __init__(self, ttl: int, cache_alias: str):
+        self.ttl = ttl
+        self.cache_alias = cache_alias
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get(self, user_id: int):
+        return self.cache.get(f"{self.key_prefix}{user_id}")
+
+    def set(self, user_id: int, user: "User"):
+        self.cache.set(f"{self.key_prefix}{user_id}", user, timeout=self.ttl)
+
+    def delete(self, user_id: int):
+        self.cache.delete(f"{self.key_prefix}{user_id}")
+
+    def clear(self):
+        # Shared entries expire on their own, they can't be listed.
+        pass
+
+    def __len__(self):
+        return 0
+
+
+class UserCache:
+    """
+    This class wraps a cache backend and counts hits and misses.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int):
+        user = self.backend.get(user_id)
+        metrics.CACHE_REQUESTS.inc(
+            cache="user", result="miss" if user is None else "hit"
+        )
+
+        with self._lock:
+            if user is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return user
+
+    def set(self, user_id: int, user: "User"):
+        self.backend.set(user_id, user)
+
+    def delete(self, user_id: int):
+        self.backend.delete(user_id)
+
+    def clear(self):
+        self.backend.clear()
+
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        This method returns the hit and miss counters of the cache.
+
+        Returns:
+            A dict with the hits, misses, hit ratio and local size.
+        """
+        total = self.hits + self.misses
+
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            hit_ratio=self.hits / total if total else 0.0,
+            size=len(self.backend),
+        )
+
+
+class _DisabledUserCacheBackend:
+    def get(self, user_id: int):
+        return None
+
+    def set(self, user_id: int, user: "User"):
+        pass
+
+    def delete(self, user_id: int):
+        pass
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+_user_cache = None
+_user_cache_lock = threading.Lock()
+
+
+def get_user_cache() -> "UserCache":
+    """
+    This function returns the user cache configured by `settings.USER_CACHE`.
+
+    Returns:
+        The UserCache shared by the whole process.
+    """
+    global _user_cache
+
+    if _user_cache is None:
+        with _user_cache_lock:
+            if _user_cache is None:
+                _user_cache = UserCache(backend=_build_backend())
+
+    return _user_cache
+
+
+def _build_backend():
+    config = settings.USER_CACHE
+    backend = config.get("BACKEND", "local")
+
+    if backend == "local":
+        return LocalUserCacheBackend(
+            max_size=config.get("MAX_SIZE", 1024), ttl=config.get("TTL", 300)
+        )
+
+    if backend == "shared":
+        return SharedUserCacheBackend(
+            ttl=config.get("TTL", 300),
+            cache_alias=config.get("CACHE_ALIAS", "default"),
+        )
+
+    if backend == "disabled":
+        return _DisabledUserCacheBackend()
+
+    raise ValueError(f"Unknown USER_CACHE backend: {backend}")
+
+
+def _profile_version_key(user_id: int) -> str:
+    return f"user:profile_version:{user_id}"
+
+
+def has_shared_profile_versions() -> bool:
+    """
+    This function tells whether the profile versions are kept in a cache
+    shared by the processes.
+
+    A version bumped by one process must be seen by all of them, otherwise
+    the others keep trusting the claims of tokens made before the change.
+
+    Returns:
+        Whether `settings.USER_CACHE["CACHE_ALIAS"]` is a shared cache.
+    """
+    return is_shared_cache(settings.USER_CACHE.get("CACHE_ALIAS", "default"))
+
+
+def get_profile_version(user_id: int):
+    """
+    This function returns the last known profile version of a user.
+
+    Args:
+        user_id: The ID of the user.
+
+    Returns:
+        The profile version, or None if it isn't known to the cache.
+    """
+    cache = caches[settings.USER_CACHE.get("CACHE_ALIAS", "default")]
+
+    return cache.get(_profile_version_key(user_id))
+
+
+def set_profile_version(user_id: int, profile_version: int):
+    """
+    This function records the current profile version of a user.
+
+    Args:
+        user_id: The ID of the user.
+        profile_version: The profile version stored in the database.
+    """
+    cache = caches[settings.USER_CACHE.get("CACHE_ALIAS", "default")]
+    cache.set(_profile_version_key(user_id), profile_version, timeout=None)
+
+
+def delete_profile_version(user_id: int):
+    """
+    This function forgets the profile version of a deleted user, so that
+    the claims tokens of the user are no longer trusted.
+
+    Args:
+        user_id: The ID of the user.
+    """
+    cache = caches[settings.USER_CACHE.get("CACHE_ALIAS", "default")]
+    cache.delete(_profile_version_key(user_id))
+
+
+@receiver(setting_changed)
+def _reset_user_cache(setting, **kwargs):
+    global _user_cache
+
+    if setting == "USER_CACHE":
+        _user_cache = None
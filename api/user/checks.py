@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core import checks
+
+from .cache import has_shared_profile_versions
+from .revocation import get_token_denylist
+
+"""
+This module contains the system checks of the user app.
+"""
+
+
+@checks.register(checks.Tags.security)
+def check_claims_tokens(app_configs, **kwargs):
+    """
+    This function refuses the claims tokens when the profile versions have
+    no cache shared by the processes.
+
+    Returns:
+        The list of errors.
+    """
+    if not settings.JWT_CLAIMS_TOKENS or has_shared_profile_versions():
+        return []
+
+    return [
+        checks.Error(
+            "JWT_CLAIMS_TOKENS needs a cache shared by the processes, a "
+            "profile edit would otherwise be served stale by the others.",
+            hint="Point CACHES[USER_CACHE['CACHE_ALIAS']] at a shared cache, "
+            "like Redis. Until then the claims are ignored.",
+            id="user.E001",
+        )
+    ]
+
+
+@checks.register(checks.Tags.security)
+def check_token_denylist(app_configs, **kwargs):
+    """
+    This function warns when logging out doesn't revoke tokens, because the
+    denylist has no cache shared by the processes.
+
+    Returns:
+        The list of warnings.
+    """
+    if get_token_denylist().enabled:
+        return []
+
+    return [
+        checks.Warning(
+            "The JWT denylist is disabled, a token copied before logout "
+            "stays valid until it expires.",
+            hint="Point CACHES[JWT_DENYLIST['CACHE_ALIAS']] at a cache "
+            "shared by the processes, like Redis, or set "
+            "JWT_DENYLIST_ENABLED=1 with a single process.",
+            id="user.W001",
+        )
+    ]
@@ -0,0 +1,162 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+"""
+This module contains the pool that hashes and checks passwords off the
+request thread for the async views.
+
+PBKDF2 keeps a CPU busy for hundreds of milliseconds, so the async views
+hand it to a bounded pool and refuse new work once the pool is saturated.
+"""
+
+
+class PasswordHashingPoolFull(Exception):
+    """
+    This exception is raised when the pool can't accept more passwords.
+    """
+
+
+def _init_process_worker():
+    # Spawned processes don't inherit the configured Django settings
+    if not django.apps.apps.ready:
+        django.setup()
+
+
+def _must_update(encoded: str) -> bool:
+    preferred = hashers.get_hasher("default")
+
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(
+        encoded
+    )
+
+
+class PasswordHashingPool:
+    """
+    This class runs password hashing in a thread or process pool.
+
+    At most `max_workers` passwords are hashed at a time and `max_pending`
+    more can wait for a worker, any password beyond that is refused.
+    """
+
+    def __init__(
+        self, executor: str = "thread", max_workers: int = 1, max_pending=0
+    ):
+        if executor == "thread":
+            self.executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="password-hashing"
+            )
+        elif executor == "process":
+            self.executor = ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_process_worker
+            )
+        else:
+            raise ValueError(f"Unknown PASSWORD_HASHING executor: {executor}")
+
+        self.slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    async def run(self, func, *args):
+        """
+        This method runs a function in the pool and waits for its result.
+
+        Raises:
+            PasswordHashingPoolFull: If every worker and queue slot is taken.
+        """
+        if not self.slots.acquire(blocking=False):
+            raise PasswordHashingPoolFull()
+
+        try:
+            loop = asyncio.get_running_loop()
+
+            return await loop.run_in_executor(
+                self.executor, functools.partial(func, *args)
+            )
+        finally:
+            self.slots.release()
+
+    async def make_password(self, raw_password: str) -> str:
+        """
+        This method hashes a password in the pool.
+
+        Args:
+            raw_password: The password to hash.
+
+        Returns:
+            The hashed password, as stored in `User.password`.
+        """
+        return await self.run(hashers.make_password, raw_password)
+
+    async def check_password(
+        self, raw_password: str, encoded: str, setter=None
+    ) -> bool:
+        """
+        This method checks a password against its hash in the pool.
+
+        Like `hashers.check_password`, the setter is called with the raw
+        password when it matches a hash made with an outdated hasher or
+        number of iterations.
+
+        Args:
+            raw_password: The password to check.
+            encoded: The hashed password stored in `User.password`.
+            setter: An async function saving the password hashed again.
+
+        Returns:
+            Whether the password matches the hash.
+        """
+        valid = await self.run(hashers.check_password, raw_password, encoded)
+
+        if valid and setter is not None and _must_update(encoded):
+            await setter(raw_password)
+
+        return valid
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_password_hashing_pool = None
+_password_hashing_pool_lock = threading.Lock()
+
+
+def get_password_hashing_pool() -> "PasswordHashingPool":
+    """
+    This function returns the pool configured by `settings.PASSWORD_HASHING`.
+
+    Returns:
+        The PasswordHashingPool shared by the whole process.
+    """
+    global _password_hashing_pool
+
+    if _password_hashing_pool is None:
+        with _password_hashing_pool_lock:
+            if _password_hashing_pool is None:
+                config = settings.PASSWORD_HASHING
+                _password_hashing_pool = PasswordHashingPool(
+                    executor=config.get("EXECUTOR", "thread"),
+                    max_workers=config.get("MAX_WORKERS", 1),
+                    max_pending=config.get("MAX_PENDING", 0),
+                )
+
+    return _password_hashing_pool
+
+
+@receiver(setting_changed)
+def _reset_password_hashing_pool(setting, **kwargs):
+    global _password_hashing_pool
+
+    if setting == "PASSWORD_HASHING" and _password_hashing_pool is not None:
+        _password_hashing_pool.shutdown()
+        _password_hashing_pool = None
@@ -0,0 +1,217 @@
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import hashers
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from user import models as user_models
+from user.hashing import _init_process_worker
+
+"""
+This command creates users in bulk from a CSV or NDJSON file.
+
+The rows are read as a stream, in chunks. The passwords of a chunk are
+hashed in a process pool using every core, the emails already taken are
+found with one query per chunk and the new users are inserted with
+`bulk_create`. A row needs `first_name`, `last_name` and `email`, and can
+have a `password`; without one the user gets an unusable password.
+
+The users are created without the `post_save` receivers, which only
+matter for users that already exist.
+"""
+
+
+def _read_ndjson(stream):
+    for line in stream:
+        if not line.strip():
+            continue
+
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # Counted as an invalid row
+            yield None
+
+
+class Command(BaseCommand):
+    help = "Create users in bulk from a CSV or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The file to import, - for stdin")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="By default guessed from the file extension",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Processes hashing the passwords, by default one per core",
+        )
+        parser.add_argument(
+            "--report-duplicates",
+            action="store_true",
+            help="List the rows skipped because their email is taken",
+        )
+
+    def handle(
+        self,
+        *args,
+        path,
+        format,
+        batch_size,
+        workers,
+        report_duplicates,
+        **options,
+    ):
+        if format is None:
+            if path.endswith(".csv"):
+                format = "csv"
+            elif path.endswith((".ndjson", ".jsonl")):
+                format = "ndjson"
+            else:
+                raise CommandError("Can't guess the format, use --format")
+
+        self.report_duplicates = report_duplicates
+        self.rows = self.imported = self.duplicates = self.invalid = 0
+        # The emails of the file, to find its own duplicates
+        self.seen = set()
+        read = csv.DictReader if format == "csv" else _read_ndjson
+        started = time.perf_counter()
+
+        try:
+            stream = sys.stdin if path == "-" else open(path, newline="")
+        except OSError as error:
+            raise CommandError(f"Can't read {path}: {error}")
+
+        with stream, ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_process_worker
+        ) as executor:
+            rows = enumerate(read(stream), start=1)
+
+            while chunk := list(itertools.islice(rows, batch_size)):
+                self._import_chunk(chunk, executor, workers)
+
+                if options["verbosity"] > 1:
+                    self._write_progress(started)
+
+        self._write_progress(started)
+
+    def _import_chunk(self, chunk, executor, workers):
+        # The new users by email, in the order of the file
+        pending = {}
+
+        for number, row in chunk:
+            user = self._build_user(number, row)
+
+            if user is None:
+                continue
+
+            if user.email in self.seen:
+                self._skip_duplicate(number, user.email)
+                continue
+
+            self.seen.add(user.email)
+            pending[user.email] = (number, user, row.get("password") or None)
+
+        # The taken emails are dropped before hashing their passwords
+        for email in self._find_taken(pending):
+            self._skip_duplicate(pending.pop(email)[0], email)
+
+        entries = list(pending.values())
+        passwords = executor.map(
+            hashers.make_password,
+            [password for _, _, password in entries],
+            chunksize=max(1, len(entries) // (workers * 4)),
+        )
+
+        for (_, user, _), password in zip(entries, passwords):
+            user.password = password
+
+        self._insert(pending)
+        self.rows += len(chunk)
+
+    def _build_user(self, number, row):
+        if not isinstance(row, dict):
+            self._skip_invalid(number, "Not an object")
+            return None
+
+        user = user_models.User(
+            first_name=str(row.get("first_name") or "").strip(),
+            last_name=str(row.get("last_name") or "").strip(),
+            email=user_models.User.objects.normalize_email(
+                str(row.get("email") or "").strip()
+            ),
+        )
+
+        try:
+            user.clean_fields(exclude=["password"])
+        except ValidationError as error:
+            self._skip_invalid(
+                number,
+                "; ".join(
+                    f"{field}: {message}"
+                    for field, messages in error.message_dict.items()
+                    for message in messages
+                ),
+            )
+            return None
+
+        return user
+
+    def _find_taken(self, pending) -> set:
+        if not pending:
+            return set()
+
+        return set(
+            user_models.User.objects.filter(
+                email__in=list(pending)
+            ).values_list("email", flat=True)
+        )
+
+    def _insert(self, pending):
+        while pending:
+            try:
+                with transaction.atomic():
+                    user_models.User.objects.bulk_create(
+                        [user for _, user, _ in pending.values()]
+                    )
+            except IntegrityError:
+                # An email was taken since the chunk was checked
+                taken = self._find_taken(pending)
+
+                if not taken:
+                    raise
+
+                for email in taken:
+                    self._skip_duplicate(pending.pop(email)[0], email)
+            else:
+                self.imported += len(pending)
+                return
+
+    def _skip_duplicate(self, number, email):
+        self.duplicates += 1
+
+        if self.report_duplicates:
+            self.stderr.write(f"Row {number}: {email} already exists")
+
+    def _skip_invalid(self, number, reason):
+        self.invalid += 1
+        self.stderr.write(f"Row {number}: {reason}")
+
+    def _write_progress(self, started):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Imported {self.imported} users from {self.rows} rows, skipped "
+            f"{self.duplicates} duplicate emails and {self.invalid} invalid "
+            f"rows in {elapsed:.1f}s ({self.rows / elapsed:.0f} rows/s)"
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.3 on 2026-10-18 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="profile_version",
+            field=models.PositiveIntegerField(
+                default=1, verbose_name="Profile Version"
+            ),
+        ),
+    ]
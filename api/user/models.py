@@ -53,9 +53,58 @@ class User(auth_models.AbstractUser):
     last_name = models.CharField(_("Last Name"), max_length=255)
     email = models.EmailField(_("Email"), max_length=255, unique=True)
     password = models.CharField(max_length=255)
+    profile_version = models.PositiveIntegerField(
+        _("Profile Version"), default=1
+    )
     username = None
 
     objects = UserManager()
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["first_name", "last_name"]
+
+    def save(self, *args, **kwargs):
+        # Every change of an existing user bumps the profile version, so that
+        # tokens carrying the old claims are no longer trusted.
+        if not self._state.adding:
+            self.profile_version += 1
+
+            update_fields = kwargs.get("update_fields")
+
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "profile_version"}
+
+        super().save(*args, **kwargs)
+
+
+class Follow(models.Model):
+    """
+    This model is an edge of the follow graph, `follower` follows `followee`.
+    """
+
+    follower = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="following",
+        verbose_name=_("Follower"),
+    )
+    followee = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="followers",
+        verbose_name=_("Followee"),
+    )
+    date_followed = models.DateTimeField(_("Date Followed"), auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "followee"], name="follow_unique_edge"
+            ),
+        ]
+        indexes = [
+            # The followers of an account, read by the timeline fan-out
+            models.Index(
+                fields=["followee", "follower"], name="follow_followee_idx"
+            ),
+        ]
@@ -0,0 +1,230 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from core.cache import is_shared_cache
+
+"""
+This module contains the denylist of revoked tokens.
+
+Revoked token IDs (the `jti` claim) are kept in a dict of the current
+process, so checking a token is a dict lookup. Every revocation is also
+appended to a log in the cache, which the other processes read every
+`SYNC_INTERVAL` seconds to learn about the tokens they didn't revoke.
+
+A revocation takes its number before its entry is written, so a sync can
+find a number without an entry yet. The sync stops before such a number
+and fetches it again next time; numbers still without an entry by then
+belong to expired tokens. A process that never synced starts from the low
+water mark of the log: revocations older than a token lifetime are for
+expired tokens and aren't read.
+
+A revocation made in a per-process cache would only reach the process that
+made it, so by default the denylist is disabled unless its cache is shared.
+"""
+
+
+class TokenDenylist:
+    """
+    This class keeps the IDs of the revoked tokens until they expire.
+
+    The log in the cache is a counter holding the number of revocations and
+    one entry per revocation, stored under its number and expiring with the
+    token it revokes. The first number of every period of `token_lifetime`
+    seconds is kept as a mark, from which a new process starts reading.
+    """
+
+    seq_key = "token:denylist:seq"
+    entry_key_prefix = "token:denylist:"
+    mark_key_prefix = "token:denylist:mark:"
+
+    def __init__(
+        self,
+        cache_alias: str,
+        sync_interval: float,
+        token_lifetime: int,
+        enabled: bool = True,
+    ):
+        self.cache_alias = cache_alias
+        self.enabled = enabled
+        self.sync_interval = sync_interval
+        self.token_lifetime = token_lifetime
+        self._revoked = {}
+        # None until the first sync, which starts at the low water mark
+        self._last_seq = None
+        # The counter seen by the last sync
+        self._seen_seq = 0
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def revoke(self, jti: str, expires_at: int):
+        """
+        This method revokes a token until it expires.
+
+        Args:
+            jti: The ID of the token.
+            expires_at: The `exp` claim of the token, as a Unix timestamp.
+        """
+        timeout = int(expires_at - time.time()) + 1
+
+        if not self.enabled or timeout <= 0:
+            return
+
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+        seq = self._incr_seq()
+        self.cache.set(
+            f"{self.entry_key_prefix}{seq}", (jti, expires_at), timeout
+        )
+        # Only the first revocation of the period sets the mark
+        self.cache.add(
+            self._get_mark_key(self._get_period(time.time())),
+            seq,
+            timeout=2 * self.token_lifetime,
+        )
+
+    def is_revoked(self, jti: str) -> bool:
+        """
+        This method tells whether a token was revoked.
+
+        It doesn't touch the cache, except for the periodic sync.
+
+        Args:
+            jti: The ID of the token.
+
+        Returns:
+            Whether the token is in the denylist.
+        """
+        if not self.enabled:
+            return False
+
+        if time.monotonic() >= self._next_sync:
+            self.sync()
+
+        return jti in self._revoked
+
+    def sync(self):
+        """
+        This method reads the revocations made by the other processes and
+        drops the expired ones.
+        """
+        with self._lock:
+            self._next_sync = time.monotonic() + self.sync_interval
+            seq = self.cache.get(self.seq_key) or 0
+            now = time.time()
+
+            if self._last_seq is None:
+                self._last_seq = self._get_low_water_mark(seq, now)
+            elif seq < self._last_seq:
+                # The cache was flushed, the log starts over
+                self._last_seq = self._seen_seq = 0
+
+            numbers = range(self._last_seq + 1, seq + 1)
+            entries = self.cache.get_many(
+                [f"{self.entry_key_prefix}{number}" for number in numbers]
+            )
+
+            for number in numbers:
+                entry = entries.get(f"{self.entry_key_prefix}{number}")
+
+                if entry is not None:
+                    jti, expires_at = entry
+                    self._revoked[jti] = expires_at
+                elif number > self._seen_seq:
+                    # Taken by a revocation still writing its entry
+                    break
+
+                self._last_seq = number
+
+            self._seen_seq = seq
+            self._revoked = {
+                jti: expires_at
+                for jti, expires_at in self._revoked.items()
+                if expires_at > now
+            }
+
+    def clear(self):
+        with self._lock:
+            self._revoked.clear()
+            self._last_seq = None
+            self._seen_seq = 0
+            self._next_sync = 0.0
+
+    def __len__(self):
+        return len(self._revoked)
+
+    def _get_period(self, timestamp: float) -> int:
+        return int(timestamp // self.token_lifetime)
+
+    def _get_mark_key(self, period: int) -> str:
+        return f"{self.mark_key_prefix}{period}"
+
+    def _get_low_water_mark(self, seq: int, now: float) -> int:
+        # The tokens revoked before the previous period have expired
+        period = self._get_period(now)
+        keys = [self._get_mark_key(period - 1), self._get_mark_key(period)]
+        marks = self.cache.get_many(keys)
+
+        for key in keys:
+            if key in marks:
+                return min(marks[key] - 1, seq)
+
+        # Nothing was revoked for a token lifetime
+        return seq
+
+    def _incr_seq(self) -> int:
+        try:
+            return self.cache.incr(self.seq_key)
+        except ValueError:
+            self.cache.add(self.seq_key, 0, timeout=None)
+            return self.cache.incr(self.seq_key)
+
+
+_token_denylist = None
+_token_denylist_lock = threading.Lock()
+
+
+def get_token_denylist() -> "TokenDenylist":
+    """
+    This function returns the denylist configured by `settings.JWT_DENYLIST`.
+
+    Returns:
+        The TokenDenylist shared by the whole process.
+    """
+    global _token_denylist
+
+    if _token_denylist is None:
+        with _token_denylist_lock:
+            if _token_denylist is None:
+                config = settings.JWT_DENYLIST
+                cache_alias = config.get("CACHE_ALIAS", "default")
+                enabled = config.get("ENABLED")
+
+                if enabled is None:
+                    enabled = is_shared_cache(cache_alias)
+
+                _token_denylist = TokenDenylist(
+                    cache_alias=cache_alias,
+                    sync_interval=config.get("SYNC_INTERVAL", 5),
+                    token_lifetime=config.get("TOKEN_LIFETIME", 24 * 60 * 60),
+                    enabled=enabled,
+                )
+
+    return _token_denylist
+
+
+@receiver(setting_changed)
+def _reset_token_denylist(setting, **kwargs):
+    global _token_denylist
+
+    if setting in ("JWT_DENYLIST", "CACHES"):
+        _token_denylist = None
@@ -1,10 +1,16 @@
 import dataclasses
 import datetime
-import jwt
+import uuid
 from typing import TYPE_CHECKING
 from django.conf import settings
+from rest_framework import exceptions
+
+from core import routers, timing
 
 from . import models
+from .cache import get_user_cache, set_profile_version
+from .hashing import get_password_hashing_pool
+from .signing import get_key_ring
 
 if TYPE_CHECKING:
     from .models import User
@@ -43,6 +49,51 @@ class UserDataClass:
         )
 
 
+"""
+This data class represents a user built from the claims of a token.
+
+It is used as `request.user` when the token carries the user's profile, so
+the user doesn't have to be loaded from the database.
+"""
+
+
+@dataclasses.dataclass
+class TokenUser:
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+    profile_version: int
+
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    @property
+    def pk(self) -> int:
+        return self.id
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "TokenUser":
+        """
+        This method creates a TokenUser from a JWT payload.
+
+        Args:
+            payload: The decoded claims of a token created by `create_token`.
+
+        Returns:
+            The TokenUser created from the payload.
+        """
+        return cls(
+            id=payload["id"],
+            first_name=payload["first_name"],
+            last_name=payload["last_name"],
+            email=payload["email"],
+            profile_version=payload["ver"],
+        )
+
+
+@timing.instrument("user")
 def create_user(user_dc: "UserDataClass") -> "UserDataClass":
     """
     This function creates a new user.
@@ -67,6 +118,40 @@ def create_user(user_dc: "UserDataClass") -> "UserDataClass":
     return UserDataClass.from_instance(instance)
 
 
+@timing.instrument("user")
+async def acreate_user(user_dc: "UserDataClass") -> "UserDataClass":
+    """
+    This function creates a new user from an async view.
+
+    The password is hashed in the password hashing pool instead of the
+    calling thread.
+
+    Args:
+        user_dc: The UserDataClass to create the user from.
+
+    Returns:
+        The UserDataClass created from the user_dc.
+
+    Raises:
+        PasswordHashingPoolFull: If the password hashing pool is saturated.
+    """
+    instance = models.User(
+        first_name=user_dc.first_name,
+        last_name=user_dc.last_name,
+        email=user_dc.email,
+    )
+
+    if user_dc.password is not None:
+        instance.password = await get_password_hashing_pool().make_password(
+            user_dc.password
+        )
+
+    await instance.asave()
+
+    return UserDataClass.from_instance(instance)
+
+
+@timing.instrument("user")
 def user_email_selector(email: str) -> "User":
     """
     This function selects a user by email.
@@ -77,17 +162,142 @@ def user_email_selector(email: str) -> "User":
     Returns:
         The User object selected by email.
     """
-    user = models.User.objects.filter(email=email).first()
+    with routers.replica_reads(routers.email_key(email)):
+        user = models.User.objects.filter(email=email).first()
 
     return user
 
 
-def create_token(user_id: int) -> str:
+@timing.instrument("user")
+async def auser_email_selector(email: str) -> "User":
+    """
+    This function selects a user by email from an async view.
+
+    Args:
+        email: The email of the user to select.
+
+    Returns:
+        The User object selected by email.
+    """
+    with routers.replica_reads(routers.email_key(email)):
+        return await models.User.objects.filter(email=email).afirst()
+
+
+@timing.instrument("user")
+def user_id_selector(user_id: int) -> "User":
+    """
+    This function selects a user by ID.
+
+    The user is read from the user cache first and only loaded from the
+    database on a miss.
+
+    Args:
+        user_id: The ID of the user to select.
+
+    Returns:
+        The User object selected by ID.
+    """
+    user_cache = get_user_cache()
+    user = user_cache.get(user_id)
+
+    if user is None:
+        with routers.replica_reads(routers.user_key(user_id)):
+            user = models.User.objects.filter(id=user_id).first()
+
+        if user is not None:
+            user_cache.set(user_id, user)
+            set_profile_version(user.id, user.profile_version)
+
+    return user
+
+
+@timing.instrument("user")
+async def auser_id_selector(user_id: int) -> "User":
+    """
+    This function selects a user by ID from an async view.
+
+    It works like `user_id_selector` with the async ORM.
+
+    Args:
+        user_id: The ID of the user to select.
+
+    Returns:
+        The User object selected by ID.
+    """
+    user_cache = get_user_cache()
+    user = user_cache.get(user_id)
+
+    if user is None:
+        with routers.replica_reads(routers.user_key(user_id)):
+            user = await models.User.objects.filter(id=user_id).afirst()
+
+        if user is not None:
+            user_cache.set(user_id, user)
+            set_profile_version(user.id, user.profile_version)
+
+    return user
+
+
+def follow_user(user: "User", followee_id: int) -> bool:
+    """
+    This function makes a user follow another user.
+
+    Args:
+        user: The user who follows.
+        followee_id: The ID of the user to follow.
+
+    Returns:
+        Whether the user didn't follow the other user yet.
+
+    Raises:
+        ValidationError: If the user tries to follow themselves.
+        NotFound: If there is no user with the ID.
+    """
+    if followee_id == user.id:
+        raise exceptions.ValidationError(
+            {"user_id": "A user can't follow themselves"}
+        )
+
+    if user_id_selector(user_id=followee_id) is None:
+        raise exceptions.NotFound("No User matches the given query.")
+
+    _, created = models.Follow.objects.get_or_create(
+        follower_id=user.id, followee_id=followee_id
+    )
+
+    return created
+
+
+def unfollow_user(user: "User", followee_id: int) -> bool:
+    """
+    This function makes a user stop following another user.
+
+    Args:
+        user: The user who follows.
+        followee_id: The ID of the followed user.
+
+    Returns:
+        Whether the user was following the other user.
+    """
+    deleted, _ = models.Follow.objects.filter(
+        follower_id=user.id, followee_id=followee_id
+    ).delete()
+
+    return deleted > 0
+
+
+def create_token(user_id: int, user: "User" = None) -> str:
     """
     This function creates a JWT token for a user.
 
+    Every token gets a unique `jti` claim so that it can be revoked.
+
+    When `settings.JWT_CLAIMS_TOKENS` is enabled and the user is given, the
+    token also carries the user's profile and profile version.
+
     Args:
         user_id: The ID of the user to create the token for.
+        user: The User object to put in the token claims.
 
     Returns:
         The JWT token created for the user.
@@ -96,8 +306,19 @@ def create_token(user_id: int) -> str:
         id=user_id,
         exp=datetime.datetime.utcnow() + datetime.timedelta(hours=24),
         iat=datetime.datetime.utcnow(),
+        jti=uuid.uuid4().hex,
     )
 
-    token = jwt.encode(payload, settings.JWT_SECRET, algorithm="HS256")
+    if settings.JWT_CLAIMS_TOKENS and user is not None:
+        payload.update(
+            first_name=user.first_name,
+            last_name=user.last_name,
+            email=user.email,
+            ver=user.profile_version,
+        )
+
+        set_profile_version(user.id, user.profile_version)
+
+    token = get_key_ring().encode(payload)
 
     return token
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core import routers
+
+from . import models
+from .cache import (
+    delete_profile_version,
+    get_user_cache,
+    set_profile_version,
+)
+
+"""
+These receivers drop a user from the user cache whenever it changes,
+record the new profile version for claims tokens and make the user read
+the primary database until the replicas have the change.
+"""
+
+
+@receiver(post_save, sender=models.User)
+def invalidate_cached_user_on_save(sender, instance, **kwargs):
+    get_user_cache().delete(instance.pk)
+    set_profile_version(instance.pk, instance.profile_version)
+    routers.pin_primary(
+        routers.user_key(instance.pk), routers.email_key(instance.email)
+    )
+
+
+@receiver(post_delete, sender=models.User)
+def invalidate_cached_user_on_delete(sender, instance, **kwargs):
+    get_user_cache().delete(instance.pk)
+    delete_profile_version(instance.pk)
@@ -0,0 +1,272 @@
+import dataclasses
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import jwt
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+"""
+This module contains the keys that sign and verify the JWT tokens.
+
+Every key has an ID, written in the `kid` header of the tokens it signs.
+New tokens are signed with `settings.JWT_SIGNING_KEY_ID`, and tokens signed
+with any other key of `settings.JWT_KEYS` stay valid, so a key is rotated
+by adding a new one, switching the signing key ID, then removing the old
+key once its tokens have expired.
+"""
+
+# Tokens issued before the keys had IDs are verified with this key
+LEGACY_KEY_ID = "default"
+
+HMAC_ALGORITHMS = ("HS256", "HS384", "HS512")
+
+
+@dataclasses.dataclass
+class SigningKey:
+    kid: str
+    algorithm: str
+    signing_key: object = None
+    verifying_key: object = None
+
+    @classmethod
+    def from_config(cls, kid: str, config: dict) -> "SigningKey":
+        """
+        This method creates a SigningKey from an entry of `JWT_KEYS`.
+
+        HMAC keys take a `SECRET`. Ed25519 (`EdDSA`) and RSA (`RS256`) keys
+        take a PEM encoded `PRIVATE_KEY` and/or `PUBLIC_KEY`, or the path of
+        a PEM file in `PRIVATE_KEY_FILE` and/or `PUBLIC_KEY_FILE`. A key
+        without a private key can only verify tokens.
+
+        Args:
+            kid: The ID of the key.
+            config: The entry of `JWT_KEYS`.
+
+        Returns:
+            The SigningKey created from the entry.
+        """
+        algorithm = config.get("ALGORITHM", "HS256")
+
+        if algorithm in HMAC_ALGORITHMS:
+            secret = config.get("SECRET")
+
+            if not secret:
+                raise ImproperlyConfigured(f"JWT key {kid} has no SECRET")
+
+            return cls(
+                kid=kid,
+                algorithm=algorithm,
+                signing_key=secret,
+                verifying_key=secret,
+            )
+
+        algorithms = jwt.algorithms.get_default_algorithms()
+
+        if algorithm not in algorithms:
+            raise ImproperlyConfigured(
+                f"JWT key {kid} uses {algorithm}, which needs the "
+                f"cryptography package"
+            )
+
+        # Parsed once, PyJWT would parse the PEM on every call otherwise
+        prepare_key = algorithms[algorithm].prepare_key
+        private_key = _read_pem(config, "PRIVATE_KEY")
+        public_key = _read_pem(config, "PUBLIC_KEY")
+
+        if private_key is not None:
+            private_key = prepare_key(private_key)
+
+        if public_key is not None:
+            public_key = prepare_key(public_key)
+        elif private_key is not None:
+            public_key = private_key.public_key()
+        else:
+            raise ImproperlyConfigured(f"JWT key {kid} has no key")
+
+        return cls(
+            kid=kid,
+            algorithm=algorithm,
+            signing_key=private_key,
+            verifying_key=public_key,
+        )
+
+
+def _read_pem(config: dict, name: str):
+    if config.get(name):
+        return config[name]
+
+    if config.get(f"{name}_FILE"):
+        with open(config[f"{name}_FILE"], "rb") as pem_file:
+            return pem_file.read()
+
+    return None
+
+
+class VerifiedTokenCache:
+    """
+    This class remembers the payloads of the tokens already verified.
+
+    Entries are keyed by the SHA-256 digest of the token, evicted in least
+    recently used order once `max_size` is reached, and dropped when the
+    token expires.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: bytes):
+        with self._lock:
+            payload = self._entries.get(digest)
+
+            if payload is None:
+                return None
+
+            if payload["exp"] <= time.time():
+                del self._entries[digest]
+                return None
+
+            self._entries.move_to_end(digest)
+
+        return payload
+
+    def set(self, digest: bytes, payload: dict):
+        with self._lock:
+            self._entries[digest] = payload
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class KeyRing:
+    """
+    This class signs and verifies tokens with the configured keys.
+    """
+
+    def __init__(
+        self,
+        keys: dict[str, "SigningKey"],
+        signing_kid: str,
+        cache_size: int = 0,
+    ):
+        if signing_kid not in keys or keys[signing_kid].signing_key is None:
+            raise ImproperlyConfigured(
+                f"JWT_SIGNING_KEY_ID {signing_kid} isn't a signing key"
+            )
+
+        self.keys = keys
+        self.signing_key = keys[signing_kid]
+        self.verified_tokens = (
+            VerifiedTokenCache(max_size=cache_size) if cache_size else None
+        )
+
+    def encode(self, payload: dict) -> str:
+        """
+        This method signs a payload with the signing key.
+
+        Args:
+            payload: The claims of the token.
+
+        Returns:
+            The JWT token, with the ID of the signing key in its header.
+        """
+        return jwt.encode(
+            payload,
+            self.signing_key.signing_key,
+            algorithm=self.signing_key.algorithm,
+            headers={"kid": self.signing_key.kid},
+        )
+
+    def decode(self, token: str) -> dict:
+        """
+        This method verifies a token and returns its payload.
+
+        Tokens verified before are served from the verified token cache
+        until they expire, without checking their signature again. The
+        payload is shared between the requests and must not be modified.
+
+        Args:
+            token: The JWT token.
+
+        Returns:
+            The payload of the token.
+
+        Raises:
+            jwt.InvalidTokenError: If the token isn't valid.
+        """
+        if self.verified_tokens is None:
+            return self._verify(token)
+
+        digest = hashlib.sha256(token.encode()).digest()
+        payload = self.verified_tokens.get(digest)
+
+        if payload is None:
+            payload = self._verify(token)
+
+            if "exp" in payload:
+                self.verified_tokens.set(digest, payload)
+
+        return payload
+
+    def _verify(self, token: str) -> dict:
+        kid = jwt.get_unverified_header(token).get("kid", LEGACY_KEY_ID)
+        key = self.keys.get(kid)
+
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown key {kid}")
+
+        # Only the algorithm of the key is accepted, whatever the header says
+        return jwt.decode(token, key.verifying_key, algorithms=[key.algorithm])
+
+
+_key_ring = None
+_key_ring_lock = threading.Lock()
+
+
+def get_key_ring() -> "KeyRing":
+    """
+    This function returns the key ring configured by `settings.JWT_KEYS`.
+
+    Returns:
+        The KeyRing shared by the whole process.
+    """
+    global _key_ring
+
+    if _key_ring is None:
+        with _key_ring_lock:
+            if _key_ring is None:
+                _key_ring = KeyRing(
+                    keys={
+                        kid: SigningKey.from_config(kid, config)
+                        for kid, config in settings.JWT_KEYS.items()
+                    },
+                    signing_kid=settings.JWT_SIGNING_KEY_ID,
+                    cache_size=settings.JWT_VERIFIED_TOKEN_CACHE_SIZE,
+                )
+
+    return _key_ring
+
+
+@receiver(setting_changed)
+def _reset_key_ring(setting, **kwargs):
+    global _key_ring
+
+    if setting in (
+        "JWT_KEYS",
+        "JWT_SIGNING_KEY_ID",
+        "JWT_VERIFIED_TOKEN_CACHE_SIZE",
+    ):
+        _key_ring = None
@@ -0,0 +1,124 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import throttling
+
+"""
+This module contains the throttles of the login and register endpoints.
+
+They run before the views look the user up or hash a password, so a burst
+of attempts is refused without spending CPU on PBKDF2. They are DRF
+`SimpleRateThrottle`s, which keep the time of every attempt in the window
+and so limit over a sliding window.
+"""
+
+
+class AuthRateThrottle(throttling.SimpleRateThrottle):
+    """
+    This class is the base of the throttles of the auth endpoints.
+
+    The rate of a throttle is read from `settings.AUTH_THROTTLE["RATES"]`
+    by scope, a missing or empty rate disables it. The history of attempts
+    is kept by the backend of `settings.AUTH_THROTTLE`.
+    """
+
+    @property
+    def cache(self):
+        return get_throttle_cache()
+
+    def get_rate(self):
+        return settings.AUTH_THROTTLE["RATES"].get(self.scope) or None
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class EmailRateThrottle(AuthRateThrottle):
+    """
+    This class throttles the attempts made on the same email address,
+    whatever the IP they come from.
+    """
+
+    def get_cache_key(self, request, view):
+        data = getattr(request, "data", None)
+
+        if data is None:
+            # The async views don't have a DRF request
+            data = view.get_data(request)
+
+        email = data.get("email") if isinstance(data, dict) else None
+
+        if not isinstance(email, str):
+            return None
+
+        digest = hashlib.sha1(email.strip().lower().encode()).hexdigest()
+
+        return self.cache_format % {"scope": self.scope, "ident": digest}
+
+
+class LoginIPRateThrottle(AuthRateThrottle):
+    scope = "login_ip"
+
+
+class LoginEmailRateThrottle(EmailRateThrottle):
+    scope = "login_email"
+
+
+class RegisterIPRateThrottle(AuthRateThrottle):
+    scope = "register_ip"
+
+
+_throttle_cache = None
+_throttle_cache_lock = threading.Lock()
+
+
+def get_throttle_cache():
+    """
+    This function returns the cache of the throttles.
+
+    With the `local` backend every process keeps its own history of
+    attempts, with the `cache` backend they share `CACHES[CACHE_ALIAS]`.
+
+    Returns:
+        The cache backend used by the auth throttles.
+    """
+    global _throttle_cache
+
+    if _throttle_cache is None:
+        with _throttle_cache_lock:
+            if _throttle_cache is None:
+                _throttle_cache = _build_cache()
+
+    return _throttle_cache
+
+
+def _build_cache():
+    config = settings.AUTH_THROTTLE
+    backend = config.get("BACKEND", "local")
+
+    if backend == "local":
+        return LocMemCache(
+            "auth-throttle",
+            {"OPTIONS": {"MAX_ENTRIES": config.get("MAX_ENTRIES", 10000)}},
+        )
+
+    if backend == "cache":
+        return caches[config.get("CACHE_ALIAS", "default")]
+
+    raise ValueError(f"Unknown AUTH_THROTTLE backend: {backend}")
+
+
+@receiver(setting_changed)
+def _reset_throttle_cache(setting, **kwargs):
+    global _throttle_cache
+
+    if setting == "AUTH_THROTTLE":
+        _throttle_cache = None
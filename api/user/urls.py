@@ -1,10 +1,21 @@
 from django.urls import path
 
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     path("register/", views.RegisterApi.as_view(), name="register"),
     path("login/", views.LoginApi.as_view(), name="login"),
     path("me/", views.UserApi.as_view(), name="me"),
     path("logout/", views.LogoutApi.as_view(), name="logout"),
+    path("<int:user_id>/follow/", views.FollowApi.as_view(), name="follow"),
+    path(
+        "async/register/",
+        async_views.AsyncRegisterApi.as_view(),
+        name="async_register",
+    ),
+    path(
+        "async/login/",
+        async_views.AsyncLoginApi.as_view(),
+        name="async_login",
+    ),
 ]
@@ -1,7 +1,11 @@
 from rest_framework import views, response, exceptions, permissions
+from rest_framework import status as rest_status
+
+from core import metrics
 
 from . import serializer as user_serialzier
-from . import services, authentication
+from . import services, authentication, throttling
+from .revocation import get_token_denylist
 
 
 """
@@ -12,6 +16,8 @@ It allows users to register for the application.
 
 
 class RegisterApi(views.APIView):
+    throttle_classes = (throttling.RegisterIPRateThrottle,)
+
     def post(self, request):
         """
         This method handles POST requests to the endpoint.
@@ -35,6 +41,11 @@ It allows users to login to the application.
 
 
 class LoginApi(views.APIView):
+    throttle_classes = (
+        throttling.LoginIPRateThrottle,
+        throttling.LoginEmailRateThrottle,
+    )
+
     def post(self, request):
         """
         This method handles POST requests to the endpoint.
@@ -46,13 +57,12 @@ class LoginApi(views.APIView):
 
         user = services.user_email_selector(email=email)
 
-        if user is None:
+        if user is None or not user.check_password(raw_password=password):
+            metrics.count_auth("login", success=False)
             raise exceptions.AuthenticationFailed("Invalid Credentials")
 
-        if not user.check_password(raw_password=password):
-            raise exceptions.AuthenticationFailed("Invalid Credentials")
-
-        token = services.create_token(user_id=user.id)
+        metrics.count_auth("login", success=True)
+        token = services.create_token(user_id=user.id, user=user)
 
         resp = response.Response()
 
@@ -99,10 +109,53 @@ class LogoutApi(views.APIView):
         """
         This method handles POST requests to the endpoint.
 
-        It logs the user out and deletes the jwt cookie.
+        It logs the user out, revokes the jwt token and deletes the cookie.
         """
+        if "jti" in request.auth:
+            get_token_denylist().revoke(
+                jti=request.auth["jti"], expires_at=request.auth["exp"]
+            )
+
         resp = response.Response()
         resp.delete_cookie("jwt")
         resp.data = {"message": "Logout complete"}
 
         return resp
+
+
+"""
+This class defines the `/api/users/<user_id>/follow/` endpoint.
+
+It allows users to follow and unfollow other users.
+"""
+
+
+class FollowApi(views.APIView):
+    authentication_classes = (authentication.CustomUserAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request, user_id):
+        """
+        This method handles POST requests to the endpoint.
+
+        It makes the user follow another user, the statuses of the followed
+        user then appear in the user's timeline.
+        """
+        created = services.follow_user(user=request.user, followee_id=user_id)
+
+        return response.Response(
+            data={"following": True},
+            status=rest_status.HTTP_201_CREATED
+            if created
+            else rest_status.HTTP_200_OK,
+        )
+
+    def delete(self, request, user_id):
+        """
+        This method handles DELETE requests to the endpoint.
+
+        It makes the user stop following another user.
+        """
+        services.unfollow_user(user=request.user, followee_id=user_id)
+
+        return response.Response(status=rest_status.HTTP_204_NO_CONTENT)